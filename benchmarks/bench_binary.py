@@ -0,0 +1,35 @@
+"""Benchmark SpeechTree binary format against JSON."""
+
+import json
+from functools import partial
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.binary import dumps, loads
+from speechtree.e2e import ojt_raw_features_to_tree
+
+
+def main() -> None:
+    """Compare size and speed of binary format and JSON."""
+    for n_feature in (100, 10_000, 100_000):
+        tree = ojt_raw_features_to_tree(generate_raw_features(n_feature))
+        encoded_json = json.dumps(tree, ensure_ascii=False).encode()
+        encoded_binary = dumps(tree)
+        json_dumps = measure_ms(
+            partial(json.dumps, tree, ensure_ascii=False), n_repeat=3
+        )
+        json_loads = measure_ms(partial(json.loads, encoded_json), n_repeat=3)
+        binary_dumps = measure_ms(partial(dumps, tree), n_repeat=3)
+        binary_loads = measure_ms(lambda: loads(encoded_binary).to_tree(), n_repeat=3)  # noqa: B023, because evaluated in the loop.
+        binary_lazy = measure_ms(lambda: loads(encoded_binary)[0], n_repeat=3)  # noqa: B023, because evaluated in the loop.
+        print(f"#feature={n_feature:>7}")
+        print(
+            f"  json  : {len(encoded_json) / 2**10:9.1f} KiB  dumps {json_dumps:8.2f} ms  loads {json_loads:8.2f} ms"
+        )
+        print(
+            f"  binary: {len(encoded_binary) / 2**10:9.1f} KiB  dumps {binary_dumps:8.2f} ms  loads {binary_loads:8.2f} ms  loads + 1st group {binary_lazy:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
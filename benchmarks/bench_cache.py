@@ -0,0 +1,42 @@
+"""Benchmark persistent tree cache hits against parsing."""
+
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.binary import LazyTree
+from speechtree.cache import TreeCache
+from speechtree.e2e import ojt_raw_features_to_tree
+
+
+def _hit_and_decode(raw_features: list[dict[str, Any]], cache: TreeCache) -> None:
+    tree = ojt_raw_features_to_tree(raw_features, cache=cache)
+    assert isinstance(tree, LazyTree)
+    tree.to_tree()
+
+
+def main() -> None:
+    """Compare parsing, lazy cache hits and fully decoded cache hits on utterance-sized inputs."""
+    with (
+        tempfile.TemporaryDirectory() as tmp_dir,
+        TreeCache(Path(tmp_dir) / "cache.sqlite") as cache,
+    ):
+        for n_feature in (10, 100, 1_000):
+            raw_features = generate_raw_features(n_feature)
+            ojt_raw_features_to_tree(raw_features, cache=cache)
+            parse = measure_ms(partial(ojt_raw_features_to_tree, raw_features))
+            hit = measure_ms(
+                partial(ojt_raw_features_to_tree, raw_features, cache=cache)
+            )
+            decoded_hit = measure_ms(partial(_hit_and_decode, raw_features, cache))
+            print(
+                f"#feature={n_feature:>5}  parse: {parse:7.3f} ms  cache hit: {hit:7.3f} ms  cache hit + decode: {decoded_hit:7.3f} ms"
+            )
+        print(cache.stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark throughput of the asyncio VOICEVOX client against the local fake engine."""
+
+import asyncio
+from time import perf_counter
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.fake_engine import FakeEngine
+from speechtree.e2e import ojt_raw_features_to_tree
+from speechtree.tree import Tree
+from speechtree.voicevox.client import VoicevoxClient
+
+_LATENCY = 0.005  # NOTE: Emulated synthesis time per request [sec].
+
+
+async def _run_sequential(trees: list[Tree]) -> float:
+    """Synthesize trees one by one, returning elapsed seconds."""
+    async with (
+        FakeEngine(latency=_LATENCY) as engine,
+        VoicevoxClient(port=engine.port, max_connections=1) as client,
+    ):
+        start = perf_counter()
+        for tree in trees:
+            await client.synthesize(tree, speaker=1)
+        return perf_counter() - start
+
+
+async def _run_concurrent(trees: list[Tree], max_connections: int) -> float:
+    """Synthesize trees over pooled connections, returning elapsed seconds."""
+    async with (
+        FakeEngine(latency=_LATENCY) as engine,
+        VoicevoxClient(port=engine.port, max_connections=max_connections) as client,
+    ):
+        start = perf_counter()
+        async for _ in client.synthesize_many(trees, speaker=1):
+            pass
+        return perf_counter() - start
+
+
+def main() -> None:
+    """Compare sequential requests and pooled concurrent requests."""
+    trees = [ojt_raw_features_to_tree(generate_raw_features(20)) for _ in range(200)]
+    sequential = asyncio.run(_run_sequential(trees))
+    print(f"sequential          : {len(trees) / sequential:8.1f} trees/s")
+    for max_connections in (2, 4, 8, 16):
+        concurrent = asyncio.run(_run_concurrent(trees, max_connections))
+        print(
+            f"pooled (#conn={max_connections:>2}): {len(trees) / concurrent:8.1f} trees/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
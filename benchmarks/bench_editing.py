@@ -0,0 +1,51 @@
+"""Benchmark memory of undo histories, persistent edits against deep copies."""
+
+import copy
+import tracemalloc
+from collections.abc import Callable
+
+from benchmarks.corpus import generate_raw_features
+from speechtree.gardener import retone_ap
+from speechtree.ojt.loader import as_ojt_features
+from speechtree.ojt.parser import parse_ojt_as_tree
+from speechtree.tree import Tree
+
+
+def _retone_in_place(tree: Tree, gp_index: int, accent: int) -> Tree:
+    """Baseline, edit a deep copy in place."""
+    new_tree = copy.deepcopy(tree)
+    for i, mora in enumerate(
+        new_tree[gp_index]["accent_phrases"][0]["words"][0]["moras"]
+    ):
+        mora["tone_high"] = i < accent
+    return new_tree
+
+
+def _measure_history_mib(
+    tree: Tree, edit: Callable[[Tree, int, int], Tree], n_edit: int
+) -> float:
+    """Measure memory of an undo history of `n_edit` edits in MiB."""
+    tracemalloc.start()
+    history = [tree]
+    for i in range(n_edit):
+        history.append(edit(history[-1], (i * 2) % len(tree), 1 + i % 2))
+    size = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    return size
+
+
+def main() -> None:
+    """Compare undo histories of 100 re-tones."""
+    for n_feature in (1_000, 4_000):
+        tree = parse_ojt_as_tree(as_ojt_features(generate_raw_features(n_feature)))
+        deep = _measure_history_mib(tree, _retone_in_place, 100)
+        persistent = _measure_history_mib(
+            tree, lambda t, g, acc: retone_ap(t, g, 0, acc), 100
+        )
+        print(
+            f"#feature={n_feature:>6}  deepcopy: {deep:7.2f} MiB  persistent: {persistent:7.2f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
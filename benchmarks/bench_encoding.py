@@ -0,0 +1,38 @@
+"""Benchmark phoneme-ID encoding."""
+
+from functools import partial
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.e2e import ojt_raw_features_to_tree
+from speechtree.encoding import PHONEME_IDS, encode_batch, encode_tree
+from speechtree.gardener import extract_phonemes
+from speechtree.tree import Tree
+
+
+def _encode_via_symbols(tree: Tree) -> list[int]:
+    """Encode the tree through the phoneme symbol list."""
+    return [
+        PHONEME_IDS[s]
+        for s in extract_phonemes(
+            tree, reduce_dup_pau=False, distinguish_unvoicing=False
+        )
+    ]
+
+
+def main() -> None:
+    """Compare symbol-list encoding, array encoding and batch encoding."""
+    for n_feature in (1_000, 10_000, 100_000):
+        tree = ojt_raw_features_to_tree(generate_raw_features(n_feature))
+        via_symbols = measure_ms(partial(_encode_via_symbols, tree), n_repeat=5)
+        into_array = measure_ms(partial(encode_tree, tree), n_repeat=5)
+        print(
+            f"#feature={n_feature:>7}  symbols->ids: {via_symbols:8.2f} ms  encode_tree: {into_array:8.2f} ms"
+        )
+    trees = [ojt_raw_features_to_tree(generate_raw_features(100)) for _ in range(64)]
+    batch = measure_ms(partial(encode_batch, trees), n_repeat=5)
+    print(f"batch 64x100 features  encode_batch: {batch:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Benchmark gardener extractors on long trees."""
+
+from functools import partial
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.e2e import ojt_raw_features_to_tree
+from speechtree.gardener import (
+    extract_accent_position,
+    extract_all,
+    extract_phonemes,
+    extract_pronunciation,
+    extract_text,
+)
+from speechtree.tree import Tree
+
+
+def _extract_individually(tree: Tree) -> None:
+    """Extract outputs by individual extractors, 4 traversals."""
+    extract_text(tree)
+    extract_pronunciation(tree)
+    extract_phonemes(tree)
+    [extract_accent_position(ap) for gp in tree for ap in gp["accent_phrases"]]
+
+
+def main() -> None:
+    """Compare individual extractors and single-pass extractor."""
+    for n_feature in (1_000, 10_000, 100_000):
+        tree = ojt_raw_features_to_tree(generate_raw_features(n_feature))
+        individual = measure_ms(partial(_extract_individually, tree), n_repeat=5)
+        single_pass = measure_ms(partial(extract_all, tree), n_repeat=5)
+        print(
+            f"#feature={n_feature:>7}  individual: {individual:8.2f} ms  single-pass: {single_pass:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Benchmark streaming graph export of long documents."""
+
+import os
+import tracemalloc
+from time import perf_counter
+
+from benchmarks.corpus import generate_raw_features
+from speechtree.graph.converter import GraphLevel, write_graph
+from speechtree.ojt.loader import as_ojt_features
+from speechtree.ojt.parser import parse_ojt_as_tree
+
+
+def main() -> None:
+    """Measure time and peak memory of writing a ~120k-mora tree to a file."""
+    tree = parse_ojt_as_tree(as_ojt_features(generate_raw_features(50_000)))
+    levels: tuple[GraphLevel, ...] = ("phoneme", "accent_phrase")
+    with open(os.devnull, "w", encoding="utf-8") as fp:  # noqa: PTH123, because devnull is a plain path.
+        for fmt in ("dot", "mermaid"):
+            for level in levels:
+                start = perf_counter()
+                write_graph(tree, fp, fmt=fmt, max_level=level)
+                elapsed = (perf_counter() - start) * 1e3
+                # NOTE: Memory is measured in another run, because tracemalloc slows down the run.
+                tracemalloc.start()
+                write_graph(tree, fp, fmt=fmt, max_level=level)
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+                print(
+                    f"{fmt:>7} max_level={level:<13}  {elapsed:8.1f} ms  peak: {peak:6.2f} MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark cold import time of speechtree modules, as `python -X importtime`."""
+
+import subprocess
+import sys
+
+_MODULES = ("speechtree.e2e", "speechtree.ojt.parser", "speechtree.cli")
+# NOTE: Cold-start budgets, generous against machine noise. Heavy dependencies would exceed them (pydantic alone ~60 ms).
+_IMPORT_BUDGET_MS = {"speechtree.e2e": 50.0}
+_IMPORT_TIME_PREFIX = "import time:"
+
+
+def measure_import_ms(module: str, n_repeat: int = 5) -> float:
+    """Measure the best cumulative import time of the module in fresh interpreters, in milliseconds."""
+    times: list[float] = []
+    for _ in range(n_repeat):
+        stderr = subprocess.run(  # noqa: S603, because the command is fixed.
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stderr
+        for line in stderr.splitlines():
+            # NOTE: Other stderr lines, e.g. warnings of site packages, are not importtime records.
+            if not line.startswith(_IMPORT_TIME_PREFIX):
+                continue
+            _, cumulative, name = line.removeprefix(_IMPORT_TIME_PREFIX).split("|")
+            if name.strip() == module:
+                times.append(int(cumulative) / 1e3)
+    return min(times)
+
+
+def main() -> None:
+    """Report cold import times, and exit with failure if any module is over its budget."""
+    over_budget = False
+    for module in _MODULES:
+        ms = measure_import_ms(module)
+        budget = _IMPORT_BUDGET_MS.get(module)
+        status = ""
+        if budget is not None:
+            status = f"(budget {budget:.0f} ms{', OVER' if ms >= budget else ''})"
+            over_budget |= ms >= budget
+        print(f"{module:<24} {ms:7.2f} ms  {status}".rstrip())
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Benchmark incremental re-parse of a single-word edit on long documents."""
+
+from functools import partial
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.ojt.incremental import FeatureEdit, reparse_ojt_as_tree
+from speechtree.ojt.loader import as_ojt_features
+from speechtree.ojt.parser import parse_ojt_as_tree
+
+
+def main() -> None:
+    """Compare full re-parse and incremental re-parse of an edit in the middle."""
+    for n_feature in (1_000, 10_000, 100_000):
+        feats = as_ojt_features(generate_raw_features(n_feature))
+        tree = parse_ojt_as_tree(feats)
+        # NOTE: Replace a word in the middle with another voiced word.
+        mid = n_feature // 2 - n_feature // 2 % 8 + 4
+        edit = FeatureEdit(mid, mid + 1, [feats[2]])
+        edited = [*feats[:mid], feats[2], *feats[mid + 1 :]]
+        full = measure_ms(partial(parse_ojt_as_tree, edited))
+        incremental = measure_ms(partial(reparse_ojt_as_tree, tree, feats, edit))
+        print(
+            f"#feature={n_feature:>7}  full: {full:8.3f} ms  incremental: {incremental:8.3f} ms"
+            f"  (x{full / incremental:.0f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
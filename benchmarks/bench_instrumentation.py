@@ -0,0 +1,32 @@
+"""Benchmark the cost of stage-level instrumentation."""
+
+from functools import partial
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.diagnostics import suppress_diagnostics
+from speechtree.e2e import ojt_raw_features_to_vv_accent_phrases
+from speechtree.instrumentation import instrument
+
+
+def _convert_sentences(sentences: list[list[dict[str, object]]]) -> None:
+    for raw_features in sentences:
+        ojt_raw_features_to_vv_accent_phrases(raw_features)
+
+
+def main() -> None:
+    """Compare disabled and enabled instrumentation over many short sentences, where per-call costs dominate."""
+    sentences = [generate_raw_features(8) for _ in range(10_000)]
+    with suppress_diagnostics():
+        disabled = measure_ms(partial(_convert_sentences, sentences), 3)
+        with instrument() as metrics:
+            enabled = measure_ms(partial(_convert_sentences, sentences), 3)
+    print(
+        f"#sentence={len(sentences)}  disabled: {disabled:8.1f} ms  enabled: {enabled:8.1f} ms"
+        f"  (+{(enabled / disabled - 1) * 100:.1f} %)"
+    )
+    print(metrics.to_prometheus(), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark kana-notation-to-Tree build on large prompt sets."""
+
+from functools import partial
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.characters import parse_kana_as_tree
+from speechtree.ojt.loader import as_ojt_features
+from speechtree.ojt.parser import parse_ojt_as_tree
+
+# NOTE: Same utterance as the 8-feature sentence of `generate_raw_features()`.
+_PROMPTS = (
+    "コンニチワ'、キョ'ーワ/アタタカ'イデ_スネ？",
+    "キョ'ーワ/アタタカ'イデ_スネ？",
+    "コンニチワ'、アタタカ'イ",
+)
+_DIGIT_MORAS = ("ゼ", "イ", "ニ", "サ", "ヨ", "ゴ", "ロ", "ナ", "ハ", "キュ")
+
+
+def main() -> None:
+    """Compare the kana builder with the Open JTalk parser on equivalent features, which skips NJD frontend in both."""
+    feats = as_ojt_features(generate_raw_features(8))
+    for n_prompt in (1_000, 10_000, 100_000):
+        prompts = [_PROMPTS[i % len(_PROMPTS)] for i in range(n_prompt)]
+        # NOTE: Unique prompts miss the phrase cache, by an accent phrase spelling the prompt index in moras.
+        unique_prompts = [
+            f"{prompt}/{''.join(_DIGIT_MORAS[int(d)] for d in str(i))}'"
+            for i, prompt in enumerate(prompts)
+        ]
+        kana = measure_ms(
+            partial(lambda ps: [parse_kana_as_tree(p) for p in ps], prompts), 3
+        )
+        unique = measure_ms(
+            partial(lambda ps: [parse_kana_as_tree(p) for p in ps], unique_prompts), 3
+        )
+        ojt = measure_ms(
+            partial(lambda n: [parse_ojt_as_tree(feats) for _ in range(n)], n_prompt), 3
+        )
+        print(
+            f"#prompt={n_prompt:>7}  kana: {kana:8.1f} ms ({n_prompt / kana:6.0f} prompt/ms)"
+            f"  kana-unique: {unique:8.1f} ms  ojt-features: {ojt:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
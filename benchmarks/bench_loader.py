@@ -0,0 +1,34 @@
+"""Benchmark Open JTalk raw feature loading."""
+
+from functools import partial
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.ojt.domain import OjtFeature
+from speechtree.ojt.loader import as_ojt_features
+
+_feat_adapter = TypeAdapter(OjtFeature)
+
+
+def _load_featurewise(raw_features: list[dict[str, Any]]) -> list[OjtFeature]:
+    """Previous loader, which validates features one by one."""
+    return list(map(_feat_adapter.validate_python, raw_features))
+
+
+def main() -> None:
+    """Compare loading modes."""
+    for n_feature in (10_000, 100_000):
+        raw_features = generate_raw_features(n_feature)
+        featurewise = measure_ms(partial(_load_featurewise, raw_features))
+        batch = measure_ms(partial(as_ojt_features, raw_features))
+        trusted = measure_ms(partial(as_ojt_features, raw_features, trusted=True))
+        print(
+            f"#feature={n_feature:>7}  featurewise: {featurewise:7.2f} ms  batch: {batch:7.2f} ms  trusted: {trusted:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
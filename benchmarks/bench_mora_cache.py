@@ -0,0 +1,29 @@
+"""Benchmark the pronunciation-to-moras cache."""
+
+from functools import partial
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.ojt.loader import as_ojt_features
+from speechtree.ojt.parser import (
+    configure_mora_cache,
+    get_mora_cache_info,
+    parse_ojt_as_tree,
+)
+
+
+def main() -> None:
+    """Compare parsing with and without the cache."""
+    feats = as_ojt_features(generate_raw_features(100_000))
+    configure_mora_cache(0)
+    uncached = measure_ms(partial(parse_ojt_as_tree, feats), n_repeat=3)
+    configure_mora_cache()
+    cached = measure_ms(partial(parse_ojt_as_tree, feats), n_repeat=3)
+    cache_info = get_mora_cache_info()
+    print(
+        f"#feature={len(feats)}  uncached: {uncached:8.2f} ms  cached: {cached:8.2f} ms  ({cache_info})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Benchmark mora splitting on long readings."""
+
+from functools import partial
+
+from benchmarks.utils import measure_ms
+from speechtree.characters import MORA_MATCH_PATTERN
+from speechtree.ojt.parser import _split_pron_into_mora_prons
+
+
+def _split_by_pattern(pron: str) -> list[tuple[str, bool]]:
+    """Split pronunciation by the previous regex slice loop."""
+    mora_prons: list[tuple[str, bool]] = []
+    while len(pron):
+        match = MORA_MATCH_PATTERN.match(pron)
+        if match is None:
+            msg = "not match"
+            raise RuntimeError(msg)
+        mora_pron = match[0]
+        if mora_pron[-1] == "’":
+            mora_prons.append((mora_pron[:-1], True))
+        else:
+            mora_prons.append((mora_pron, False))
+        pron = pron[match.end() :]
+    return mora_prons
+
+
+def main() -> None:
+    """Compare the regex slice loop and the token-table splitter."""
+    unit = "キョーワ、イイテンキデス’ネ？ウィキペディアー"
+    for n_unit in (1, 10, 100, 1_000):
+        pron = unit * n_unit
+        regex = measure_ms(partial(_split_by_pattern, pron))
+        table = measure_ms(partial(_split_pron_into_mora_prons, pron))
+        print(f"#char={len(pron):>6}  regex: {regex:9.3f} ms  table: {table:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
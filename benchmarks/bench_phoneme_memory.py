@@ -0,0 +1,63 @@
+"""Benchmark memory saved by interned phonemes."""
+
+import tracemalloc
+from collections.abc import Callable
+
+from benchmarks.corpus import generate_raw_features
+from speechtree.e2e import ojt_raw_features_to_tree
+from speechtree.tree import Mora, Phoneme, Tree
+
+
+def _count_moras(tree: Tree) -> int:
+    return sum(
+        len(wd["moras"])
+        for gp in tree
+        for ap in gp["accent_phrases"]
+        for wd in ap["words"]
+    )
+
+
+def _copy_moras(tree: Tree, copy_phoneme: Callable[[Phoneme], Phoneme]) -> list[Mora]:
+    """Copy all moras of the tree, with phonemes processed by `copy_phoneme`."""
+    return [
+        Mora(
+            phonemes=tuple(map(copy_phoneme, mr["phonemes"])),  # type: ignore[typeddict-item]
+            pronunciation=mr["pronunciation"],
+            tone_high=mr["tone_high"],
+        )
+        for gp in tree
+        for ap in gp["accent_phrases"]
+        for wd in ap["words"]
+        for mr in wd["moras"]
+    ]
+
+
+def _measure_bytes(func: Callable[[], object]) -> int:
+    """Measure memory held by the output of `func`."""
+    tracemalloc.start()
+    output = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del output
+    return size
+
+
+def main() -> None:
+    """Compare memory of moras with interned phonemes and with per-mora phonemes."""
+    tree = ojt_raw_features_to_tree(generate_raw_features(50_000))
+    n_mora = _count_moras(tree)
+    interned = _measure_bytes(lambda: _copy_moras(tree, lambda pn: pn))
+    per_mora = _measure_bytes(
+        lambda: _copy_moras(
+            tree, lambda pn: Phoneme(symbol=pn["symbol"], unvoicing=pn["unvoicing"])
+        )
+    )
+    saved_per_100k = (per_mora - interned) / n_mora * 100_000
+    print(
+        f"#mora={n_mora}  per-mora phonemes: {per_mora / 2**20:7.2f} MiB  interned phonemes: {interned / 2**20:7.2f} MiB"
+    )
+    print(f"saved per 100k moras: {saved_per_100k / 2**20:7.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Benchmark end-to-end raw-features-to-VOICEVOX conversion."""
+
+from functools import partial
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.e2e import Pipeline, ojt_raw_features_to_vv_accent_phrases
+
+
+def main() -> None:
+    """Compare the Tree route function and fused pipelines."""
+    pipeline = Pipeline()
+    trusted_pipeline = Pipeline(trusted=True)
+    for n_feature in (1_000, 10_000, 100_000):
+        raw_features = generate_raw_features(n_feature)
+        tree_route = measure_ms(
+            partial(ojt_raw_features_to_vv_accent_phrases, raw_features), n_repeat=3
+        )
+        fused = measure_ms(partial(pipeline, raw_features), n_repeat=3)
+        fused_trusted = measure_ms(partial(trusted_pipeline, raw_features), n_repeat=3)
+        print(
+            f"#feature={n_feature:>7}  Tree route: {tree_route:8.2f} ms"
+            f"  Pipeline: {fused:8.2f} ms  Pipeline(trusted): {fused_trusted:8.2f} ms"
+            f"  ({n_feature / fused_trusted * 1e3:,.0f} features/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
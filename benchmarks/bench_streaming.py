@@ -0,0 +1,37 @@
+"""Benchmark latency to the first phrase group."""
+
+from time import perf_counter
+
+from benchmarks.corpus import generate_raw_features
+from speechtree.ojt.domain import OjtFeature
+from speechtree.ojt.loader import as_ojt_features
+from speechtree.ojt.parser import iter_ojt_as_groups, parse_ojt_as_tree
+
+
+def _measure_first_group_ms(feats: list[OjtFeature]) -> tuple[float, float]:
+    """Measure latencies to the first group and to the full tree in milliseconds."""
+    start = perf_counter()
+    groups = iter_ojt_as_groups(iter(feats))
+    next(groups)
+    first = perf_counter() - start
+    for _ in groups:
+        pass
+    total = perf_counter() - start
+    return first * 1e3, total * 1e3
+
+
+def main() -> None:
+    """Compare latencies of streaming parse and whole-tree parse."""
+    for n_feature in (1_000, 10_000, 100_000):
+        feats = as_ojt_features(generate_raw_features(n_feature))
+        start = perf_counter()
+        parse_ojt_as_tree(feats)
+        tree = (perf_counter() - start) * 1e3
+        first, total = _measure_first_group_ms(feats)
+        print(
+            f"#feature={n_feature:>7}  tree: {tree:8.2f} ms  stream first group: {first:6.3f} ms  stream all: {total:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
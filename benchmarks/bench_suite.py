@@ -0,0 +1,158 @@
+"""
+Benchmark suite of the core conversions over a realistic synthetic corpus, with JSON results comparable between commits.
+
+Usage:
+    python -m benchmarks.bench_suite --output before.json
+    python -m benchmarks.bench_suite --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from collections.abc import Callable
+from functools import partial
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, TypedDict
+
+from benchmarks.corpus import generate_njd_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.gardener import (
+    extract_accent_positions,
+    extract_all,
+    extract_phonemes,
+    extract_pronunciation,
+    extract_text,
+)
+from speechtree.ojt.loader import as_ojt_features
+from speechtree.ojt.parser import parse_ojt_as_tree
+from speechtree.tree import Tree
+from speechtree.voicevox.converter import convert_tree_to_voicevox_accent_phrases
+
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+SCHEMA_VERSION = 1
+
+# NOTE: Each case is repeated until about `_N_FEATURE_PER_ROUND` features are processed, and the best of rounds is reported against noise.
+_N_FEATURE_PER_ROUND = 100_000
+_N_ROUND = 3
+
+_TREE_CASES: dict[str, Callable[[Tree], object]] = {
+    "extract_text": extract_text,
+    "extract_pronunciation": extract_pronunciation,
+    "extract_phonemes": extract_phonemes,
+    "extract_accent_positions": extract_accent_positions,
+    "extract_all": extract_all,
+    "convert_tree_to_voicevox_accent_phrases": convert_tree_to_voicevox_accent_phrases,
+}
+
+
+class CaseResult(TypedDict):
+    """Timing of a case at a size."""
+
+    case: str
+    n_feature: int
+    ms: float
+    us_per_feature: float
+
+
+def _measure(case: str, n_feature: int, func: Callable[[], object]) -> CaseResult:
+    n_repeat = max(1, _N_FEATURE_PER_ROUND // n_feature)
+    ms = min(measure_ms(func, n_repeat) for _ in range(_N_ROUND))
+    print(f"{case:<42} #feature={n_feature:>9}  {ms:12.4f} ms", file=sys.stderr)
+    return CaseResult(
+        case=case, n_feature=n_feature, ms=ms, us_per_feature=ms * 1e3 / n_feature
+    )
+
+
+def run_suite(sizes: tuple[int, ...], seed: int) -> list[CaseResult]:
+    """Time all cases at each size, inputs of a stage are made by the previous stage."""
+    results: list[CaseResult] = []
+    for n_feature in sizes:
+        raw_features = generate_njd_raw_features(n_feature, seed=seed)
+        results.append(
+            _measure(
+                "as_ojt_features", n_feature, partial(as_ojt_features, raw_features)
+            )
+        )
+        feats = as_ojt_features(raw_features)
+        del raw_features
+        results.append(
+            _measure("parse_ojt_as_tree", n_feature, partial(parse_ojt_as_tree, feats))
+        )
+        tree = parse_ojt_as_tree(feats)
+        del feats
+        results += [
+            _measure(case, n_feature, partial(func, tree))
+            for case, func in _TREE_CASES.items()
+        ]
+    return results
+
+
+def _get_commit() -> str | None:
+    try:
+        completed = subprocess.run(  # noqa: S603, because the command is fixed.
+            ["git", "rev-parse", "HEAD"],  # noqa: S607, because git is resolved from PATH as developers do.
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def _get_version() -> str | None:
+    try:
+        return version("speechtree")
+    except PackageNotFoundError:
+        return None
+
+
+def _compare(results: list[CaseResult], baseline: dict[str, Any]) -> None:
+    """Print time ratios against the baseline results, >1 means slower."""
+    baseline_ms = {(r["case"], r["n_feature"]): r["ms"] for r in baseline["results"]}
+    print(f"vs {baseline.get('commit')}")
+    for result in results:
+        base = baseline_ms.get((result["case"], result["n_feature"]))
+        ratio = "-" if base is None else f"x{result['ms'] / base:.2f}"
+        print(f"{result['case']:<42} #feature={result['n_feature']:>9}  {ratio:>7}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the suite, then write and compare the results."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="feature counts"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument(
+        "--output", type=Path, help="JSON result path, stdout if omitted"
+    )
+    parser.add_argument("--compare", type=Path, help="baseline JSON result path")
+    args = parser.parse_args(argv)
+
+    results = run_suite(tuple(args.sizes), args.seed)
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "commit": _get_commit(),
+        "speechtree": _get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    if args.compare is not None:
+        _compare(results, json.loads(args.compare.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
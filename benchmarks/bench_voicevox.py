@@ -0,0 +1,28 @@
+"""Benchmark scaling of Tree-to-VOICEVOX conversion."""
+
+from functools import partial
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.e2e import ojt_raw_features_to_tree
+from speechtree.voicevox.converter import convert_tree_to_voicevox_accent_phrases
+
+
+def main() -> None:
+    """Measure conversion time per feature, which should stay flat as trees grow."""
+    for n_feature in (1_000, 10_000, 100_000):
+        raw_features = generate_raw_features(n_feature)
+        # NOTE: Without marks, a tree is a single long breath group, the worst case of tail accent phrase detection.
+        breath_features = [f for f in raw_features if f["pron"] not in ("、", "？")]
+        for name, features in (("mixed", raw_features), ("single BG", breath_features)):
+            tree = ojt_raw_features_to_tree(features)
+            elapsed = measure_ms(
+                partial(convert_tree_to_voicevox_accent_phrases, tree), n_repeat=3
+            )
+            print(
+                f"#feature={n_feature:>7} {name:>9}: {elapsed:8.2f} ms  ({elapsed * 1e3 / len(features):6.2f} us/feature)"
+            )
+
+
+if __name__ == "__main__":
+    main()
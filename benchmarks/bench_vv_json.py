@@ -0,0 +1,44 @@
+"""Benchmark VOICEVOX JSON serialization."""
+
+import json
+from dataclasses import asdict
+from functools import partial
+
+from benchmarks.corpus import generate_raw_features
+from benchmarks.utils import measure_ms
+from speechtree.e2e import ojt_raw_features_to_tree
+from speechtree.tree import Tree
+from speechtree.voicevox.converter import convert_tree_to_voicevox_accent_phrases
+from speechtree.voicevox.domain import AccentPhrase
+from speechtree.voicevox.serializer import dumps_accent_phrases
+
+
+def _dumps_tree_via_asdict(tree: Tree) -> bytes:
+    """Serialize the tree through VOICEVOX dataclasses and `asdict()`."""
+    return _dumps_via_asdict(convert_tree_to_voicevox_accent_phrases(tree))
+
+
+def _dumps_via_asdict(vv_aps: list[AccentPhrase]) -> bytes:
+    """Serialize VOICEVOX dataclasses through `asdict()`."""
+    return json.dumps(
+        [asdict(ap) for ap in vv_aps], ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def main() -> None:
+    """Compare `asdict()` route and direct serializer."""
+    for n_feature in (1_000, 10_000, 100_000):
+        tree = ojt_raw_features_to_tree(generate_raw_features(n_feature))
+        vv_aps = convert_tree_to_voicevox_accent_phrases(tree)
+        tree_asdict = measure_ms(partial(_dumps_tree_via_asdict, tree), n_repeat=3)
+        tree_direct = measure_ms(partial(dumps_accent_phrases, tree), n_repeat=3)
+        aps_asdict = measure_ms(partial(_dumps_via_asdict, vv_aps), n_repeat=3)
+        aps_direct = measure_ms(partial(dumps_accent_phrases, vv_aps), n_repeat=3)
+        print(
+            f"#feature={n_feature:>7}  Tree: asdict {tree_asdict:8.2f} ms / direct {tree_direct:8.2f} ms"
+            f"  AccentPhrase: asdict {aps_asdict:8.2f} ms / direct {aps_direct:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Synthetic Open JTalk NJD feature corpus."""
+
+import random
+from itertools import cycle, islice
+from typing import Any
+
+from speechtree.characters import MORA_PRONUNCIATION, MR_CV
+from speechtree.ojt.domain import OjtFeature
+
+# fmt: off
+#          string        pron            acc chain_flag
+_WORDS = [
+    ("こんにちは",  "コンニチワ",    0,  0),
+    ("、",          "、",            0,  0),
+    ("今日",        "キョー",        1,  0),
+    ("は",          "ワ",            0,  1),
+    ("暖かい",      "アタタカイ",    4,  0),
+    ("です",        "デス’",         1,  1),
+    ("ね",          "ネ",            0,  1),
+    ("？",          "？",            0,  0),
+]
+# fmt: on
+
+
+def _gen_raw_feature(
+    string: str, pron: str, acc: int, chain_flag: int
+) -> dict[str, Any]:
+    # NOTE: Raw features are the dict form of `OjtFeature`, like `pyopenjtalk.run_frontend()` outputs.
+    feat = OjtFeature(string, "*", "*", "*", "*", "*", "*", string, pron, pron, acc, len(pron), "*", chain_flag)  # fmt: skip
+    # NOTE: `vars()` is a shallow copy of flat fields, several times faster than `asdict()` for million-feature corpora.
+    return vars(feat).copy()
+
+
+def generate_raw_features(n_feature: int) -> list[dict[str, Any]]:
+    """Generate `n_feature` raw features like `pyopenjtalk.run_frontend()` outputs."""
+    return [_gen_raw_feature(*word) for word in islice(cycle(_WORDS), n_feature)]
+
+
+# NOTE:
+#   Realistic corpus is a stream of sentences, each sentence is 1-3 breath groups split by `、` and ends with `、` or `？`.
+#   A breath group is 1-4 accent phrases, an accent phrase is a content word and 0-2 chaining function words.
+#   Content words are drawn from a seeded vocabulary of 1-5 moras over `MORA_PRONUNCIATION`, with prolonged sounds and unvoiced vowels.
+_FUNCTION_WORDS = (
+    ("は", "ワ"), ("が", "ガ"), ("を", "ヲ"), ("に", "ニ"), ("で", "デ"), ("と", "ト"),
+    ("も", "モ"), ("の", "ノ"), ("です", "デス’"), ("ます", "マス’"), ("た", "タ"),
+)  # fmt: skip
+_VOCABULARY_SIZE = 2_000
+_UNVOICEABLE_VOWELS = ("i", "u")
+_VOICED_VOWELS = ("a", "i", "u", "e", "o")
+
+
+def _gen_content_word(rng: random.Random) -> tuple[str, int]:
+    """Generate a pronunciation and its mora count."""
+    n_mora = rng.randint(1, 5)
+    pron, prolongable = "", False
+    for _ in range(n_mora):
+        # NOTE: Prolonged sound follows only voiced vowels, as Open JTalk outputs.
+        if prolongable and rng.random() < 0.1:  # noqa: PLR2004, because of the corpus statistics.
+            pron += "ー"
+            continue
+        mora = rng.choice(MORA_PRONUNCIATION)
+        vowel = MR_CV[mora][1]
+        unvoicing = vowel in _UNVOICEABLE_VOWELS and rng.random() < 0.2  # noqa: PLR2004, because of the corpus statistics.
+        pron += mora + ("’" if unvoicing else "")
+        prolongable = vowel in _VOICED_VOWELS and not unvoicing
+    return pron, n_mora
+
+
+def generate_njd_raw_features(n_feature: int, *, seed: int = 0) -> list[dict[str, Any]]:
+    """Generate `n_feature` realistic raw features deterministically by `seed`, like `pyopenjtalk.run_frontend()` outputs of a long document."""
+    rng = random.Random(seed)  # noqa: S311, because of benchmark data, not cryptography.
+    vocabulary = [_gen_content_word(rng) for _ in range(_VOCABULARY_SIZE)]
+    raw_features: list[dict[str, Any]] = []
+    while len(raw_features) < n_feature:
+        for i_bg in range(n_bg := rng.randint(1, 3)):
+            for _ in range(rng.randint(1, 4)):
+                pron, n_mora = rng.choice(vocabulary)
+                n_chain = rng.choice((0, 0, 1, 1, 2))
+                acc = rng.randint(0, n_mora + n_chain)
+                raw_features.append(
+                    _gen_raw_feature(pron.replace("’", ""), pron, acc, 0)
+                )
+                for string, chain_pron in rng.sample(_FUNCTION_WORDS, n_chain):
+                    raw_features.append(_gen_raw_feature(string, chain_pron, 0, 1))
+            mark = "？" if i_bg == n_bg - 1 and rng.random() < 0.1 else "、"  # noqa: PLR2004, because of the corpus statistics.
+            raw_features.append(_gen_raw_feature(mark, mark, 0, 0))
+    del raw_features[n_feature:]
+    return raw_features
@@ -0,0 +1,115 @@
+"""Local fake VOICEVOX ENGINE server for client tests and benchmarks."""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Self
+
+
+@dataclass
+class FakeEngineStats:
+    """Statistics of the fake engine."""
+
+    n_connection: int = 0
+    n_request: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    paths: list[str] = field(default_factory=list)
+
+
+class FakeEngine:
+    """
+    Fake VOICEVOX ENGINE over HTTP/1.1 keep-alive.
+
+    `/mora_data` fills `pitch` of moras with 5.0, `/synthesis` returns a fake WAV echoing the query.
+    Each request takes `latency` seconds, which emulates synthesis time.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """Initialize the engine, call `start()` or use `async with` to serve."""
+        self.latency = latency
+        self.stats = FakeEngineStats()
+        self.port = 0
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def __aenter__(self) -> Self:
+        """Start serving."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Stop serving."""
+        await self.stop()
+
+    async def start(self) -> None:
+        """Start serving at a free local port."""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.close()
+            # NOTE: `Server.close_clients()` needs Python 3.13, so keep-alive connections are closed by their own writers.
+            for writer in self._writers:
+                writer.close()
+            await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.stats.n_connection += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    request_line = await reader.readuntil(b"\r\n")
+                except asyncio.IncompleteReadError:
+                    return
+                _, target, _ = request_line.decode("ascii").split(" ", 2)
+                length = 0
+                while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                body = await reader.readexactly(length)
+
+                self.stats.n_request += 1
+                self.stats.in_flight += 1
+                self.stats.max_in_flight = max(
+                    self.stats.max_in_flight, self.stats.in_flight
+                )
+                self.stats.paths.append(target)
+                await asyncio.sleep(self.latency)
+                status, res_body = _respond(target.split("?")[0], body)
+                self.stats.in_flight -= 1
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Length: {len(res_body)}\r\n\r\n".encode()
+                    + res_body
+                )
+                await writer.drain()
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+def _respond(path: str, body: bytes) -> tuple[str, bytes]:
+    match path:
+        case "/mora_data":
+            aps = json.loads(body)
+            for ap in aps:
+                for mora in ap["moras"]:
+                    mora["pitch"] = 5.0
+            return "200 OK", json.dumps(aps, ensure_ascii=False).encode()
+        case "/synthesis":
+            return "200 OK", b"RIFF" + body
+        case _:
+            return "404 Not Found", b'{"detail":"Not Found"}'
@@ -0,0 +1,9 @@
+"""Benchmark utilities."""
+
+from collections.abc import Callable
+from timeit import timeit
+
+
+def measure_ms(func: Callable[[], object], n_repeat: int = 10) -> float:
+    """Measure the mean execution time of `func` in milliseconds."""
+    return timeit(func, number=n_repeat) / n_repeat * 1e3
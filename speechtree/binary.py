@@ -0,0 +1,393 @@
+"""SpeechTree binary format, compact serialization of Tree with lazy decode."""
+
+import struct
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import IO, Final, overload
+
+from speechtree.characters import get_phoneme
+from speechtree.tree import (
+    AccentPhrase,
+    BreathGroup,
+    MarkGroup,
+    Mora,
+    PhraseGroup,
+    Tree,
+    Word,
+)
+
+# NOTE:
+#   [Layout] little-endian. `n_x` is given by the header.
+#     header                : magic "SPTR", format version, symbol ID width and element counts
+#     group_types           : u8  [n_group]               0: BreathGroup / 1: MarkGroup
+#     group_ap_offsets      : u32 [n_group + 1]           CSR-style offsets into accent phrases
+#     ap_word_offsets       : u32 [n_ap + 1]              CSR-style offsets into words
+#     word_mora_offsets     : u32 [n_word + 1]            CSR-style offsets into moras
+#     word_text_ids         : u32 [n_word]                string table IDs
+#     mora_phoneme_offsets  : u32 [n_mora + 1]            CSR-style offsets into phonemes
+#     mora_pron_ids         : u32 [n_mora]                string table IDs
+#     mora_tone_high        : bit [n_mora]                LSB-first bit-packed
+#     phoneme_symbol_ids    : u8|u16 [n_phoneme]          symbol table IDs
+#     phoneme_unvoicing     : bit [n_phoneme]             LSB-first bit-packed
+#     symbol_string_ids     : u32 [n_symbol]              string table IDs
+#     string_offsets        : u32 [n_string + 1]          byte offsets into string blob
+#     string_blob           : u8  [n_string_byte]         UTF-8 encoded strings
+#   Offsets of every level are absolute, so any group can be decoded without decoding the others.
+
+FORMAT_VERSION: Final = 1
+_MAGIC: Final = b"SPTR"
+_HEADER: Final = struct.Struct("<4sBB8I")
+_MARK_GROUP: Final = 1
+# NOTE: Record stream is a concatenation of `u32 length` + tree binary, for multiple trees in a single file.
+_RECORD_LENGTH: Final = struct.Struct("<I")
+
+
+def _to_le_bytes(values: array[int]) -> bytes:
+    """Serialize the array as little-endian bytes."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pack_bits(flags: list[bool]) -> bytes:
+    """Pack flags into LSB-first bits."""
+    packed = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed)
+
+
+def dumps(tree: Tree) -> bytes:
+    """Serialize the tree into SpeechTree binary format."""
+    string_ids: dict[str, int] = {}
+    symbol_ids: dict[str, int] = {}
+
+    group_types = array("B")
+    group_ap_offsets = array("I", [0])
+    ap_word_offsets = array("I", [0])
+    word_mora_offsets = array("I", [0])
+    word_text_ids = array("I")
+    mora_phoneme_offsets = array("I", [0])
+    mora_pron_ids = array("I")
+    mora_tone_high: list[bool] = []
+    phoneme_symbol_ids: list[int] = []
+    phoneme_unvoicing: list[bool] = []
+    for gp in tree:
+        for ap in gp["accent_phrases"]:
+            for wd in ap["words"]:
+                for mr in wd["moras"]:
+                    for pn in mr["phonemes"]:
+                        phoneme_symbol_ids.append(
+                            symbol_ids.setdefault(pn["symbol"], len(symbol_ids))
+                        )
+                        phoneme_unvoicing.append(pn["unvoicing"])
+                    mora_phoneme_offsets.append(len(phoneme_symbol_ids))
+                    mora_pron_ids.append(
+                        string_ids.setdefault(mr["pronunciation"], len(string_ids))
+                    )
+                    mora_tone_high.append(mr["tone_high"])
+                word_mora_offsets.append(len(mora_pron_ids))
+                word_text_ids.append(string_ids.setdefault(wd["text"], len(string_ids)))
+            ap_word_offsets.append(len(word_text_ids))
+        group_ap_offsets.append(len(ap_word_offsets) - 1)
+        group_types.append(_MARK_GROUP if gp["type"] == "MarkGroup" else 0)
+
+    symbol_string_ids = array(
+        "I", [string_ids.setdefault(symbol, len(string_ids)) for symbol in symbol_ids]
+    )
+    symbol_id_typecode = "B" if len(symbol_ids) <= 2**8 else "H"
+
+    # String table
+    encoded_strings = [string.encode() for string in string_ids]
+    string_offsets = array("I", [0])
+    for encoded in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+
+    header = _HEADER.pack(
+        _MAGIC,
+        FORMAT_VERSION,
+        array(symbol_id_typecode).itemsize,
+        len(group_types),
+        len(ap_word_offsets) - 1,
+        len(word_text_ids),
+        len(mora_pron_ids),
+        len(phoneme_symbol_ids),
+        len(symbol_ids),
+        len(string_ids),
+        string_offsets[-1],
+    )
+    return b"".join(
+        [
+            header,
+            _to_le_bytes(group_types),
+            _to_le_bytes(group_ap_offsets),
+            _to_le_bytes(ap_word_offsets),
+            _to_le_bytes(word_mora_offsets),
+            _to_le_bytes(word_text_ids),
+            _to_le_bytes(mora_phoneme_offsets),
+            _to_le_bytes(mora_pron_ids),
+            _pack_bits(mora_tone_high),
+            _to_le_bytes(array(symbol_id_typecode, phoneme_symbol_ids)),
+            _pack_bits(phoneme_unvoicing),
+            _to_le_bytes(symbol_string_ids),
+            _to_le_bytes(string_offsets),
+            *encoded_strings,
+        ]
+    )
+
+
+class _Reader:
+    """Sequential reader of binary sections."""
+
+    def __init__(self, data: bytes, offset: int) -> None:
+        self._data = data
+        self._offset = offset
+
+    def read_array(self, typecode: str, size: int) -> array[int]:
+        values = array(typecode)
+        values.frombytes(self.read_bytes(size * values.itemsize))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def read_bytes(self, size: int) -> bytes:
+        end = self._offset + size
+        if end > len(self._data):
+            msg = "バイナリが途中で途切れています。"
+            raise ValueError(msg)
+        chunk = self._data[self._offset : end]
+        self._offset = end
+        return chunk
+
+    def read_bits(self, size: int) -> bytes:
+        return self.read_bytes((size + 7) // 8)
+
+
+def _unpack_bits(bits: bytes, size: int) -> list[bool]:
+    """Unpack LSB-first bits into flags."""
+    return [bool((byte >> i) & 1) for byte in bits for i in range(8)][:size]
+
+
+def _get_bit(bits: bytes, index: int) -> bool:
+    return bool((bits[index >> 3] >> (index & 7)) & 1)
+
+
+class LazyTree(Sequence[PhraseGroup]):
+    """
+    Tree in SpeechTree binary format, which is decoded group by group on access.
+
+    Decoded groups are new objects at each access. Use `to_tree()` to decode the whole tree at once.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        """Init."""
+        if len(data) < _HEADER.size:
+            msg = "バイナリが途中で途切れています。"
+            raise ValueError(msg)
+        (
+            magic,
+            version,
+            symbol_id_width,
+            n_group,
+            n_ap,
+            n_word,
+            n_mora,
+            n_phoneme,
+            n_symbol,
+            n_string,
+            n_string_byte,
+        ) = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            msg = "SpeechTree バイナリ形式ではありません。"
+            raise ValueError(msg)
+        if version != FORMAT_VERSION:
+            msg = f"バイナリ形式バージョン {version} には対応していません。対応バージョンは {FORMAT_VERSION} です。"
+            raise ValueError(msg)
+
+        reader = _Reader(data, _HEADER.size)
+        self._group_types = reader.read_bytes(n_group)
+        self._group_ap_offsets = reader.read_array("I", n_group + 1)
+        self._ap_word_offsets = reader.read_array("I", n_ap + 1)
+        self._word_mora_offsets = reader.read_array("I", n_word + 1)
+        self._word_text_ids = reader.read_array("I", n_word)
+        self._mora_phoneme_offsets = reader.read_array("I", n_mora + 1)
+        self._mora_pron_ids = reader.read_array("I", n_mora)
+        self._mora_tone_high = reader.read_bits(n_mora)
+        self._phoneme_symbol_ids = reader.read_array(
+            "B" if symbol_id_width == 1 else "H", n_phoneme
+        )
+        self._phoneme_unvoicing = reader.read_bits(n_phoneme)
+        symbol_string_ids = reader.read_array("I", n_symbol)
+        self._string_offsets = reader.read_array("I", n_string + 1)
+        self._string_blob = reader.read_bytes(n_string_byte)
+        # NOTE: Strings are decoded on demand, and memoized.
+        self._strings: dict[int, str] = {}
+        self._symbols = [self._get_string(i) for i in symbol_string_ids]
+
+    def _get_string(self, string_id: int) -> str:
+        string = self._strings.get(string_id)
+        if string is None:
+            start, end = (
+                self._string_offsets[string_id],
+                self._string_offsets[string_id + 1],
+            )
+            string = self._strings[string_id] = self._string_blob[start:end].decode()
+        return string
+
+    def _decode_mora(self, mora_index: int) -> Mora:
+        symbols, symbol_ids, unvoicing = (
+            self._symbols,
+            self._phoneme_symbol_ids,
+            self._phoneme_unvoicing,
+        )
+        pn_start, pn_end = (
+            self._mora_phoneme_offsets[mora_index],
+            self._mora_phoneme_offsets[mora_index + 1],
+        )
+        phonemes = tuple(
+            get_phoneme(symbols[symbol_ids[i]], unvoicing=_get_bit(unvoicing, i))
+            for i in range(pn_start, pn_end)
+        )
+        return Mora(
+            phonemes=phonemes,  # type: ignore[typeddict-item]
+            pronunciation=self._get_string(self._mora_pron_ids[mora_index]),
+            tone_high=_get_bit(self._mora_tone_high, mora_index),
+        )
+
+    def _decode_word(self, word_index: int) -> Word:
+        mr_start, mr_end = (
+            self._word_mora_offsets[word_index],
+            self._word_mora_offsets[word_index + 1],
+        )
+        return Word(
+            moras=[self._decode_mora(i) for i in range(mr_start, mr_end)],
+            text=self._get_string(self._word_text_ids[word_index]),
+        )
+
+    def _decode_ap(self, ap_index: int) -> AccentPhrase:
+        wd_start, wd_end = (
+            self._ap_word_offsets[ap_index],
+            self._ap_word_offsets[ap_index + 1],
+        )
+        return AccentPhrase(
+            words=[self._decode_word(i) for i in range(wd_start, wd_end)]
+        )
+
+    def _decode_group(self, group_index: int) -> PhraseGroup:
+        ap_start, ap_end = (
+            self._group_ap_offsets[group_index],
+            self._group_ap_offsets[group_index + 1],
+        )
+        aps = [self._decode_ap(i) for i in range(ap_start, ap_end)]
+        if self._group_types[group_index] == _MARK_GROUP:
+            return MarkGroup(accent_phrases=aps, type="MarkGroup")
+        return BreathGroup(accent_phrases=aps, type="BreathGroup")
+
+    def __len__(self) -> int:
+        """Count groups."""
+        return len(self._group_types)
+
+    @overload
+    def __getitem__(self, index: int) -> PhraseGroup: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[PhraseGroup]: ...
+    def __getitem__(self, index: int | slice) -> PhraseGroup | list[PhraseGroup]:
+        """Decode the group(s)."""
+        if isinstance(index, slice):
+            return [self._decode_group(i) for i in range(*index.indices(len(self)))]
+        if not -len(self) <= index < len(self):
+            msg = "group index out of range"
+            raise IndexError(msg)
+        return self._decode_group(index % len(self))
+
+    def to_tree(self) -> Tree:
+        """Decode the whole tree."""
+        # NOTE: Bulk decode by flat passes over sections, much faster than group-wise decode.
+        symbols, symbol_ids = self._symbols, self._phoneme_symbol_ids
+        unvoicing = _unpack_bits(self._phoneme_unvoicing, len(symbol_ids))
+        phonemes = [
+            get_phoneme(symbols[symbol_id], unvoicing=unvoiced)
+            for symbol_id, unvoiced in zip(symbol_ids, unvoicing, strict=True)
+        ]
+        offsets, blob = self._string_offsets, self._string_blob
+        strings = [
+            blob[offsets[i] : offsets[i + 1]].decode() for i in range(len(offsets) - 1)
+        ]
+
+        pn_offsets, pron_ids = self._mora_phoneme_offsets, self._mora_pron_ids
+        tone_high = _unpack_bits(self._mora_tone_high, len(pron_ids))
+        moras = [
+            Mora(
+                phonemes=tuple(phonemes[pn_offsets[i] : pn_offsets[i + 1]]),  # type: ignore[typeddict-item]
+                pronunciation=strings[pron_ids[i]],
+                tone_high=tone_high[i],
+            )
+            for i in range(len(pron_ids))
+        ]
+        mr_offsets, text_ids = self._word_mora_offsets, self._word_text_ids
+        words = [
+            Word(
+                moras=moras[mr_offsets[i] : mr_offsets[i + 1]],
+                text=strings[text_ids[i]],
+            )
+            for i in range(len(text_ids))
+        ]
+        wd_offsets = self._ap_word_offsets
+        aps = [
+            AccentPhrase(words=words[wd_offsets[i] : wd_offsets[i + 1]])
+            for i in range(len(wd_offsets) - 1)
+        ]
+        ap_offsets = self._group_ap_offsets
+        return [
+            MarkGroup(
+                accent_phrases=aps[ap_offsets[i] : ap_offsets[i + 1]], type="MarkGroup"
+            )
+            if group_type == _MARK_GROUP
+            else BreathGroup(
+                accent_phrases=aps[ap_offsets[i] : ap_offsets[i + 1]],
+                type="BreathGroup",
+            )
+            for i, group_type in enumerate(self._group_types)
+        ]
+
+
+def loads(data: bytes) -> LazyTree:
+    """Deserialize SpeechTree binary format into a lazily-decoded tree."""
+    return LazyTree(data)
+
+
+def dump(tree: Tree, fp: IO[bytes]) -> None:
+    """Serialize the tree into SpeechTree binary format file."""
+    fp.write(dumps(tree))
+
+
+def load(fp: IO[bytes]) -> LazyTree:
+    """Deserialize SpeechTree binary format file into a lazily-decoded tree."""
+    return loads(fp.read())
+
+
+def dumps_record(tree: Tree) -> bytes:
+    """Serialize the tree into a length-prefixed record of a record stream."""
+    data = dumps(tree)
+    return _RECORD_LENGTH.pack(len(data)) + data
+
+
+# NOTE: A zero-length record stands for a missing tree, so that records stay aligned with their sources (e.g. corpus lines).
+PLACEHOLDER_RECORD: Final = _RECORD_LENGTH.pack(0)
+
+
+def iter_load(fp: IO[bytes]) -> Iterator[LazyTree | None]:
+    """Deserialize a record stream file into lazily-decoded trees one by one, None for placeholder records."""
+    while header := fp.read(_RECORD_LENGTH.size):
+        if len(header) < _RECORD_LENGTH.size:
+            msg = "レコードが途中で途切れています。"
+            raise ValueError(msg)
+        (size,) = _RECORD_LENGTH.unpack(header)
+        data = fp.read(size)
+        if len(data) < size:
+            msg = "レコードが途中で途切れています。"
+            raise ValueError(msg)
+        yield loads(data) if size > 0 else None
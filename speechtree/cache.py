@@ -0,0 +1,256 @@
+"""Content-addressed persistent cache of parsed trees."""
+
+import hashlib
+import json
+import sqlite3
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, fields
+from importlib.metadata import PackageNotFoundError, version
+from os import PathLike
+from types import TracebackType
+from typing import Any, Final, Self
+
+from speechtree.binary import FORMAT_VERSION, LazyTree, dumps, loads
+from speechtree.diagnostics import Diagnostic, collect_diagnostics, forward, report
+from speechtree.ojt.domain import OjtFeature
+from speechtree.ojt.parser import PARSER_OUTPUT_VERSION
+from speechtree.tree import Tree
+
+DEFAULT_CACHE_MAX_BYTES: Final = 64 * 1024 * 1024
+
+# NOTE:
+#   Hits are read-only. Access times of hits are buffered in memory, and written in a batch on `put()`, `close()` or a full buffer.
+#   WAL with `synchronous=NORMAL` makes the batched writes cheap, at the cost of durability of the last commits on power loss.
+#   The cache is disposable, so databases of another schema version are recreated.
+_SCHEMA_VERSION: Final = 1
+_SCHEMA: Final = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+DROP TABLE IF EXISTS entries;
+DROP TABLE IF EXISTS meta;
+CREATE TABLE entries (
+    key         BLOB PRIMARY KEY,
+    value       BLOB NOT NULL,
+    diagnostics TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    last_access INTEGER NOT NULL
+);
+CREATE INDEX entries_last_access ON entries (last_access);
+CREATE TABLE meta (
+    id          INTEGER PRIMARY KEY CHECK (id = 0),
+    total_size  INTEGER NOT NULL,
+    clock       INTEGER NOT NULL
+);
+INSERT INTO meta VALUES (0, 0, 0);
+"""
+_MAX_PENDING_ACCESSES: Final = 1024
+
+
+def _speechtree_version() -> str:
+    try:
+        return version("speechtree")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+# NOTE:
+#   Trees depend on both parser output and storage format, so both of them are mixed into keys.
+#   Package versions are not bumped on every change, so the parser output version is mixed in explicitly.
+_KEY_SALT: Final = f"speechtree={_speechtree_version()};parser={PARSER_OUTPUT_VERSION};format={FORMAT_VERSION}\n".encode()
+
+
+_FIELD_NAMES: Final = tuple(field.name for field in fields(OjtFeature))
+
+
+def cache_key(raw_features: Any) -> bytes:  # noqa: ANN401, because raw features are not validated yet
+    """
+    Hash raw Open JTalk features into a stable key, by SHA-256 of canonical JSON.
+
+    Only `OjtFeature` fields are hashed in the fixed order, so keys are independent of dict key order and extra keys.
+    Raises KeyError or TypeError for malformed features.
+    """
+    # NOTE: Field-ordered rows are 3x faster to serialize than `sort_keys=True` dicts.
+    rows = [[feat[name] for name in _FIELD_NAMES] for feat in raw_features]
+    canonical = json.dumps(rows, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(_KEY_SALT + canonical.encode()).digest()
+
+
+@dataclass
+class CacheStats:
+    """Counters of a cache instance."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class TreeCache:
+    """
+    パース済みツリーの永続キャッシュ。
+
+    生の Open JTalk 特徴量列と speechtree・パーサー出力バージョンのハッシュをキーとし、ツリーをバイナリ形式で sqlite に保存する。
+    ヒット時はツリーを全てデコードせず、アクセス時にデコードする `LazyTree` を返す。
+    総サイズが `max_bytes` を超えると、最も長くアクセスされていないエントリから削除する (LRU)。
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        *,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        """Open or create the cache database at `path`."""
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._db = sqlite3.connect(path)
+        (schema_version,) = self._db.execute("PRAGMA user_version").fetchone()
+        if schema_version != _SCHEMA_VERSION:
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        # NOTE: Keys of hits not yet written, in access order.
+        self._pending_accesses: dict[bytes, None] = {}
+
+    def __enter__(self) -> Self:
+        """Enter the cache context."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the database."""
+        self.close()
+
+    def close(self) -> None:
+        """Write buffered access times and close the database."""
+        with self._db:
+            self._flush_accesses()
+        self._db.close()
+
+    def __len__(self) -> int:
+        """Count entries."""
+        return int(self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+    @property
+    def total_size(self) -> int:
+        """Total size of stored trees in bytes."""
+        return int(self._db.execute("SELECT total_size FROM meta").fetchone()[0])
+
+    def get(self, raw_features: Any) -> LazyTree | None:  # noqa: ANN401, because raw features are not validated yet
+        """Get the cached tree of the raw features lazily, or None if missing. Diagnostics of the original parse are reported again."""
+        return self._get(cache_key(raw_features))
+
+    def _get(self, key: bytes) -> LazyTree | None:
+        row = self._db.execute(
+            "SELECT value, diagnostics FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self._pending_accesses.pop(key, None)
+        self._pending_accesses[key] = None
+        if len(self._pending_accesses) >= _MAX_PENDING_ACCESSES:
+            with self._db:
+                self._flush_accesses()
+        for code, message in json.loads(row[1]):
+            report(code, message, stacklevel=3)
+        # NOTE: Full decode costs as much as parsing, so hits are decoded on access only.
+        return loads(row[0])
+
+    def _flush_accesses(self) -> None:
+        """Write buffered access times, in the current transaction."""
+        if not self._pending_accesses:
+            return
+        keys = list(self._pending_accesses)
+        self._pending_accesses.clear()
+        (clock,) = self._db.execute("SELECT clock FROM meta").fetchone()
+        self._db.executemany(
+            "UPDATE entries SET last_access = ? WHERE key = ?",
+            [(clock + i, key) for i, key in enumerate(keys)],
+        )
+        self._db.execute("UPDATE meta SET clock = clock + ?", (len(keys),))
+
+    def put(
+        self,
+        raw_features: Any,  # noqa: ANN401, because raw features are not validated yet
+        tree: Tree,
+        diagnostics: Sequence[Diagnostic] = (),
+    ) -> None:
+        """Store the tree of the raw features with diagnostics of its parse, evicting least recently used entries over the size limit."""
+        self._put(cache_key(raw_features), tree, diagnostics)
+
+    def _put(self, key: bytes, tree: Tree, diagnostics: Sequence[Diagnostic]) -> None:
+        value = dumps(tree)
+        if len(value) > self.max_bytes:
+            return
+        diagnostics_json = json.dumps(
+            [[diag.code, diag.message] for diag in diagnostics], ensure_ascii=False
+        )
+        with self._db:
+            # NOTE: Buffered hits are older than this entry.
+            self._flush_accesses()
+            old = self._db.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, (SELECT clock FROM meta))",
+                (key, value, diagnostics_json, len(value)),
+            )
+            self._db.execute(
+                "UPDATE meta SET clock = clock + 1, total_size = total_size + ?",
+                (len(value) - (old[0] if old else 0),),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the total size fits, in the current transaction."""
+        (total_size,) = self._db.execute("SELECT total_size FROM meta").fetchone()
+        if total_size <= self.max_bytes:
+            return
+        evicted_keys: list[bytes] = []
+        for key, size in self._db.execute(
+            "SELECT key, size FROM entries ORDER BY last_access"
+        ):
+            if total_size <= self.max_bytes:
+                break
+            evicted_keys.append(key)
+            total_size -= size
+        self._db.executemany(
+            "DELETE FROM entries WHERE key = ?", [(key,) for key in evicted_keys]
+        )
+        self._db.execute("UPDATE meta SET total_size = ?", (total_size,))
+        self.stats.evictions += len(evicted_keys)
+
+    def get_or_parse(
+        self,
+        raw_features: Any,  # noqa: ANN401, because raw features are not validated yet
+        parse: Callable[[Any], Tree],
+    ) -> Tree | LazyTree:
+        """Get the cached tree lazily, or parse the raw features and cache the tree with diagnostics of the parse."""
+        try:
+            # NOTE: Features are read twice, for the key and by the parser, so iterators are materialized once.
+            raw_features = list(raw_features)
+            key = cache_key(raw_features)
+        except (KeyError, TypeError):
+            # NOTE: Malformed features are not cached, and rejected by the parser.
+            return parse(raw_features)
+        cached_tree = self._get(key)
+        if cached_tree is not None:
+            return cached_tree
+        with collect_diagnostics() as diagnostics:
+            tree = parse(raw_features)
+        # NOTE: Diagnostics are already counted by the collector's report, so only forwarded to the outer sink.
+        for diagnostic in diagnostics:
+            forward(diagnostic, stacklevel=2)
+        self._put(key, tree, diagnostics)
+        return tree
+
+    def clear(self) -> None:
+        """Remove all entries, counters are kept."""
+        self._pending_accesses.clear()
+        with self._db:
+            self._db.execute("DELETE FROM entries")
+            self._db.execute("UPDATE meta SET total_size = 0")
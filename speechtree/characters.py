@@ -1,9 +1,19 @@
 """Characters."""
 
 import re
+from functools import cache, lru_cache, partial
 from itertools import groupby
-from typing import Final, Literal
+from typing import Any, Final, Literal, NoReturn, cast
 
+from speechtree.tree import (
+    AccentPhrase,
+    BreathGroup,
+    MarkGroup,
+    Mora,
+    Phoneme,
+    Tree,
+    Word,
+)
 from speechtree.utils import get_args
 
 # fmt: off
@@ -14,6 +24,7 @@ type PhonemeSymbol = ConsonantSymbol | VowelSymbol
 CONSONANT_SYMBOLS: Final[tuple[ConsonantSymbol, ...]] = get_args(ConsonantSymbol)
 VOWEL_SYMBOLS: Final[tuple[VowelSymbol, ...]] = get_args(VowelSymbol)
 PHONEME_SYMBOLS: Final[tuple[PhonemeSymbol, ...]] = CONSONANT_SYMBOLS + VOWEL_SYMBOLS
+UNVOICED_VOWEL_SYMBOLS: Final[dict[str, VowelSymbol]] = {"a": "A", "i": "I", "u": "U", "e": "E", "o": "O"}  # NOTE: voiced -> unvoiced
 
 # missing phonemes:
 #     /hu/, /yi/, /tye/ /dye/
@@ -241,4 +252,272 @@ def _generate_mora_match_pattern(mora_simbols: tuple[str, ...]) -> re.Pattern[st
     return re.compile(_pattern)
 
 
-MORA_MATCH_PATTERN: Final = _generate_mora_match_pattern(MORA_PRONUNCIATION)
+@cache
+def _get_mora_match_pattern() -> re.Pattern[str]:
+    return _generate_mora_match_pattern(MORA_PRONUNCIATION)
+
+
+def __getattr__(name: str) -> re.Pattern[str]:
+    """Compile `MORA_MATCH_PATTERN` on first access, because the parser uses the token table instead."""
+    if name == "MORA_MATCH_PATTERN":
+        return _get_mora_match_pattern()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+def _generate_mora_token_table(
+    mora_symbols: tuple[str, ...],
+) -> dict[str, tuple[str, bool]]:
+    """Generate a mora-token table, which maps a token into its mora pronunciation and unvoicing flag."""
+    table = {mark: (mark, False) for mark in ("、", "？", "ー")}  # noqa: RUF001, because of Japanese.
+    for symbol in mora_symbols:
+        table[symbol] = (symbol, False)
+        table[symbol + "’"] = (symbol, True)  # noqa: RUF001, because of Japanese.
+    return table
+
+
+# NOTE: Longest match over the table is identical to `MORA_MATCH_PATTERN` match, because the pattern tries longer alternatives first.
+MORA_TOKEN_TABLE: Final = _generate_mora_token_table(MORA_PRONUNCIATION)
+MORA_TOKEN_LENGTHS: Final = tuple(
+    sorted({len(token) for token in MORA_TOKEN_TABLE}, reverse=True)
+)
+
+
+class _InternedPhoneme(dict[str, Any]):
+    """
+    Immutable phoneme shared across trees.
+
+    Behaves as a `Phoneme` for readers. Copies are ordinary mutable `Phoneme`s.
+    """
+
+    __slots__ = ()
+
+    def _raise_immutable(self, *args: object, **kwargs: object) -> NoReturn:
+        _ = args, kwargs
+        msg = "共有された音素は変更できません。コピーしてから変更してください。"
+        raise TypeError(msg)
+
+    __setitem__ = __delitem__ = __ior__ = _raise_immutable
+    clear = pop = popitem = setdefault = update = _raise_immutable
+
+    def __copy__(self) -> Phoneme:
+        return Phoneme(symbol=self["symbol"], unvoicing=self["unvoicing"])
+
+    def __deepcopy__(self, memo: dict[int, object]) -> Phoneme:
+        return self.__copy__()
+
+    def __reduce__(self) -> tuple[object, tuple[str]]:
+        # NOTE: Unpickled phonemes are interned again.
+        return (partial(get_phoneme, unvoicing=self["unvoicing"]), (self["symbol"],))
+
+
+def _generate_phoneme_table(
+    symbols: tuple[str, ...],
+) -> dict[tuple[str, bool], Phoneme]:
+    """Generate a table of interned phonemes, keyed by symbol and unvoicing flag."""
+    return {
+        (symbol, unvoicing): cast(
+            "Phoneme", _InternedPhoneme(symbol=symbol, unvoicing=unvoicing)
+        )
+        for symbol in symbols
+        for unvoicing in (False, True)
+    }
+
+
+PHONEME_TABLE: Final = _generate_phoneme_table(PHONEME_SYMBOLS)
+
+
+def get_phoneme(symbol: str, *, unvoicing: bool) -> Phoneme:
+    """
+    Get the shared immutable phoneme.
+
+    Standard symbols in `PHONEME_SYMBOLS` are interned, other symbols produce a new phoneme at each call.
+    """
+    phoneme = PHONEME_TABLE.get((symbol, unvoicing))
+    if phoneme is None:
+        return Phoneme(symbol=symbol, unvoicing=unvoicing)
+    return phoneme
+
+
+def is_tone_high(i: int, acc_pos: int) -> bool:
+    """Whether the i-th mora of an accent phrase is high by 東京式アクセント rule, where `acc_pos` is the accent type or the mora count if flat."""
+    # NOTE: High until the accent position, except the head if not type1.
+    return i < acc_pos and not (i == 0 and acc_pos > 1)
+
+
+# Kana notation
+# NOTE:
+#   AquesTalk-like notation of VOICEVOX, e.g. "コンニチワ'、キョ'ーワ/アタタカ'イデ_スネ" + question mark.
+#   `'` follows the accent nucleus mora, `_` precedes an unvoiced mora, and a trailing question mark makes an interrogative phrase.
+#   `/` separates accent phrases in a breath group, and `、` separates them with a pause mark group.
+#   Tones follow the same 東京式アクセント rule as the Open JTalk parser, and each accent phrase becomes a single word.
+_KANA_PROLONGED = "ー"
+_KANA_INTERROGATIVE, _KANA_PAUSE = "？", "、"  # noqa: RUF001, because of Japanese.
+_KANA_DELIMITER_PATTERN: Final = re.compile(f"(/|{_KANA_PAUSE})")
+
+
+type _MoraPhonemes = tuple[Phoneme, Phoneme] | tuple[Phoneme]
+
+
+def _generate_kana_mora_table(
+    mora_symbols: tuple[MoraPronunciation, ...],
+) -> dict[str, tuple[_MoraPhonemes, _MoraPhonemes]]:
+    """Generate a table of mora phonemes, voiced and unvoiced, keyed by kana."""
+    table: dict[str, tuple[_MoraPhonemes, _MoraPhonemes]] = {}
+    for symbol in mora_symbols:
+        consonant_symbol, vowel_symbol = MR_CV[symbol]
+        v, unvoiced_v = (
+            get_phoneme(vowel_symbol, unvoicing=unvoicing)
+            for unvoicing in (False, True)
+        )
+        if consonant_symbol is None:
+            table[symbol] = ((v,), (unvoiced_v,))
+        else:
+            # NOTE: consonant is never unvoiced/無声化 because consonant is always unvoice/無声音.
+            c = get_phoneme(consonant_symbol, unvoicing=False)
+            table[symbol] = ((c, v), (c, unvoiced_v))
+    return table
+
+
+_KANA_MORA_TABLE: Final = _generate_kana_mora_table(MORA_PRONUNCIATION)
+_KANA_MORA_LENGTHS: Final = tuple(
+    sorted({len(kana) for kana in _KANA_MORA_TABLE}, reverse=True)
+)
+
+
+def _raise_kana_error(phrase: str, position: int, reason: str) -> NoReturn:
+    msg = f"アクセント句 `{phrase}` の {position} 文字目: {reason}"
+    raise ValueError(msg)
+
+
+def _match_kana_mora(
+    phrase: str, head: int, prev: _MoraPhonemes | None, *, unvoicing: bool
+) -> tuple[str, _MoraPhonemes]:
+    """Match the longest mora at `head`, the prolonged sound extends the vowel of the previous mora `prev`."""
+    if phrase[head] == _KANA_PROLONGED:
+        if prev is None:
+            _raise_kana_error(phrase, head, "長音は句頭に置けません。")
+        return _KANA_PROLONGED, (get_phoneme(prev[-1]["symbol"], unvoicing=unvoicing),)
+    for length in _KANA_MORA_LENGTHS:
+        token = phrase[head : head + length]
+        phonemes = _KANA_MORA_TABLE.get(token)
+        if phonemes is not None:
+            return token, phonemes[unvoicing]
+    _raise_kana_error(phrase, head, f"`{phrase[head:]}` はモーラへ分割できません。")
+
+
+def _build_kana_phrase(
+    phrase: str,
+) -> tuple[str, tuple[tuple[str, _MoraPhonemes, bool], ...]]:
+    """Tokenize a kana accent phrase into its text and mora templates (pronunciation, phonemes, tone)."""
+    # NOTE: Longest-match tokenization in linear time, same as the Open JTalk pronunciation split.
+    moras: list[tuple[str, _MoraPhonemes]] = []
+    accent: int | None = None
+    unvoicing = False
+    head = 0
+    while head < len(phrase):
+        match phrase[head]:
+            case "'":
+                if accent is not None or len(moras) == 0 or unvoicing:
+                    _raise_kana_error(
+                        phrase,
+                        head,
+                        "アクセント記号はモーラの直後に 1 つだけ置けます。",
+                    )
+                accent = len(moras)
+                head += 1
+            case "_":
+                if unvoicing:
+                    _raise_kana_error(phrase, head, "無声化記号が連続しています。")
+                unvoicing = True
+                head += 1
+            case _:
+                prev = moras[-1][1] if moras else None
+                token, phonemes = _match_kana_mora(
+                    phrase, head, prev, unvoicing=unvoicing
+                )
+                moras.append((token, phonemes))
+                head += len(token)
+                unvoicing = False
+    if unvoicing:
+        _raise_kana_error(phrase, head, "無声化記号の後にモーラがありません。")
+    if accent is None:
+        _raise_kana_error(phrase, head, "アクセント記号がありません。")
+
+    text = "".join(pron for pron, _ in moras)
+    # NOTE: The accent position is the accent type.
+    templates = tuple(
+        (pron, pns, is_tone_high(i, accent)) for i, (pron, pns) in enumerate(moras)
+    )
+    return text, templates
+
+
+DEFAULT_KANA_CACHE_SIZE: Final = 4096
+_lookup_kana_phrase = lru_cache(maxsize=DEFAULT_KANA_CACHE_SIZE)(_build_kana_phrase)
+
+
+def parse_kana_as_word(phrase: str) -> Word:
+    """
+    カナ表記のアクセント句 (例: `キョ'ーワ`) を、トーン付きの単一ワードへ変換する。
+
+    `'` はアクセント核のモーラの直後に必ず 1 つ置き、`_` は直後のモーラを無声化する。
+    区切り記号 `/`・`、` と疑問符は含められない。不正な表記では ValueError を送出する。
+    """
+    text, templates = _lookup_kana_phrase(phrase)
+    moras = [
+        Mora(phonemes=pns, pronunciation=pron, tone_high=tone_high)
+        for pron, pns, tone_high in templates
+    ]
+    return Word(moras=moras, text=text)
+
+
+def parse_kana_as_ap(phrase: str) -> AccentPhrase:
+    """カナ表記のアクセント句を、単一ワードのアクセント句へ変換する。表記は `parse_kana_as_word()` を参照。"""
+    return AccentPhrase(words=[parse_kana_as_word(phrase)])
+
+
+def gen_mark_ap(mark: str) -> AccentPhrase:
+    """Generate a mark accent phrase of the mark text, same as the Open JTalk parser's."""
+    mora = Mora(
+        phonemes=(get_phoneme("pau", unvoicing=False),),
+        pronunciation="　",
+        tone_high=True,
+    )
+    return AccentPhrase(words=[Word(moras=[mora], text=mark)])
+
+
+def _append_kana_ap(utterance: Tree, ap: AccentPhrase, *, is_mark: bool) -> None:
+    """Append the accent phrase to the last group if the same type, otherwise to a new group."""
+    if len(utterance) > 0 and (utterance[-1]["type"] == "MarkGroup") == is_mark:
+        utterance[-1]["accent_phrases"].append(ap)
+    elif is_mark:
+        utterance.append(MarkGroup(accent_phrases=[ap], type="MarkGroup"))
+    else:
+        utterance.append(BreathGroup(accent_phrases=[ap], type="BreathGroup"))
+
+
+def parse_kana_as_tree(kana: str) -> Tree:
+    """
+    AquesTalk 風のカナ表記 (例: `コンニチワ'、キョ'ーワ/アタタカ'イデ_スネ`) を、NJD フロントエンドを経ずに Tree へ変換する。
+
+    アクセント句は `/` で区切られ、`、` で区切ると間に「、」のマークグループが入る。
+    句末の全角疑問符は疑問文を表し、アクセント句の後ろに疑問符のマークグループが入る。
+    各アクセント句の表記は `parse_kana_as_word()` を参照。空文字列は空の Tree となる。
+    """
+    utterance: Tree = []
+    if kana == "":
+        return utterance
+    items = _KANA_DELIMITER_PATTERN.split(kana)
+    # NOTE: Phrases and delimiters alternate, like ["コンニチワ'", "、", "キョ'ーワ", "/", "アタタカ'イデ_スネ"].
+    for phrase, delimiter in zip(items[::2], [*items[1::2], ""], strict=True):
+        is_interrogative = phrase.endswith(_KANA_INTERROGATIVE)
+        _append_kana_ap(
+            utterance,
+            parse_kana_as_ap(phrase.removesuffix(_KANA_INTERROGATIVE)),
+            is_mark=False,
+        )
+        if is_interrogative:
+            _append_kana_ap(utterance, gen_mark_ap(_KANA_INTERROGATIVE), is_mark=True)
+        if delimiter == _KANA_PAUSE:
+            _append_kana_ap(utterance, gen_mark_ap(_KANA_PAUSE), is_mark=True)
+    return utterance
@@ -0,0 +1,287 @@
+"""Command-line batch converter of Open JTalk feature corpora."""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import IO, Final, Literal, get_args
+
+from speechtree.binary import PLACEHOLDER_RECORD, dumps_record
+from speechtree.ojt.loader import as_ojt_features
+from speechtree.ojt.parser import parse_ojt_as_tree
+from speechtree.voicevox.converter import convert_tree_to_voicevox_accent_phrases
+from speechtree.voicevox.serializer import dumps_accent_phrases
+
+type OutputFormat = Literal["tree", "voicevox", "binary"]
+
+DEFAULT_CHUNK_SIZE: Final = 256
+
+# NOTE:
+#   Input is JSONL, each line is a `pyopenjtalk.run_frontend()` output of an utterance.
+#   Lines are converted chunk by chunk in worker processes, and chunk outputs are written in input order.
+#   After each chunk is written and synced, the checkpoint records consumed input lines and output size,
+#   so a resumed job truncates the partial output and restarts from the next chunk.
+#   Blank and skipped lines are written as placeholders, so the n-th output record is always of the n-th input line.
+_PLACEHOLDERS: Final[dict[OutputFormat, bytes]] = {
+    "tree": b"null\n",
+    "voicevox": b"null\n",
+    "binary": PLACEHOLDER_RECORD,
+}
+
+
+@dataclass(frozen=True)
+class _Checkpoint:
+    """Progress of a job, which is consistent with the synced output."""
+
+    output_format: OutputFormat
+    n_line: int  # Number of consumed input lines
+    output_size: int  # Output size in bytes
+
+
+@dataclass(frozen=True)
+class _ChunkResult:
+    """Converted outputs of an input chunk."""
+
+    output: bytes
+    n_line: int
+    errors: list[tuple[int, str]]  # (line number, error message)
+
+
+def _convert_line(line: str, output_format: OutputFormat, *, trusted: bool) -> bytes:
+    """Convert a JSON line of raw features into an output record."""
+    feats = as_ojt_features(json.loads(line), trusted=trusted)
+    tree = parse_ojt_as_tree(feats)
+    if output_format == "binary":
+        return dumps_record(tree)
+    if output_format == "voicevox":
+        vv_aps = convert_tree_to_voicevox_accent_phrases(tree)
+        return dumps_accent_phrases(vv_aps) + b"\n"
+    return json.dumps(tree, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+
+
+def _convert_chunk(
+    first_line_no: int,
+    lines: list[str],
+    output_format: OutputFormat,
+    *,
+    trusted: bool,
+) -> _ChunkResult:
+    """Convert an input chunk, collecting line-wise errors instead of raising. Blank and failed lines output placeholders."""
+    outputs: list[bytes] = []
+    errors: list[tuple[int, str]] = []
+    for line_no, line in enumerate(lines, first_line_no):
+        if line.strip() == "":
+            outputs.append(_PLACEHOLDERS[output_format])
+            continue
+        try:
+            outputs.append(_convert_line(line, output_format, trusted=trusted))
+        except Exception as e:  # noqa: BLE001, because a malformed line should not abort the whole corpus.
+            errors.append((line_no, f"{type(e).__name__}: {e}"))
+            outputs.append(_PLACEHOLDERS[output_format])
+    return _ChunkResult(b"".join(outputs), len(lines), errors)
+
+
+def _iter_chunks(
+    lines: Iterable[str], n_skip: int, chunk_size: int
+) -> Iterator[tuple[int, list[str]]]:
+    """Yield (first line number, lines) chunks after skipping consumed lines."""
+    line_iter = islice(lines, n_skip, None)
+    first_line_no = n_skip + 1
+    while chunk := list(islice(line_iter, chunk_size)):
+        yield first_line_no, chunk
+        first_line_no += len(chunk)
+
+
+def _map_ordered(
+    convert: Callable[[int, list[str]], _ChunkResult],
+    chunks: Iterator[tuple[int, list[str]]],
+    n_job: int,
+) -> Iterator[_ChunkResult]:
+    """Convert chunks with `n_job` processes, yielding results in input order."""
+    if n_job <= 1:
+        for chunk in chunks:
+            yield convert(*chunk)
+        return
+    # NOTE: In-flight chunks are bounded, so the input is streamed with constant memory.
+    window = 2 * n_job
+    with ProcessPoolExecutor(max_workers=n_job) as executor:
+        pending: deque[Future[_ChunkResult]] = deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(convert, *chunk))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _load_checkpoint(path: Path) -> _Checkpoint:
+    return _Checkpoint(**json.loads(path.read_text(encoding="utf-8")))
+
+
+def _save_checkpoint(path: Path, checkpoint: _Checkpoint) -> None:
+    """Save the checkpoint atomically, so that a kill never leaves a broken checkpoint."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(asdict(checkpoint)), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _open_output(path: Path, start: _Checkpoint) -> IO[bytes]:
+    """Open the output, truncated to the checkpoint."""
+    if start.output_size == 0:
+        return path.open("wb")
+    if not path.exists() or path.stat().st_size < start.output_size:
+        msg = f"出力ファイル '{path}' がチェックポイントより短いため再開できません。"
+        raise ValueError(msg)
+    dst = path.open("r+b")
+    dst.truncate(start.output_size)
+    dst.seek(start.output_size)
+    return dst
+
+
+def convert_corpus(  # noqa: PLR0913, because each option is independent.
+    input_path: str,
+    output_path: Path,
+    *,
+    output_format: OutputFormat = "tree",
+    n_job: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_path: Path | None = None,
+    resume: bool = False,
+    trusted: bool = False,
+    skip_errors: bool = False,
+) -> list[tuple[int, str]]:
+    """
+    Open JTalk 特徴量の JSONL コーパスを、入力順を保ったまま並列に変換する。
+
+    `input_path` が `-` の場合は標準入力を読む。
+    `resume` が真でチェックポイントが存在する場合、前回の中断箇所から再開する。
+    エラー行は `skip_errors` が真ならスキップされ、偽なら最初のエラーを含むチャンクの手前で停止する。
+    空行とスキップされた行には、JSONL では `null` 行、binary では長さ 0 のレコードが出力され、出力の n 番目は常に入力の n 行目に対応する。
+
+    Returns
+    -------
+    (行番号, エラーメッセージ) のリスト
+    """
+    checkpoint_path = checkpoint_path or output_path.with_name(
+        output_path.name + ".ckpt"
+    )
+    start = _Checkpoint(output_format, 0, 0)
+    if resume and checkpoint_path.exists():
+        start = _load_checkpoint(checkpoint_path)
+        if start.output_format != output_format:
+            msg = f"チェックポイントの出力形式 '{start.output_format}' が指定された形式 '{output_format}' と異なります。"
+            raise ValueError(msg)
+
+    convert = partial(_convert_chunk, output_format=output_format, trusted=trusted)
+    all_errors: list[tuple[int, str]] = []
+    n_line, output_size = start.n_line, start.output_size
+    src = (
+        sys.stdin if input_path == "-" else Path(input_path).open(encoding="utf-8")  # noqa: SIM115, because closed below with stdin handling.
+    )
+    try:
+        with _open_output(output_path, start) as dst:
+            chunks = _iter_chunks(src, start.n_line, chunk_size)
+            for result in _map_ordered(convert, chunks, n_job):
+                all_errors += result.errors
+                if result.errors and not skip_errors:
+                    return all_errors
+                dst.write(result.output)
+                dst.flush()
+                os.fsync(dst.fileno())
+                n_line += result.n_line
+                output_size += len(result.output)
+                _save_checkpoint(
+                    checkpoint_path, _Checkpoint(output_format, n_line, output_size)
+                )
+    finally:
+        if src is not sys.stdin:
+            src.close()
+    checkpoint_path.unlink(missing_ok=True)
+    return all_errors
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="speechtree",
+        description="Open JTalk 特徴量 (pyopenjtalk.run_frontend() 出力) の JSONL を Tree / VOICEVOX アクセント句へ変換する。",
+    )
+    parser.add_argument("input", help="入力 JSONL のパス。`-` で標準入力。")
+    parser.add_argument("output", type=Path, help="出力ファイルのパス。")
+    parser.add_argument(
+        "--format",
+        choices=get_args(OutputFormat.__value__),
+        default="tree",
+        help="出力形式。tree/voicevox は JSONL、binary は長さ付きレコード列。 (既定: tree)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="ワーカープロセス数。1 ならプロセスを使わない。 (既定: CPU 数)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"ワーカーへ一度に渡す行数。 (既定: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="チェックポイントのパス。 (既定: <output>.ckpt)",
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="チェックポイントから再開する。"
+    )
+    parser.add_argument(
+        "--trusted",
+        action="store_true",
+        help="入力を信頼し、特徴量の検証を省略する。",
+    )
+    parser.add_argument(
+        "--skip-errors",
+        action="store_true",
+        help="変換できない行を報告し、代わりに null 行 (binary では空レコード) を出力する。既定では最初のエラーで停止する。",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the `speechtree` command."""
+    args = _build_parser().parse_args(argv)
+    errors = convert_corpus(
+        args.input,
+        args.output,
+        output_format=args.format,
+        n_job=args.jobs,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint,
+        resume=args.resume,
+        trusted=args.trusted,
+        skip_errors=args.skip_errors,
+    )
+    for line_no, msg in errors:
+        sys.stderr.write(f"{line_no} 行目: {msg}\n")
+    if errors and not args.skip_errors:
+        sys.stderr.write(
+            "エラーのため停止しました。修正後に --resume で再開できます。\n"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
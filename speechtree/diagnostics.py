@@ -0,0 +1,88 @@
+"""Diagnostics of lenient parsing and conversion, which are warned by default."""
+
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Literal
+from warnings import warn
+
+type DiagnosticCode = Literal[
+    "head_prolonged_sound",  # A word starts with `ー`, which is ignored.
+    "head_chaining",  # A phrase-head word has chain flag, which is ignored.
+    "head_mark_group",  # A tree starts with MarkGroup, which VOICEVOX ignores.
+]
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """A recoverable problem of inputs, which is fixed up leniently."""
+
+    code: DiagnosticCode
+    message: str
+
+
+# NOTE: `None` means the default sink, `warnings.warn()`. Context-local, so threads and tasks collect their own diagnostics.
+_sink: ContextVar[Callable[[Diagnostic], None] | None] = ContextVar(
+    "speechtree_diagnostic_sink", default=None
+)
+
+# NOTE: Counter of reported diagnostics by code regardless of the sink, set by `count_diagnostics()`.
+_counter: ContextVar[Counter[DiagnosticCode] | None] = ContextVar(
+    "speechtree_diagnostic_counter", default=None
+)
+
+
+def report(code: DiagnosticCode, message: str, *, stacklevel: int = 1) -> None:
+    """Report a diagnostic to the current sink, `stacklevel` works as same as `warnings.warn()` of the caller."""
+    counter = _counter.get()
+    if counter is not None:
+        counter[code] += 1
+    forward(Diagnostic(code, message), stacklevel=stacklevel + 1)
+
+
+def forward(diagnostic: Diagnostic, *, stacklevel: int = 1) -> None:
+    """Send an already reported diagnostic to the current sink, without counting it again."""
+    sink = _sink.get()
+    if sink is None:
+        warn(diagnostic.message, stacklevel=stacklevel + 1)
+    else:
+        sink(diagnostic)
+
+
+def _discard(_: Diagnostic) -> None:
+    pass
+
+
+@contextmanager
+def collect_diagnostics() -> Iterator[list[Diagnostic]]:
+    """Collect diagnostics in the context into the yielded list, instead of warning."""
+    diagnostics: list[Diagnostic] = []
+    token = _sink.set(diagnostics.append)
+    try:
+        yield diagnostics
+    finally:
+        _sink.reset(token)
+
+
+@contextmanager
+def suppress_diagnostics() -> Iterator[None]:
+    """Discard diagnostics in the context, without warning."""
+    token = _sink.set(_discard)
+    try:
+        yield
+    finally:
+        _sink.reset(token)
+
+
+@contextmanager
+def count_diagnostics(
+    counter: Counter[DiagnosticCode],
+) -> Iterator[Counter[DiagnosticCode]]:
+    """Count reported diagnostics in the context by code into the counter, whichever the sink is."""
+    token = _counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _counter.reset(token)
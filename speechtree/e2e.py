@@ -1,22 +1,203 @@
 """End-to-End converter."""
 # NOTE: Should not implement conversion algorithms here.
 
-from typing import Any
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Final, overload
 
+from .diagnostics import Diagnostic, collect_diagnostics, suppress_diagnostics
+from .instrumentation import current_metrics
+from .ojt.domain import OjtFeature
 from .ojt.loader import as_ojt_features
-from .ojt.parser import parse_ojt_as_tree
+from .ojt.parser import PronunciationError, parse_ojt_as_tree
 from .tree import Tree
+from .utils import CacheInfo
 from .voicevox.converter import convert_tree_to_voicevox_accent_phrases
 from .voicevox.domain import AccentPhrase
+from .voicevox.ojt_converter import (
+    build_vv_mora_fields_of_pron,
+    convert_ojt_to_voicevox_accent_phrases,
+)
 
+if TYPE_CHECKING:
+    # NOTE: Type-only import, so that sqlite3/hashlib are not loaded until a cache is created.
+    from .binary import LazyTree
+    from .cache import TreeCache
 
-def ojt_raw_features_to_tree(raw_features: Any) -> Tree:  # noqa: ANN401, because this function works as validator
-    """Convert raw Open JTalk text-processing features into a hierarchical utterance."""
+DEFAULT_PIPELINE_CACHE_SIZE: Final = 4096
+
+
+def _parse_raw_features(raw_features: Any) -> Tree:  # noqa: ANN401, because this function works as validator
+    metrics = current_metrics()
+    if metrics is None:
+        return parse_ojt_as_tree(as_ojt_features(raw_features))
+    start = perf_counter()
     ojt_feats = as_ojt_features(raw_features)
+    metrics.record("validation", perf_counter() - start, len(ojt_feats))
     return parse_ojt_as_tree(ojt_feats)
 
 
-def ojt_raw_features_to_vv_accent_phrases(raw_features: Any) -> list[AccentPhrase]:  # noqa: ANN401, because this function works as validator
-    """Convert raw Open JTalk text-processing features into VOICEVOX accent phrases."""
-    tree = ojt_raw_features_to_tree(raw_features)
-    return convert_tree_to_voicevox_accent_phrases(tree)
+@overload
+def ojt_raw_features_to_tree(
+    raw_features: Any,  # noqa: ANN401, because this function works as validator
+    *,
+    cache: None = None,
+) -> Tree: ...
+@overload
+def ojt_raw_features_to_tree(
+    raw_features: Any,  # noqa: ANN401, because this function works as validator
+    *,
+    cache: "TreeCache",
+) -> "Tree | LazyTree": ...
+def ojt_raw_features_to_tree(
+    raw_features: Any,
+    *,
+    cache: "TreeCache | None" = None,
+) -> "Tree | LazyTree":
+    """
+    Convert raw Open JTalk text-processing features into a hierarchical utterance, through `cache` if given.
+
+    Cache hits are `LazyTree`s, which decode groups on access.
+    """
+    if cache is None:
+        return _parse_raw_features(raw_features)
+    return cache.get_or_parse(raw_features, _parse_raw_features)
+
+
+def ojt_raw_features_to_vv_accent_phrases(
+    raw_features: Any,  # noqa: ANN401, because this function works as validator
+    *,
+    cache: "TreeCache | None" = None,
+) -> list[AccentPhrase]:
+    """Convert raw Open JTalk text-processing features into VOICEVOX accent phrases, through `cache` if given."""
+    tree = ojt_raw_features_to_tree(raw_features, cache=cache)
+    if not isinstance(tree, list):
+        # NOTE: Conversion visits every node, so a cache hit is decoded at once.
+        tree = tree.to_tree()
+    metrics = current_metrics()
+    if metrics is None:
+        return convert_tree_to_voicevox_accent_phrases(tree)
+    start = perf_counter()
+    vv_aps = convert_tree_to_voicevox_accent_phrases(tree)
+    metrics.record("voicevox_conversion", perf_counter() - start, len(vv_aps))
+    return vv_aps
+
+
+class Pipeline:
+    """
+    Open JTalk 生特徴量から VOICEVOX アクセント句への変換器。
+
+    発音単位の VOICEVOX モーラ表をキャッシュとして保持し、中間の Tree を作らずに変換する。
+    出力は `ojt_raw_features_to_vv_accent_phrases()` と一致する。
+    `trusted=True` は `pyopenjtalk.run_frontend()` 出力のような信頼できる入力に限り、検証を省略する。
+    """
+
+    def __init__(
+        self, *, trusted: bool = False, cache_size: int = DEFAULT_PIPELINE_CACHE_SIZE
+    ) -> None:
+        """Initialize the pipeline with its own pronunciation-to-moras cache."""
+        self.trusted = trusted
+        self._lookup_moras = lru_cache(maxsize=cache_size)(build_vv_mora_fields_of_pron)
+
+    def __call__(self, raw_features: Any) -> list[AccentPhrase]:  # noqa: ANN401, because this function works as validator
+        """Convert raw Open JTalk text-processing features into VOICEVOX accent phrases."""
+        metrics = current_metrics()
+        if metrics is None:
+            ojt_feats = as_ojt_features(raw_features, trusted=self.trusted)
+            return convert_ojt_to_voicevox_accent_phrases(ojt_feats, self._lookup_moras)
+        # NOTE: The pipeline converts features without a tree, so parser stages are recorded as a part of VOICEVOX conversion.
+        start = perf_counter()
+        ojt_feats = as_ojt_features(raw_features, trusted=self.trusted)
+        metrics.record("validation", perf_counter() - start, len(ojt_feats))
+        start = perf_counter()
+        vv_aps = convert_ojt_to_voicevox_accent_phrases(ojt_feats, self._lookup_moras)
+        metrics.record("voicevox_conversion", perf_counter() - start, len(vv_aps))
+        return vv_aps
+
+    def cache_info(self) -> CacheInfo:
+        """Get hit/miss statistics and size of the pronunciation-to-moras cache."""
+        return CacheInfo._make(self._lookup_moras.cache_info())
+
+
+@dataclass(frozen=True)
+class ParseError:
+    """Structured error of an item of `parse_many()`."""
+
+    item_index: int
+    feature_index: int | None  # Index of the failed feature, None if unknown
+    position: int | None  # Character position in its pronunciation, None if unknown
+    error_type: str
+    message: str
+
+
+@dataclass(frozen=True)
+class ParseResult:
+    """Result of an item of `parse_many()`, either `tree` or `error` is None."""
+
+    tree: Tree | None
+    error: ParseError | None
+    diagnostics: tuple[Diagnostic, ...]
+
+
+def _to_parse_error(
+    item_index: int, error: Exception, feats: list[OjtFeature] | None
+) -> ParseError:
+    """Structure the error with its position, which is located only on this error path."""
+    # NOTE: Imported on this error path only. Validated inputs have loaded pydantic already, but trusted inputs load it here.
+    from pydantic import ValidationError
+
+    feature_index, position = None, None
+    if isinstance(error, ValidationError):
+        locs = [detail["loc"] for detail in error.errors()]
+        if len(locs) > 0 and len(locs[0]) > 0 and isinstance(locs[0][0], int):
+            feature_index = locs[0][0]
+    elif isinstance(error, PronunciationError) and feats is not None:
+        feature_index = next(
+            (i for i, feat in enumerate(feats) if feat.pron == error.pron), None
+        )
+        position = error.position if feature_index is not None else None
+    return ParseError(
+        item_index, feature_index, position, type(error).__name__, str(error)
+    )
+
+
+def _parse_isolated(
+    item_index: int,
+    raw_features: Any,  # noqa: ANN401, because this function works as validator
+    *,
+    trusted: bool,
+) -> tuple[Tree | None, ParseError | None]:
+    feats = None
+    try:
+        feats = as_ojt_features(raw_features, trusted=trusted)
+        return parse_ojt_as_tree(feats), None
+    except Exception as e:  # noqa: BLE001, because an item error should not abort the batch.
+        return None, _to_parse_error(item_index, e, feats)
+
+
+def parse_many(
+    raw_features_list: Iterable[Any],
+    *,
+    trusted: bool = False,
+    diagnostics: bool = True,
+) -> list[ParseResult]:
+    """
+    複数の Open JTalk 生特徴量を、エラーを項目ごとに隔離しつつ Tree としてパースする。
+
+    失敗した項目は例外を送出せず、位置情報付きの `ParseError` を返す。
+    パース中の警告は `warnings.warn()` の代わりに項目ごとの `diagnostics` へ集められる。
+    `diagnostics=False` の場合は警告を収集せずに捨てる。
+    """
+    results: list[ParseResult] = []
+    # NOTE: A single sink for the whole batch, which is drained per item, is cheaper than per-item contexts.
+    with collect_diagnostics() if diagnostics else suppress_diagnostics() as sink:
+        for i, raw_features in enumerate(raw_features_list):
+            tree, error = _parse_isolated(i, raw_features, trusted=trusted)
+            item_diagnostics: tuple[Diagnostic, ...] = ()
+            if sink:
+                item_diagnostics = tuple(sink)
+                sink.clear()
+            results.append(ParseResult(tree, error, item_diagnostics))
+    return results
@@ -0,0 +1,256 @@
+"""Phoneme-ID encoding of Tree for acoustic models."""
+
+from array import array
+from collections.abc import Buffer, Sequence
+from dataclasses import dataclass
+from typing import Final
+
+from speechtree.characters import PHONEME_SYMBOLS, UNVOICED_VOWEL_SYMBOLS
+from speechtree.tree import Tree
+
+# NOTE: ID 0 is reserved for padding, so standard symbols have stable IDs `index + 1`.
+PAD_ID: Final = 0
+PHONEME_IDS: Final[dict[str, int]] = {
+    symbol: i + 1 for i, symbol in enumerate(PHONEME_SYMBOLS)
+}
+# NOTE: (symbol, unvoicing) -> ID tables, which resolve the unvoicing distinction by a single lookup.
+_ID_TABLE: Final = {
+    (symbol, unvoicing): phoneme_id
+    for symbol, phoneme_id in PHONEME_IDS.items()
+    for unvoicing in (False, True)
+}
+_UNVOICING_ID_TABLE: Final = {
+    (symbol, unvoicing): PHONEME_IDS[
+        UNVOICED_VOWEL_SYMBOLS.get(symbol, symbol) if unvoicing else symbol
+    ]
+    for symbol in PHONEME_IDS
+    for unvoicing in (False, True)
+}
+# NOTE: Native integer formats of the buffer protocol, which `array.array` also accepts as typecodes.
+_INT_FORMATS: Final = frozenset("bBhHiIlLqQ")
+
+
+@dataclass(frozen=True)
+class EncodedSizes:
+    """Number of elements written by `encode_tree_into()`."""
+
+    n_phoneme: int
+    n_mora: int
+    n_ap: int
+
+
+@dataclass(frozen=True)
+class EncodedTree:
+    """Outputs of `encode_tree()`."""
+
+    phoneme_ids: array[int]  # (n_phoneme,)
+    unvoicing: array[int]  # (n_phoneme,)
+    tone_high: array[int]  # (n_phoneme,), tone of the mora which the phoneme belongs to
+    mora_offsets: array[int]  # (n_mora+1,), phoneme index range of each mora
+    ap_offsets: array[int]  # (n_ap+1,), mora index range of each accent phrase
+
+
+@dataclass(frozen=True)
+class EncodedBatch:
+    """Outputs of `encode_batch()`, row-major flat matrices of `shape`."""
+
+    phoneme_ids: array[int]
+    unvoicing: array[int]
+    tone_high: array[int]
+    lengths: array[int]  # (n_tree,), number of valid phonemes in each row
+    shape: tuple[int, int]  # (n_tree, max_length)
+
+
+def count_sizes(tree: Tree) -> EncodedSizes:
+    """Count phonemes, moras and accent phrases of the tree."""
+    n_phoneme, n_mora, n_ap = 0, 0, 0
+    for gp in tree:
+        for ap in gp["accent_phrases"]:
+            n_ap += 1
+            for wd in ap["words"]:
+                n_mora += len(wd["moras"])
+                n_phoneme += sum(len(mr["phonemes"]) for mr in wd["moras"])
+    return EncodedSizes(n_phoneme, n_mora, n_ap)
+
+
+def encode_tree_into(  # noqa: PLR0913, because each output has its own buffer.
+    tree: Tree,
+    phoneme_ids: Buffer,
+    unvoicing: Buffer,
+    tone_high: Buffer,
+    *,
+    mora_offsets: Buffer | None = None,
+    ap_offsets: Buffer | None = None,
+    distinguish_unvoicing: bool = False,
+) -> EncodedSizes:
+    """
+    ツリーを音素 ID 列として事前確保済みのバッファへ書き込む。
+
+    バッファは 1 次元 C 連続な整数バッファ (`array.array` や `numpy.ndarray` 等) で、十分な長さを持つ必要がある。
+    必要な長さは `count_sizes()` で得られる (オフセットは +1)。
+    `distinguish_unvoicing` が真の場合、無声化母音は大文字シンボルの ID で表される。
+
+    Returns
+    -------
+    書き込んだ音素・モーラ・アクセント句の数
+    """
+    id_table = _UNVOICING_ID_TABLE if distinguish_unvoicing else _ID_TABLE
+    ids_view, unvoicing_view, tone_view = (
+        _as_int_view(buffer) for buffer in (phoneme_ids, unvoicing, tone_high)
+    )
+    mr_offsets_view = None if mora_offsets is None else _as_int_view(mora_offsets)
+    ap_offsets_view = None if ap_offsets is None else _as_int_view(ap_offsets)
+    try:
+        return _write_tree(
+            tree,
+            id_table,
+            (ids_view, unvoicing_view, tone_view),
+            mr_offsets_view,
+            ap_offsets_view,
+        )
+    except KeyError as e:
+        msg = f"未知の音素シンボル '{e.args[0][0]}' はエンコードできません。"
+        raise ValueError(msg) from e
+    except IndexError as e:
+        # NOTE: Sizes are counted on this error path only.
+        sizes = count_sizes(tree)
+        for view, size in (
+            (ids_view, sizes.n_phoneme),
+            (unvoicing_view, sizes.n_phoneme),
+            (tone_view, sizes.n_phoneme),
+            (mr_offsets_view, sizes.n_mora + 1),
+            (ap_offsets_view, sizes.n_ap + 1),
+        ):
+            if view is not None and len(view) < size:
+                msg = f"バッファ長 {len(view)} は必要な長さ {size} に足りません。"
+                raise ValueError(msg) from e
+        raise
+
+
+def _write_tree(
+    tree: Tree,
+    id_table: dict[tuple[str, bool], int],
+    phoneme_views: tuple[memoryview, memoryview, memoryview],
+    mr_offsets_view: memoryview | None,
+    ap_offsets_view: memoryview | None,
+) -> EncodedSizes:
+    """Write the tree straight into the views in a single walk, without intermediate lists."""
+    ids_view, unvoicing_view, tone_view = phoneme_views
+    if mr_offsets_view is not None:
+        mr_offsets_view[0] = 0
+    if ap_offsets_view is not None:
+        ap_offsets_view[0] = 0
+    n_phoneme, n_mora, n_ap = 0, 0, 0
+    for gp in tree:
+        for ap in gp["accent_phrases"]:
+            for wd in ap["words"]:
+                for mr in wd["moras"]:
+                    tone = mr["tone_high"]
+                    for ph in mr["phonemes"]:
+                        unvoiced = ph["unvoicing"]
+                        ids_view[n_phoneme] = id_table[ph["symbol"], unvoiced]
+                        unvoicing_view[n_phoneme] = unvoiced
+                        tone_view[n_phoneme] = tone
+                        n_phoneme += 1
+                    n_mora += 1
+                    if mr_offsets_view is not None:
+                        mr_offsets_view[n_mora] = n_phoneme
+            n_ap += 1
+            if ap_offsets_view is not None:
+                ap_offsets_view[n_ap] = n_mora
+    return EncodedSizes(n_phoneme, n_mora, n_ap)
+
+
+def _as_int_view(buffer: Buffer) -> memoryview:
+    """View the buffer as a 1-dim native integer buffer."""
+    view = memoryview(buffer)
+    if view.ndim != 1:
+        msg = f"バッファは 1 次元である必要があります (ndim={view.ndim})。"
+        raise ValueError(msg)
+    # NOTE: `@` is the explicit native byte order, others (e.g. numpy `?`, `<i4` or `d`) are not native integers.
+    if view.format.removeprefix("@") not in _INT_FORMATS:
+        msg = f"バッファの要素型 '{view.format}' はネイティブ整数型ではありません。"
+        raise ValueError(msg)
+    return view
+
+
+def _encode_row(
+    tree: Tree, id_table: dict[tuple[str, bool], int]
+) -> tuple[array[int], array[int], array[int]]:
+    """Encode phoneme IDs, unvoicing and tone of the tree into new arrays, in a single walk."""
+    moras = [
+        mr
+        for gp in tree
+        for ap in gp["accent_phrases"]
+        for wd in ap["words"]
+        for mr in wd["moras"]
+    ]
+    try:
+        ids = array(
+            "H",
+            [
+                id_table[ph["symbol"], ph["unvoicing"]]
+                for mr in moras
+                for ph in mr["phonemes"]
+            ],
+        )
+    except KeyError as e:
+        msg = f"未知の音素シンボル '{e.args[0][0]}' はエンコードできません。"
+        raise ValueError(msg) from e
+    unvoicing = array("B", [ph["unvoicing"] for mr in moras for ph in mr["phonemes"]])
+    tone_high = array("B", [mr["tone_high"] for mr in moras for _ in mr["phonemes"]])
+    return ids, unvoicing, tone_high
+
+
+def encode_tree(tree: Tree, *, distinguish_unvoicing: bool = False) -> EncodedTree:
+    """Encode the tree into newly allocated arrays."""
+    sizes = count_sizes(tree)
+    encoded = EncodedTree(
+        phoneme_ids=array("H", [0]) * sizes.n_phoneme,
+        unvoicing=array("B", [0]) * sizes.n_phoneme,
+        tone_high=array("B", [0]) * sizes.n_phoneme,
+        mora_offsets=array("I", [0]) * (sizes.n_mora + 1),
+        ap_offsets=array("I", [0]) * (sizes.n_ap + 1),
+    )
+    encode_tree_into(
+        tree,
+        encoded.phoneme_ids,
+        encoded.unvoicing,
+        encoded.tone_high,
+        mora_offsets=encoded.mora_offsets,
+        ap_offsets=encoded.ap_offsets,
+        distinguish_unvoicing=distinguish_unvoicing,
+    )
+    return encoded
+
+
+def encode_batch(
+    trees: Sequence[Tree], *, distinguish_unvoicing: bool = False
+) -> EncodedBatch:
+    """
+    複数のツリーを `PAD_ID` でパディングされた行列へエンコードする。
+
+    出力は行優先のフラット配列で、`numpy.frombuffer(batch.phoneme_ids, dtype=numpy.uint16).reshape(batch.shape)` 等でコピーなしに行列として扱える。
+    """
+    id_table = _UNVOICING_ID_TABLE if distinguish_unvoicing else _ID_TABLE
+    # NOTE: Each tree is walked once into its own row arrays, which are copied into the padded matrix.
+    rows = [_encode_row(tree, id_table) for tree in trees]
+    lengths = array("I", [len(ids) for ids, _, _ in rows])
+    max_length = max(lengths, default=0)
+    n_element = len(trees) * max_length
+    batch = EncodedBatch(
+        phoneme_ids=array("H", [0]) * n_element,
+        unvoicing=array("B", [0]) * n_element,
+        tone_high=array("B", [0]) * n_element,
+        lengths=lengths,
+        shape=(len(trees), max_length),
+    )
+    ids_view = memoryview(batch.phoneme_ids)
+    unvoicing_view = memoryview(batch.unvoicing)
+    tone_view = memoryview(batch.tone_high)
+    for i, (ids, unvoicing, tone_high) in enumerate(rows):
+        head = i * max_length
+        ids_view[head : head + len(ids)] = ids
+        unvoicing_view[head : head + len(ids)] = unvoicing
+        tone_view[head : head + len(ids)] = tone_high
+    return batch
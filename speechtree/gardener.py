@@ -1,73 +1,303 @@
 """Tree management tools."""
 
+from dataclasses import dataclass
 from itertools import chain
 
-from speechtree.tree import AccentPhrase, Tree
+from speechtree.characters import UNVOICED_VOWEL_SYMBOLS, is_tone_high
+from speechtree.packed import MARK_GROUP, PackedTree
+from speechtree.tree import (
+    AccentPhrase,
+    BreathGroup,
+    MarkGroup,
+    Mora,
+    Phoneme,
+    PhraseGroup,
+    Tree,
+    Word,
+)
 
 # Check
 
 
 def validate_tree(tree: Tree) -> None:
-    """Place holder."""
-    _ = tree
+    """
+    ツリーの構造を検証し、不正であれば ValueError を送出する。
+
+    グループ種別の交互配置、グループが 1 つ以上のアクセント句を、アクセント句が 1 つ以上のワードを持つことを検証する。
+    """
+    prev_type = None
+    for gp_index, gp in enumerate(tree):
+        gp_type = gp["type"]
+        if gp_type not in {"BreathGroup", "MarkGroup"}:
+            msg = f"グループ {gp_index} の種別 `{gp_type}` は不正です。"
+            raise ValueError(msg)
+        if gp_type == prev_type:
+            msg = f"グループ {gp_index - 1} と {gp_index} が同じ種別 `{gp_type}` で連続しています。"
+            raise ValueError(msg)
+        prev_type = gp_type
+        if len(gp["accent_phrases"]) == 0:
+            msg = f"グループ {gp_index} にアクセント句がありません。"
+            raise ValueError(msg)
+        for ap_index, ap in enumerate(gp["accent_phrases"]):
+            if len(ap["words"]) == 0:
+                msg = f"グループ {gp_index} のアクセント句 {ap_index} にワードがありません。"
+                raise ValueError(msg)
 
 
 # Edit
+# NOTE:
+#   Edit operations never mutate inputs. They copy only the path from the root to the edited node, and share the others.
+#   So trees should be treated as immutable, then old trees work as undo history at the cost of the paths.
+
+
+def _normalize_index(index: int, size: int) -> int:
+    """Normalize the possibly negative index, raising IndexError if out of range."""
+    return range(size)[index]
+
+
+def _with_aps(gp: PhraseGroup, aps: list[AccentPhrase]) -> PhraseGroup:
+    """Build a same-type group with the accent phrases."""
+    if gp["type"] == "MarkGroup":
+        return MarkGroup(accent_phrases=aps, type="MarkGroup")
+    return BreathGroup(accent_phrases=aps, type="BreathGroup")
+
+
+def _replace_aps(
+    tree: Tree, gp_index: int, ap_start: int, ap_stop: int, aps: list[AccentPhrase]
+) -> Tree:
+    """Replace the accent phrases in `[ap_start, ap_stop)` of the group with `aps`."""
+    gp = tree[gp_index]
+    gp_aps = gp["accent_phrases"]
+    new_gp = _with_aps(gp, [*gp_aps[:ap_start], *aps, *gp_aps[ap_stop:]])
+    return [*tree[:gp_index], new_gp, *tree[gp_index + 1 :]]
 
 
 def trim_head_tail_marks(tree: Tree) -> Tree:
-    """Place holder."""
-    if tree[0]["type"] == "MarkGroup":
-        tree = tree[1:]
-    if tree[-1]["type"] == "MarkGroup":
-        tree = tree[:-1]
-    return tree
+    """Remove MarkGroups at the head and the tail of the tree."""
+    start, stop = 0, len(tree)
+    if stop > 0 and tree[0]["type"] == "MarkGroup":
+        start = 1
+    if stop > start and tree[-1]["type"] == "MarkGroup":
+        stop -= 1
+    return tree[start:stop]
 
 
 def remove_group(tree: Tree, index: int) -> Tree:
-    """Place holder."""
-    _ = index
-    return tree
+    """
+    ツリーからグループを削除する。
+
+    削除により同種のグループが隣接する場合、それらを 1 つのグループへ結合して交互配置を保つ。
+    """
+    index = _normalize_index(index, len(tree))
+    if 0 < index < len(tree) - 1:
+        left, right = tree[index - 1], tree[index + 1]
+        merged = _with_aps(left, [*left["accent_phrases"], *right["accent_phrases"]])
+        return [*tree[: index - 1], merged, *tree[index + 2 :]]
+    return [*tree[:index], *tree[index + 1 :]]
+
+
+def insert_group(tree: Tree, index: int, group: PhraseGroup) -> Tree:
+    """
+    ツリーの `index` の位置へグループを挿入する。
+
+    挿入位置に隣接するグループが同種の場合、そのグループへアクセント句を結合して交互配置を保つ。
+    """
+    if not 0 <= index <= len(tree):
+        msg = f"挿入位置 {index} がグループ数 {len(tree)} の範囲外です。"
+        raise IndexError(msg)
+    aps = group["accent_phrases"]
+    if index > 0 and tree[index - 1]["type"] == group["type"]:
+        left = tree[index - 1]
+        return _replace_aps(
+            tree,
+            index - 1,
+            len(left["accent_phrases"]),
+            len(left["accent_phrases"]),
+            aps,
+        )
+    if index < len(tree) and tree[index]["type"] == group["type"]:
+        return _replace_aps(tree, index, 0, 0, aps)
+    return [*tree[:index], group, *tree[index:]]
+
+
+def merge_aps(tree: Tree, gp_index: int, ap_index: int) -> Tree:
+    """
+    グループ内のアクセント句 `ap_index` と次のアクセント句を 1 つのアクセント句へ結合する。
+
+    モーラの音調はそのまま保たれるため、必要に応じて `retone_ap()` で再設定する。
+    """
+    aps = tree[gp_index]["accent_phrases"]
+    ap_index = _normalize_index(ap_index, len(aps) - 1)
+    merged = AccentPhrase(words=[*aps[ap_index]["words"], *aps[ap_index + 1]["words"]])
+    return _replace_aps(tree, gp_index, ap_index, ap_index + 2, [merged])
+
+
+def split_ap(tree: Tree, gp_index: int, ap_index: int, word_index: int) -> Tree:
+    """
+    グループ内のアクセント句を、ワード `word_index` の直前で 2 つのアクセント句へ分割する。
+
+    モーラの音調はそのまま保たれるため、必要に応じて `retone_ap()` で再設定する。
+    """
+    aps = tree[gp_index]["accent_phrases"]
+    ap_index = _normalize_index(ap_index, len(aps))
+    words = aps[ap_index]["words"]
+    if not 0 < word_index < len(words):
+        msg = f"分割位置 {word_index} はワード数 {len(words)} のアクセント句の内側にありません。"
+        raise IndexError(msg)
+    head, tail = (
+        AccentPhrase(words=words[:word_index]),
+        AccentPhrase(words=words[word_index:]),
+    )
+    return _replace_aps(tree, gp_index, ap_index, ap_index + 1, [head, tail])
+
+
+def replace_word_moras(
+    tree: Tree, gp_index: int, ap_index: int, word_index: int, moras: list[Mora]
+) -> Tree:
+    """Replace moras of the word, keeping its text."""
+    aps = tree[gp_index]["accent_phrases"]
+    ap_index = _normalize_index(ap_index, len(aps))
+    words = aps[ap_index]["words"]
+    word_index = _normalize_index(word_index, len(words))
+    new_word = Word(moras=moras, text=words[word_index]["text"])
+    new_ap = AccentPhrase(
+        words=[*words[:word_index], new_word, *words[word_index + 1 :]]
+    )
+    return _replace_aps(tree, gp_index, ap_index, ap_index + 1, [new_ap])
+
+
+def retone_ap(tree: Tree, gp_index: int, ap_index: int, accent: int) -> Tree:
+    """
+    アクセント句の音調を、東京式アクセントのアクセント型 `accent` (0 は平板型) で再設定する。
+
+    音調が変わるモーラとそれを含むワードのみ複製される。
+    """
+    aps = tree[gp_index]["accent_phrases"]
+    ap_index = _normalize_index(ap_index, len(aps))
+    n_mora = sum(len(wd["moras"]) for wd in aps[ap_index]["words"])
+    acc_pos = accent if accent > 0 else n_mora
+    new_words: list[Word] = []
+    i = 0
+    for wd in aps[ap_index]["words"]:
+        new_moras: list[Mora] = []
+        for mora in wd["moras"]:
+            tone_high = is_tone_high(i, acc_pos)
+            i += 1
+            new_moras.append(
+                mora
+                if mora["tone_high"] == tone_high
+                else Mora(
+                    phonemes=mora["phonemes"],
+                    pronunciation=mora["pronunciation"],
+                    tone_high=tone_high,
+                )
+            )
+        changed = any(
+            new is not old for new, old in zip(new_moras, wd["moras"], strict=True)
+        )
+        new_words.append(Word(moras=new_moras, text=wd["text"]) if changed else wd)
+    return _replace_aps(
+        tree, gp_index, ap_index, ap_index + 1, [AccentPhrase(words=new_words)]
+    )
 
 
 # Output
 
 
-def extract_text(tree: Tree) -> str:
+def extract_text(tree: Tree | PackedTree) -> str:
     """Extract the text of the tree."""
-    text = ""
-    for gp in tree:
-        for ap in gp["accent_phrases"]:
-            for wd in ap["words"]:
-                text += wd["text"]
-    return text
+    if isinstance(tree, PackedTree):
+        return tree.text[tree.word_text_offsets[0] : tree.word_text_offsets[-1]]
+
+    return "".join(
+        wd["text"] for gp in tree for ap in gp["accent_phrases"] for wd in ap["words"]
+    )
 
 
-def extract_pronunciation(tree: Tree) -> str:
+def extract_pronunciation(tree: Tree | PackedTree) -> str:
     """Extract the pronunciation of the tree."""
-    pronunciation = ""
-    for gp in tree:
-        for ap in gp["accent_phrases"]:
-            for wd in ap["words"]:
-                for mr in wd["moras"]:
-                    pronunciation += mr["pronunciation"]
-    return pronunciation
+    if isinstance(tree, PackedTree):
+        offsets = tree.mora_pronunciation_offsets
+        return tree.text[offsets[0] : offsets[-1]]
+
+    return "".join(
+        mr["pronunciation"]
+        for gp in tree
+        for ap in gp["accent_phrases"]
+        for wd in ap["words"]
+        for mr in wd["moras"]
+    )
 
 
 def extract_phonemes(
-    tree: Tree, *, reduce_dup_pau: bool = True, distinguish_unvoicing: bool = True
+    tree: Tree | PackedTree,
+    *,
+    reduce_dup_pau: bool = True,
+    distinguish_unvoicing: bool = False,
 ) -> list[str]:
-    """Place holder."""
+    """Extract phonemes of the tree, unvoiced vowels in upper case if `distinguish_unvoicing`."""
+    if isinstance(tree, PackedTree):
+        return _extract_packed_phonemes(
+            tree,
+            reduce_dup_pau=reduce_dup_pau,
+            distinguish_unvoicing=distinguish_unvoicing,
+        )
+
     phonemes: list[str] = []
     for pg in tree:
         for ap in pg["accent_phrases"]:
             if reduce_dup_pau and pg["type"] == "MarkGroup":
-                phonemes += ["pau"]
+                phonemes.append("pau")
             else:
                 for wd in ap["words"]:
                     for mora in wd["moras"]:
-                        _ = distinguish_unvoicing
-                        phonemes += [p["symbol"] for p in mora["phonemes"]]
+                        phonemes.extend(
+                            to_symbol(p, distinguish_unvoicing=distinguish_unvoicing)
+                            for p in mora["phonemes"]
+                        )
+    return phonemes
+
+
+def to_symbol(phoneme: Phoneme, *, distinguish_unvoicing: bool) -> str:
+    """Convert the phoneme into its symbol."""
+    symbol = phoneme["symbol"]
+    if distinguish_unvoicing and phoneme["unvoicing"]:
+        return UNVOICED_VOWEL_SYMBOLS.get(symbol, symbol)
+    return symbol
+
+
+def _extract_packed_phonemes(
+    pt: PackedTree, *, reduce_dup_pau: bool, distinguish_unvoicing: bool
+) -> list[str]:
+    """Extract phonemes of the packed tree."""
+    symbols, symbol_ids, offsets = (
+        pt.symbols,
+        pt.phoneme_symbol_ids,
+        pt.mora_phoneme_offsets,
+    )
+    phonemes: list[str] = []
+    for gp_index, gp_type in enumerate(pt.group_types):
+        for ap_index in range(
+            pt.group_ap_offsets[gp_index], pt.group_ap_offsets[gp_index + 1]
+        ):
+            if reduce_dup_pau and gp_type == MARK_GROUP:
+                phonemes.append("pau")
+            else:
+                mr_start, mr_end = pt.ap_mora_range(ap_index)
+                ph_start, ph_end = offsets[mr_start], offsets[mr_end]
+                if distinguish_unvoicing:
+                    phonemes += [
+                        UNVOICED_VOWEL_SYMBOLS.get(symbols[i], symbols[i])
+                        if unvoicing
+                        else symbols[i]
+                        for i, unvoicing in zip(
+                            symbol_ids[ph_start:ph_end],
+                            pt.phoneme_unvoicing[ph_start:ph_end],
+                            strict=True,
+                        )
+                    ]
+                else:
+                    phonemes += [symbols[i] for i in symbol_ids[ph_start:ph_end]]
     return phonemes
 
 
@@ -81,3 +311,86 @@ def extract_accent_position(ap: AccentPhrase) -> int:
         else:
             break
     return accent
+
+
+def extract_accent_positions(tree: Tree | PackedTree) -> list[int]:
+    """Extract accent positions of all accent phrases in the tree."""
+    if isinstance(tree, PackedTree):
+        return [
+            _extract_packed_accent_position(tree, i)
+            for i in range(len(tree.ap_word_offsets) - 1)
+        ]
+    return [extract_accent_position(ap) for gp in tree for ap in gp["accent_phrases"]]
+
+
+def _extract_packed_accent_position(pt: PackedTree, ap_index: int) -> int:
+    """Extract accent position of the accent phrase in the packed tree."""
+    mr_start, mr_end = pt.ap_mora_range(ap_index)
+    tone_high = pt.mora_tone_high
+    accent = mr_end
+    while accent > mr_start and not tone_high[accent - 1]:
+        accent -= 1
+    return accent - mr_start
+
+
+@dataclass(frozen=True)
+class Extraction:
+    """Outputs of `extract_all()`."""
+
+    text: str  # same as `extract_text()`
+    pronunciation: str  # same as `extract_pronunciation()`
+    phonemes: list[str]  # same as `extract_phonemes()`
+    accent_positions: list[int]  # same as `extract_accent_positions()`
+
+
+def extract_all(
+    tree: Tree | PackedTree,
+    *,
+    reduce_dup_pau: bool = True,
+    distinguish_unvoicing: bool = False,
+) -> Extraction:
+    """Extract text, pronunciation, phonemes and accent positions of the tree in a single traversal."""
+    if isinstance(tree, PackedTree):
+        return Extraction(
+            text=extract_text(tree),
+            pronunciation=extract_pronunciation(tree),
+            phonemes=extract_phonemes(
+                tree,
+                reduce_dup_pau=reduce_dup_pau,
+                distinguish_unvoicing=distinguish_unvoicing,
+            ),
+            accent_positions=extract_accent_positions(tree),
+        )
+
+    texts: list[str] = []
+    prons: list[str] = []
+    phonemes: list[str] = []
+    accent_positions: list[int] = []
+    for pg in tree:
+        reduce_pau = reduce_dup_pau and pg["type"] == "MarkGroup"
+        for ap in pg["accent_phrases"]:
+            if reduce_pau:
+                phonemes.append("pau")
+            # NOTE: Accent position is the index of the last high-tone mora plus one (see `extract_accent_position()`).
+            n_mora = 0
+            accent = 0
+            for wd in ap["words"]:
+                texts.append(wd["text"])
+                for mora in wd["moras"]:
+                    n_mora += 1
+                    if mora["tone_high"]:
+                        accent = n_mora
+                    prons.append(mora["pronunciation"])
+                    if not reduce_pau:
+                        phonemes.extend(
+                            to_symbol(p, distinguish_unvoicing=distinguish_unvoicing)
+                            for p in mora["phonemes"]
+                        )
+            accent_positions.append(accent)
+
+    return Extraction(
+        text="".join(texts),
+        pronunciation="".join(prons),
+        phonemes=phonemes,
+        accent_positions=accent_positions,
+    )
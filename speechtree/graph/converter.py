@@ -1,8 +1,252 @@
 """Tree-To-Graph converter."""
 
-from speechtree.tree import Tree
+import io
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any, Final, Literal, TextIO
 
+from speechtree.gardener import to_symbol
+from speechtree.tree import AccentPhrase, Mora, Phoneme, PhraseGroup, Tree, Word
 
-def convert_tree_to_graph(utterance: Tree) -> None:
-    """Visualize utterance as a graph."""
-    _ = utterance
+type GraphFormat = Literal["dot", "mermaid"]
+type GraphLevel = Literal["group", "accent_phrase", "word", "mora", "phoneme"]
+
+_LEVELS: Final[tuple[GraphLevel, ...]] = (
+    "group",
+    "accent_phrase",
+    "word",
+    "mora",
+    "phoneme",
+)
+_DEPTH_GP: Final = 0
+
+# NOTE:
+#   Nodes and edges are written into the file one by one, so memory does not grow with the tree.
+#   Node IDs are global paths like `g3a1w0m2p0`, so windowed renders of the same tree have consistent IDs.
+#   The deepest rendered node summarizes its collapsed descendants in its label.
+
+
+@dataclass(frozen=True)
+class _Syntax:
+    """Graph language syntax."""
+
+    header: str
+    footer: str
+    node: Callable[[str, str], str]
+    edge: Callable[[str, str], str]
+
+
+def _escape_dot(label: str) -> str:
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _escape_mermaid(label: str) -> str:
+    return label.replace('"', "#quot;").replace("\n", "<br>")
+
+
+_SYNTAXES: Final[dict[GraphFormat, _Syntax]] = {
+    "dot": _Syntax(
+        header='digraph Tree {\n  node [shape=box];\n  tree [label="Tree"];\n',
+        footer="}\n",
+        node=lambda node_id, label: f'  {node_id} [label="{_escape_dot(label)}"];\n',
+        edge=lambda parent, child: f"  {parent} -> {child};\n",
+    ),
+    "mermaid": _Syntax(
+        header='graph TD;\n  tree["Tree"];\n',
+        footer="",
+        node=lambda node_id, label: f'  {node_id}["{_escape_mermaid(label)}"];\n',
+        edge=lambda parent, child: f"  {parent} --> {child};\n",
+    ),
+}
+
+
+def _tone_label(mora: Mora) -> str:
+    return "H" if mora["tone_high"] else "L"
+
+
+def _mora_label(mora: Mora, *, collapsed: bool) -> str:
+    label = f"{mora['pronunciation']}\n{_tone_label(mora)}"
+    if collapsed:
+        symbols = (to_symbol(p, distinguish_unvoicing=True) for p in mora["phonemes"])
+        label += f"\n{' '.join(symbols)}"
+    return label
+
+
+def _word_label(word: Word, *, collapsed: bool) -> str:
+    if not collapsed:
+        return word["text"]
+    pron = "".join(mr["pronunciation"] for mr in word["moras"])
+    tones = "".join(_tone_label(mr) for mr in word["moras"])
+    return f"{word['text']}\n{pron}\n{tones}"
+
+
+def _ap_label(ap: AccentPhrase, *, collapsed: bool) -> str:
+    if not collapsed:
+        return "AccentPhrase"
+    text = "".join(wd["text"] for wd in ap["words"])
+    moras = [mr for wd in ap["words"] for mr in wd["moras"]]
+    pron = "".join(mr["pronunciation"] for mr in moras)
+    tones = "".join(_tone_label(mr) for mr in moras)
+    return f"{text}\n{pron}\n{tones}"
+
+
+def _group_label(gp: PhraseGroup, *, collapsed: bool) -> str:
+    if not collapsed:
+        return gp["type"]
+    text = "".join(wd["text"] for ap in gp["accent_phrases"] for wd in ap["words"])
+    return f"{gp['type']}\n{text}"
+
+
+def _phoneme_label(pn: Phoneme, *, collapsed: bool) -> str:  # noqa: ARG001, because of the common label signature.
+    return to_symbol(pn, distinguish_unvoicing=True)
+
+
+# NOTE: Per-level node specs, indexed by depth.
+_LABELS: Final[tuple[Callable[..., str], ...]] = (
+    _group_label,
+    _ap_label,
+    _word_label,
+    _mora_label,
+    _phoneme_label,
+)
+_CHILDREN_KEYS: Final = ("accent_phrases", "words", "moras", "phonemes")
+_ID_PREFIXES: Final = ("g", "a", "w", "m", "p")
+
+
+@dataclass(frozen=True)
+class _Render:
+    """Settings of a render, shared by all nodes."""
+
+    syntax: _Syntax
+    write: Callable[[str], object]
+    depth: int  # Deepest rendered level
+    window_depth: int  # Level of nodes counted by the window
+    start: int
+    stop: int
+
+
+def _count_at(node: Any, level: int, target: int) -> int:  # noqa: ANN401, because nodes of all levels are walked.
+    """Count the descendants of the node at the `target` level, or the node itself at the same level."""
+    if level == target:
+        return 1
+    children = node[_CHILDREN_KEYS[level]]
+    if level + 1 == target:
+        return len(children)
+    return sum(_count_at(child, level + 1, target) for child in children)
+
+
+def _iter_windowed(
+    children: Sequence[Any], level: int, index: int, render: _Render
+) -> Iterator[tuple[int, Any, int]]:
+    """
+    Yield (position, child, window index) of the children at `level` which overlap the window.
+
+    `index` is the window index of the first window-level node in the children.
+    """
+    for i, child in enumerate(children):
+        n_window = _count_at(child, level, render.window_depth)
+        if index < render.stop and render.start < index + n_window:
+            yield i, child, index
+        index += n_window
+
+
+def _write_children(
+    node: Any,  # noqa: ANN401, because nodes of all levels are walked.
+    level: int,
+    node_id: str,
+    index: int,
+    render: _Render,
+) -> None:
+    """
+    Write the descendants of the node down to the render depth straight into the file, each node followed by its edge from the parent.
+
+    `index` is the window index of the first window-level node in the node.
+    """
+    child_level = level + 1
+    if child_level > render.window_depth:
+        # NOTE: Descendants below the window level are all in the window.
+        _write_all_children(node, level, node_id, render)
+        return
+    node_line, edge_line, write = render.syntax.node, render.syntax.edge, render.write
+    label, prefix = _LABELS[child_level], f"{node_id}{_ID_PREFIXES[child_level]}"
+    collapsed = child_level == render.depth
+    children = node[_CHILDREN_KEYS[level]]
+    for i, child, child_index in _iter_windowed(children, child_level, index, render):
+        child_id = f"{prefix}{i}"
+        write(node_line(child_id, label(child, collapsed=collapsed)))
+        write(edge_line(node_id, child_id))
+        if not collapsed:
+            _write_children(child, child_level, child_id, child_index, render)
+
+
+def _write_all_children(
+    node: Any,  # noqa: ANN401, because nodes of all levels are walked.
+    level: int,
+    node_id: str,
+    render: _Render,
+) -> None:
+    """Write the descendants of the node down to the render depth, without the window."""
+    node_line, edge_line, write = render.syntax.node, render.syntax.edge, render.write
+    child_level = level + 1
+    label, prefix = _LABELS[child_level], f"{node_id}{_ID_PREFIXES[child_level]}"
+    collapsed = child_level == render.depth
+    for i, child in enumerate(node[_CHILDREN_KEYS[level]]):
+        child_id = f"{prefix}{i}"
+        write(node_line(child_id, label(child, collapsed=collapsed)))
+        write(edge_line(node_id, child_id))
+        if not collapsed:
+            _write_all_children(child, child_level, child_id, render)
+
+
+def write_graph(  # noqa: PLR0913, because each option is independent.
+    utterance: Tree,
+    fp: TextIO,
+    *,
+    fmt: GraphFormat = "dot",
+    max_level: GraphLevel = "phoneme",
+    start: int = 0,
+    stop: int | None = None,
+    window_level: GraphLevel = "group",
+) -> None:
+    """
+    ツリーをグラフ (DOT または Mermaid) としてファイルへ逐次書き出す。
+
+    `max_level` より深い階層は描画されず、その階層のノードのラベルへ要約される。
+    `start`/`stop` はツリー全体での `window_level` 階層のノード番号の範囲で、長い文書の一部のみを描画する窓として使う。
+    窓と重なるノードのみが、`max_level` まで描画される。
+    無声化母音は大文字のシンボルで表示される。
+    """
+    syntax = _SYNTAXES[fmt]
+    window_depth = _LEVELS.index(window_level)
+    n_window = sum(_count_at(gp, _DEPTH_GP, window_depth) for gp in utterance)
+    window_start, window_stop, _ = slice(start, stop).indices(n_window)
+    render = _Render(
+        syntax,
+        fp.write,
+        _LEVELS.index(max_level),
+        window_depth,
+        window_start,
+        window_stop,
+    )
+    render.write(syntax.header)
+    for g, gp, gp_index in _iter_windowed(utterance, _DEPTH_GP, 0, render):
+        gp_id = f"g{g}"
+        render.write(
+            syntax.node(gp_id, _group_label(gp, collapsed=render.depth == _DEPTH_GP))
+        )
+        if render.depth > _DEPTH_GP:
+            _write_children(gp, _DEPTH_GP, gp_id, gp_index, render)
+        render.write(syntax.edge("tree", gp_id))
+    render.write(syntax.footer)
+
+
+def convert_tree_to_graph(
+    utterance: Tree,
+    *,
+    fmt: GraphFormat = "dot",
+    max_level: GraphLevel = "phoneme",
+) -> str:
+    """Visualize utterance as a graph string, see `write_graph()` for large trees."""
+    buffer = io.StringIO()
+    write_graph(utterance, buffer, fmt=fmt, max_level=max_level)
+    return buffer.getvalue()
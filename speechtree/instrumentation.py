@@ -0,0 +1,118 @@
+"""Opt-in stage-level timing and counters of the conversion pipeline."""
+
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Final, Literal, TypedDict
+
+from .diagnostics import DiagnosticCode, count_diagnostics
+from .utils import get_args
+
+type Stage = Literal[
+    "validation",  # Raw features into Open JTalk features, items are features.
+    "ap_chaining",  # Features into phrase groups and accent phrases, items are features.
+    "mora_splitting",  # Pronunciations into moras, items are words.
+    "tone_assignment",  # Tones of moras by accent types, items are accent phrases.
+    "voicevox_conversion",  # Tree or features into VOICEVOX accent phrases, items are output accent phrases.
+]
+STAGES: Final[tuple[Stage, ...]] = get_args(Stage)
+DIAGNOSTIC_CODES: Final[tuple[DiagnosticCode, ...]] = get_args(DiagnosticCode)
+
+
+class StageDict(TypedDict):
+    """Counters of a stage."""
+
+    seconds: float
+    items: int
+    calls: int
+
+
+class MetricsDict(TypedDict):
+    """Plain-dict form of `Metrics`."""
+
+    stages: dict[Stage, StageDict]
+    warnings: dict[DiagnosticCode, int]
+
+
+@dataclass
+class Metrics:
+    """Per-stage wall time, item counts and call counts, with counts of reported diagnostics by code."""
+
+    seconds: dict[Stage, float] = field(
+        default_factory=lambda: dict.fromkeys(STAGES, 0.0)
+    )
+    items: dict[Stage, int] = field(default_factory=lambda: dict.fromkeys(STAGES, 0))
+    calls: dict[Stage, int] = field(default_factory=lambda: dict.fromkeys(STAGES, 0))
+    warnings: Counter[DiagnosticCode] = field(default_factory=Counter)
+
+    def record(self, stage: Stage, seconds: float, n_item: int) -> None:
+        """Record a call of the stage."""
+        self.seconds[stage] += seconds
+        self.items[stage] += n_item
+        self.calls[stage] += 1
+
+    def as_dict(self) -> MetricsDict:
+        """Export as a plain dict, which is JSON-serializable."""
+        return MetricsDict(
+            stages={
+                stage: StageDict(
+                    seconds=self.seconds[stage],
+                    items=self.items[stage],
+                    calls=self.calls[stage],
+                )
+                for stage in STAGES
+            },
+            warnings={code: self.warnings[code] for code in DIAGNOSTIC_CODES},
+        )
+
+    def to_prometheus(self, prefix: str = "speechtree") -> str:
+        """Export in the Prometheus text exposition format, all values as counters."""
+        lines: list[str] = []
+        for name, help_text, values in (
+            ("stage_seconds_total", "Wall time spent in the stage.", self.seconds),
+            ("stage_items_total", "Items processed in the stage.", self.items),
+            ("stage_calls_total", "Calls of the stage.", self.calls),
+        ):
+            lines += [
+                f"# HELP {prefix}_{name} {help_text}",
+                f"# TYPE {prefix}_{name} counter",
+            ]
+            lines += [
+                f'{prefix}_{name}{{stage="{stage}"}} {values[stage]}'
+                for stage in STAGES
+            ]
+        name = f"{prefix}_warnings_total"
+        lines += [f"# HELP {name} Reported diagnostics.", f"# TYPE {name} counter"]
+        lines += [
+            f'{name}{{code="{code}"}} {self.warnings[code]}'
+            for code in DIAGNOSTIC_CODES
+        ]
+        return "\n".join(lines) + "\n"
+
+
+# NOTE: `None` means disabled, then instrumented functions pay only a context variable lookup per call, not per item.
+_metrics: ContextVar[Metrics | None] = ContextVar("speechtree_metrics", default=None)
+
+
+def current_metrics() -> Metrics | None:
+    """Get the metrics of the current instrumentation context, `None` if disabled."""
+    return _metrics.get()
+
+
+@contextmanager
+def instrument(metrics: Metrics | None = None) -> Iterator[Metrics]:
+    """
+    コンテキスト内の変換をステージ別に計測し、計測結果を yield する。
+
+    `metrics` を渡すとその計測結果へ累積する。コンテキストはスレッド・タスク毎に独立し、入れ子では内側が優先される。
+    診断 (警告) はシンクに依らずコード別に数えられる。
+    """
+    metrics = Metrics() if metrics is None else metrics
+    token = _metrics.set(metrics)
+    try:
+        with count_diagnostics(metrics.warnings):
+            yield metrics
+    finally:
+        _metrics.reset(token)
@@ -1,6 +1,9 @@
 """Open JTalk structures."""
 
-from dataclasses import dataclass
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, fields
+from typing import Final
 
 
 @dataclass(frozen=True)
@@ -28,3 +31,63 @@ class OjtFeature:
     chain_rule: str  # 連結規則                     : 前のワードと連結してアクセント句をつくる際に句アクセントを移動する規則。
     chain_flag: int  # 連結フラグ                   : 前のワードと連結してアクセント句をつくるか否かのフラグ。-1: 未判定 / 0: 連結しない / 1: 連結する
     # fmt: on
+
+
+@dataclass(frozen=True)
+class OjtFeatureBatch:
+    """
+    Open JTalk text-processing features in columnar layout.
+
+    Each attribute of `OjtFeature` is held as a column, where i-th elements of columns form i-th feature.
+    """
+
+    string: list[str]
+    pos: list[str]
+    pos_group1: list[str]
+    pos_group2: list[str]
+    pos_group3: list[str]
+    ctype: list[str]
+    cform: list[str]
+    orig: list[str]
+    read: list[str]
+    pron: list[str]
+    acc: array[int]
+    mora_size: array[int]
+    chain_rule: list[str]
+    chain_flag: array[int]
+
+    def __len__(self) -> int:
+        """Count features."""
+        return len(self.string)
+
+    def __getitem__(self, index: int) -> OjtFeature:
+        """Get a feature as a row."""
+        return OjtFeature(*(getattr(self, name)[index] for name in _FIELD_NAMES))
+
+    @classmethod
+    def from_features(cls, feats: Sequence[OjtFeature]) -> "OjtFeatureBatch":
+        """Build a batch from row-wise features."""
+        return cls(
+            string=[feat.string for feat in feats],
+            pos=[feat.pos for feat in feats],
+            pos_group1=[feat.pos_group1 for feat in feats],
+            pos_group2=[feat.pos_group2 for feat in feats],
+            pos_group3=[feat.pos_group3 for feat in feats],
+            ctype=[feat.ctype for feat in feats],
+            cform=[feat.cform for feat in feats],
+            orig=[feat.orig for feat in feats],
+            read=[feat.read for feat in feats],
+            pron=[feat.pron for feat in feats],
+            acc=array("q", [feat.acc for feat in feats]),
+            mora_size=array("q", [feat.mora_size for feat in feats]),
+            chain_rule=[feat.chain_rule for feat in feats],
+            chain_flag=array("q", [feat.chain_flag for feat in feats]),
+        )
+
+    def to_features(self) -> list[OjtFeature]:
+        """Convert the batch into row-wise features."""
+        columns = (getattr(self, name) for name in _FIELD_NAMES)
+        return [OjtFeature(*row) for row in zip(*columns, strict=True)]
+
+
+_FIELD_NAMES: Final = tuple(field.name for field in fields(OjtFeature))
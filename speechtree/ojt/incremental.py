@@ -0,0 +1,123 @@
+"""Incremental OJT-to-domain parser for edited feature sequences."""
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from itertools import groupby
+from operator import ne
+
+from speechtree.tree import AccentPhrase, BreathGroup, MarkGroup, PhraseGroup, Tree
+
+from .domain import OjtFeature
+from .parser import (
+    MARK_PRONS,
+    is_chaining,
+    is_mark,
+    parse_as_ap,
+    parse_ojt_as_tree,
+    split_ap_ranges,
+)
+
+# NOTE:
+#   Each feature becomes a word, so the feature range of every accent phrase is given by word counts of the tree.
+#   Groups are maximal runs of marks/voices, so a group boundary is stable if the features on both sides are untouched.
+#   Hence re-parse covers the groups which contain the feature just before the edit and the feature just after the edit.
+#   In the range, accent phrases whose features and boundaries are untouched are reused as is.
+
+
+@dataclass(frozen=True)
+class FeatureEdit:
+    """Replacement of the features in `[start, stop)` with `features`."""
+
+    start: int
+    stop: int
+    features: Sequence[OjtFeature]
+
+
+def _locate_groups(
+    feats: Sequence[OjtFeature], first: int, last: int
+) -> tuple[int, int, int, int]:
+    """Locate the groups which contain the `first` and `last` features, with the first feature index of the former and the stop of the latter."""
+    # NOTE: Group indices are counts of mark/voice transitions of features, much cheaper than counting words over the tree.
+    is_marks = [feat.pron in MARK_PRONS for feat in feats[: last + 1]]
+    g_first = sum(map(ne, is_marks[:first], is_marks[1 : first + 1]))
+    g_last = g_first + sum(map(ne, is_marks[first:last], is_marks[first + 1 :]))
+
+    first_start = first
+    while first_start > 0 and is_marks[first_start - 1] == is_marks[first]:
+        first_start -= 1
+    last_stop = last + 1
+    while last_stop < len(feats) and is_mark(feats[last_stop]) == is_marks[last]:
+        last_stop += 1
+    return g_first, first_start, g_last, last_stop
+
+
+def _iter_groups_reusing(
+    feats: list[OjtFeature],
+    start: int,
+    stop: int,
+    reuse_ap: dict[tuple[int, int], AccentPhrase],
+) -> Iterator[PhraseGroup]:
+    """Parse the features in `[start, stop)` into groups, reusing accent phrases keyed by new feature ranges."""
+    for is_marks, successive_idxs in groupby(
+        range(start, stop), lambda i: is_mark(feats[i])
+    ):
+        idxs = list(successive_idxs)
+        ranges = split_ap_ranges(
+            lambda i: is_chaining(feats[i]),
+            lambda i: feats[i].string,
+            idxs[0],
+            idxs[-1] + 1,
+        )
+        aps = [
+            reuse_ap.get((head, tail)) or parse_as_ap(feats[head:tail])
+            for head, tail in ranges
+        ]
+        yield (
+            MarkGroup(accent_phrases=aps, type="MarkGroup")
+            if is_marks
+            else BreathGroup(accent_phrases=aps, type="BreathGroup")
+        )
+
+
+def reparse_ojt_as_tree(
+    prev_tree: Tree, prev_feats: Sequence[OjtFeature], edit: FeatureEdit
+) -> tuple[Tree, list[OjtFeature]]:
+    """
+    編集された Open JTalk 特徴量列を、影響を受けるフレーズグループ・アクセント句のみ再パースする。
+
+    `prev_tree` は `prev_feats` を `parse_ojt_as_tree()` でパースした Tree である必要がある。
+    出力 Tree は編集後特徴量列の全体パースと一致し、編集の影響を受けないグループ・アクセント句は `prev_tree` と共有される。
+    警告は再パースした範囲についてのみ発生する。
+
+    Returns
+    -------
+    編集後の Tree と特徴量列
+    """
+    n_prev = len(prev_feats)
+    if not 0 <= edit.start <= edit.stop <= n_prev:
+        msg = f"編集範囲 [{edit.start}, {edit.stop}) が特徴量数 {n_prev} の範囲外です。"
+        raise ValueError(msg)
+    feats = [*prev_feats[: edit.start], *edit.features, *prev_feats[edit.stop :]]
+    if n_prev == 0 or len(feats) == 0:
+        return parse_ojt_as_tree(feats), feats
+
+    # Range of re-parsed groups, in previous feature indices.
+    g_head, old_start, g_tail, old_stop = _locate_groups(
+        prev_feats, max(edit.start - 1, 0), min(edit.stop, n_prev - 1)
+    )
+
+    # Untouched accent phrases in the range, keyed by new feature ranges.
+    delta = len(edit.features) - (edit.stop - edit.start)
+    reuse_ap: dict[tuple[int, int], AccentPhrase] = {}
+    head = old_start
+    for gp in prev_tree[g_head : g_tail + 1]:
+        for ap in gp["accent_phrases"]:
+            tail = head + len(ap["words"])
+            if tail <= edit.start:
+                reuse_ap[head, tail] = ap
+            elif head >= edit.stop:
+                reuse_ap[head + delta, tail + delta] = ap
+            head = tail
+
+    groups = _iter_groups_reusing(feats, old_start, old_stop + delta, reuse_ap)
+    return [*prev_tree[:g_head], *groups, *prev_tree[g_tail + 1 :]], feats
@@ -1,14 +1,66 @@
 """Open JTalk raw feature parser."""
 
-from typing import Any
+from array import array
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
-from pydantic import TypeAdapter
+from .domain import OjtFeature, OjtFeatureBatch
 
-from .domain import OjtFeature
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
 
-_feat_adapter = TypeAdapter(OjtFeature)
 
+@cache
+def _get_feats_adapter() -> "TypeAdapter[list[OjtFeature]]":
+    """Build the validator on first use, because pydantic import and schema build dominate the import time."""
+    from pydantic import TypeAdapter
 
-def as_ojt_features(features: Any) -> list[OjtFeature]:  # noqa: ANN401, because this is validator
-    """Type and validate raw Open JTalk NJD features."""
-    return list(map(_feat_adapter.validate_python, features))
+    return TypeAdapter(list[OjtFeature])
+
+
+def _build_trusted_feature(raw_feature: dict[str, Any]) -> OjtFeature:
+    """Build a feature from a trusted raw feature without validation."""
+    # NOTE: Frozen dataclass `__init__()` sets fields one by one with `object.__setattr__()`, which dominates construction time.
+    feat = object.__new__(OjtFeature)
+    object.__setattr__(feat, "__dict__", raw_feature.copy())
+    return feat
+
+
+def as_ojt_features(features: Any, *, trusted: bool = False) -> list[OjtFeature]:  # noqa: ANN401, because this is validator
+    """
+    Type and validate raw Open JTalk NJD features.
+
+    `trusted=True` skips validation and builds features directly from `pyopenjtalk.run_frontend()` dicts.
+    Use it only for features from trusted sources, malformed features are not rejected.
+    """
+    if trusted:
+        return list(map(_build_trusted_feature, features))
+    # NOTE: Validate as a whole list, single call is much faster than feature-wise calls.
+    return _get_feats_adapter().validate_python(features)
+
+
+def as_ojt_feature_batch(features: Any, *, trusted: bool = False) -> OjtFeatureBatch:  # noqa: ANN401, because this is validator
+    """
+    Type and validate raw Open JTalk NJD features as a columnar batch.
+
+    `trusted` works as same as `as_ojt_features()`.
+    """
+    if not trusted:
+        return OjtFeatureBatch.from_features(as_ojt_features(features))
+    features = list(features)
+    return OjtFeatureBatch(
+        string=[feat["string"] for feat in features],
+        pos=[feat["pos"] for feat in features],
+        pos_group1=[feat["pos_group1"] for feat in features],
+        pos_group2=[feat["pos_group2"] for feat in features],
+        pos_group3=[feat["pos_group3"] for feat in features],
+        ctype=[feat["ctype"] for feat in features],
+        cform=[feat["cform"] for feat in features],
+        orig=[feat["orig"] for feat in features],
+        read=[feat["read"] for feat in features],
+        pron=[feat["pron"] for feat in features],
+        acc=array("q", [feat["acc"] for feat in features]),
+        mora_size=array("q", [feat["mora_size"] for feat in features]),
+        chain_rule=[feat["chain_rule"] for feat in features],
+        chain_flag=array("q", [feat["chain_flag"] for feat in features]),
+    )
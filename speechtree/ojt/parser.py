@@ -1,41 +1,67 @@
 """OJT-to-domain parser."""
 
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
 from itertools import groupby
-from typing import TypeGuard
-from warnings import warn
+from time import perf_counter
+from typing import Final, TypeGuard
 
 from speechtree.characters import (
-    MORA_MATCH_PATTERN,
     MORA_PRONUNCIATION,
+    MORA_TOKEN_LENGTHS,
+    MORA_TOKEN_TABLE,
     MR_CV,
     MoraPronunciation,
+    get_phoneme,
+    is_tone_high,
 )
+from speechtree.diagnostics import report
+from speechtree.instrumentation import Metrics, current_metrics
 from speechtree.tree import (
     AccentPhrase,
     BreathGroup,
     MarkGroup,
     Mora,
     Phoneme,
+    PhraseGroup,
     Tree,
     Word,
 )
+from speechtree.utils import CacheInfo
 
-from .domain import OjtFeature
+from .domain import OjtFeature, OjtFeatureBatch
+
+# NOTE: Bump whenever the parser outputs other trees for the same features, so that persistent caches drop stale trees.
+PARSER_OUTPUT_VERSION: Final = 2
+
+
+class PronunciationError(RuntimeError):
+    """Pronunciation which cannot be divided into moras, with the failed position."""
+
+    def __init__(self, pron: str, position: int) -> None:
+        """Initialize the error with the pronunciation and the position of the unknown character."""
+        self.pron = pron
+        self.position = position
+        super().__init__(
+            f"発音 `{pron}` の {position} 文字目以降 `{pron[position:]}` はモーラへ分割できません。"
+        )
 
 
 def _split_pron_into_mora_prons(pron: str) -> list[tuple[str, bool]]:
+    # NOTE: Longest-match tokenization in linear time. Each step looks up only a few slices in the token table.
     mora_prons: list[tuple[str, bool]] = []
-    while len(pron):
-        match = MORA_MATCH_PATTERN.match(pron)
-        if match is None:
-            msg = "not match"
-            raise RuntimeError(msg)
-        mora_pron = match[0]
-        if mora_pron[-1] == "’":  # noqa: RUF001, because of Japanese.
-            mora_prons.append((mora_pron[:-1], True))
+    head = 0
+    while head < len(pron):
+        for length in MORA_TOKEN_LENGTHS:
+            token = pron[head : head + length]
+            mora_pron_unvoice = MORA_TOKEN_TABLE.get(token)
+            if mora_pron_unvoice is not None:
+                break
         else:
-            mora_prons.append((mora_pron, False))
-        pron = pron[match.end() :]
+            raise PronunciationError(pron, head)
+        mora_prons.append(mora_pron_unvoice)
+        head += len(token)
     return mora_prons
 
 
@@ -48,136 +74,329 @@ def _parse_as_phonemes(
 ) -> tuple[Phoneme, Phoneme] | tuple[Phoneme]:
     mora_pron, mora_unvoicing = mora_pron_unvoice
     if not _is_mora_pronunciation(mora_pron):
-        raise RuntimeError
+        raise PronunciationError(mora_pron, 0)
     consonant_symbol, vowel_symbol = MR_CV[mora_pron]
-    v = Phoneme(symbol=vowel_symbol, unvoicing=mora_unvoicing)
+    v = get_phoneme(vowel_symbol, unvoicing=mora_unvoicing)
 
     if consonant_symbol:
         # NOTE: consonant is never unvoiced/無声化 because consonant is always unvoice/無声音.
-        return (Phoneme(symbol=consonant_symbol, unvoicing=False), v)
+        return (get_phoneme(consonant_symbol, unvoicing=False), v)
     return (v,)
 
 
-def _parse_as_moras(feat: OjtFeature) -> list[Mora]:
-    """Parse an Open JTalk feature into moras."""
+def build_mora_templates(pron: str) -> tuple[Mora, ...]:
+    """Build template moras of a non-empty pronunciation."""
     # NOTE:
     #   Mora-list-matching divide pronunciation into moras.
     #   [division example]
     #                  MR#0   MR#1  MR#2
     #   "ギョウザ" -> ["ギョ", "ウ", "ザ"]
-    if feat.pron == "":
-        return []
-
-    pron_unvoice_pairs = _split_pron_into_mora_prons(feat.pron)
+    pron_unvoice_pairs = _split_pron_into_mora_prons(pron)
 
-    # Validate
+    # Ignore the head prolonged sound, which is warned by `_parse_as_moras()`.
+    position = 0
     if pron_unvoice_pairs[0][0] == "ー":
-        msg = "長音（`ー`）はワードの先頭に置けません。この長音は無視されます。"  # noqa: RUF001, because of Japanese.
-        warn(msg, stacklevel=2)
-        if len(pron_unvoice_pairs) == 1:
-            # No not-ignored mora remains.
-            return []
         pron_unvoice_pairs = pron_unvoice_pairs[1:]
+        position = 1
 
     # Convert mr-wise pronunciation into Mora.
     # NOTE: `tone_high` is fixed to False. Need update after.
     moras: list[Mora] = []
-    for pron, unvoicing in pron_unvoice_pairs:
-        match pron:
+    for mora_pron, unvoicing in pron_unvoice_pairs:
+        match mora_pron:
             case "ー":
                 symbol = moras[-1]["phonemes"][-1]["symbol"]
-                v = Phoneme(symbol=symbol, unvoicing=unvoicing)
-                moras.append(Mora(phonemes=(v,), pronunciation=pron, tone_high=False))
+                v = get_phoneme(symbol, unvoicing=unvoicing)
+                moras.append(
+                    Mora(phonemes=(v,), pronunciation=mora_pron, tone_high=False)
+                )
             case "、" | "？":  # noqa: RUF001, because of Japanese.
-                pau = Phoneme(symbol="pau", unvoicing=False)
+                pau = get_phoneme("pau", unvoicing=False)
                 moras.append(Mora(phonemes=(pau,), pronunciation="　", tone_high=False))
             case _:
-                pns = _parse_as_phonemes((pron, unvoicing))
-                moras.append(Mora(phonemes=pns, pronunciation=pron, tone_high=False))
+                try:
+                    pns = _parse_as_phonemes((mora_pron, unvoicing))
+                except PronunciationError as e:
+                    # NOTE: Locate the mora in the word pronunciation, as same as the split error.
+                    raise PronunciationError(pron, position) from e
+                moras.append(
+                    Mora(phonemes=pns, pronunciation=mora_pron, tone_high=False)
+                )
+        # NOTE: A token is the mora pronunciation followed by `’` if unvoiced.  # noqa: RUF003, because of Japanese.
+        position += len(mora_pron) + unvoicing
+
+    return tuple(moras)
+
+
+DEFAULT_MORA_CACHE_SIZE: Final = 4096
+_lookup_mora_templates = lru_cache(maxsize=DEFAULT_MORA_CACHE_SIZE)(
+    build_mora_templates
+)
+
+
+def configure_mora_cache(maxsize: int = DEFAULT_MORA_CACHE_SIZE) -> None:
+    """
+    Configure the pronunciation-to-moras cache of the parser.
+
+    The cache keeps `maxsize` pronunciations at most, least recently used ones are evicted.
+    `maxsize=0` turns off the cache. Configuration clears the cache and its statistics.
+    """
+    global _lookup_mora_templates  # noqa: PLW0603, because the cache is module-wide.
+    _lookup_mora_templates = lru_cache(maxsize=maxsize)(build_mora_templates)
+
+
+def clear_mora_cache() -> None:
+    """Clear the pronunciation-to-moras cache and its statistics."""
+    _lookup_mora_templates.cache_clear()
+
+
+def get_mora_cache_info() -> CacheInfo:
+    """Get hit/miss statistics and size of the pronunciation-to-moras cache."""
+    return CacheInfo._make(_lookup_mora_templates.cache_info())
 
-    return moras
 
+def warn_head_prolonged_sound() -> None:
+    """Report that a word-head prolonged sound is ignored, warned at the caller of the caller."""
+    msg = "長音（`ー`）はワードの先頭に置けません。この長音は無視されます。"  # noqa: RUF001, because of Japanese.
+    report("head_prolonged_sound", msg, stacklevel=3)
 
-def _is_chaining(feat: OjtFeature) -> bool:
+
+def _parse_as_moras(pron: str) -> list[Mora]:
+    """Parse an Open JTalk feature pronunciation into moras."""
+    if pron == "":
+        return []
+
+    # Validate
+    # NOTE: Only `ー` token starts with `ー`, so the head mora is a prolonged sound iff the pronunciation starts with `ー`.
+    if pron[0] == "ー":
+        warn_head_prolonged_sound()
+
+    templates = _lookup_mora_templates(pron)
+    # NOTE:
+    #   Templates are shared by all occurrences of the pronunciation, so moras are copied for per-occurrence tone update.
+    #   Phonemes are interned, so they are shared without copy.
+    return [template.copy() for template in templates]
+
+
+def is_chaining(feat: OjtFeature) -> bool:
     """Whether the feature is chaining or not."""
-    return feat.chain_flag == 1
+    return is_chaining_flag(feat.chain_flag)
 
 
-def _parse_as_ap(feats: list[OjtFeature]) -> AccentPhrase:
+def is_chaining_flag(chain_flag: int) -> bool:
+    """Whether the chain flag is chaining or not."""
+    return chain_flag == 1
+
+
+def _parse_as_word(string: str, pron: str) -> Word:
+    """Parse an Open JTalk feature's string and pronunciation into a word."""
+    return Word(moras=_parse_as_moras(pron), text=string)
+
+
+def parse_as_ap(feats: list[OjtFeature]) -> AccentPhrase:
     """Parse Open JTalk features into an accent phrase."""
     # NOTE: length of `feats` is not zero (contract)
-    ap_moras: list[Mora] = []
-    words: list[Word] = []
-    for feat in feats:
-        wd_moras = _parse_as_moras(feat)
-        words.append(Word(moras=wd_moras, text=feat.string))
-        ap_moras += wd_moras
+    words = [_parse_as_word(feat.string, feat.pron) for feat in feats]
+    # NOTE: OJT records the phrase accent type in ap-head feature.
+    return _build_ap(words, feats[0].acc)
+
+
+def _build_ap(words: list[Word], acc: int) -> AccentPhrase:
+    """Build an accent phrase from words and its accent type."""
+    ap_moras: list[Mora] = [mora for word in words for mora in word["moras"]]
 
     # Update tone based on 東京式アクセント rule.
-    # NOTE: OJT records the phrase accent type in ap-head feature.
     # Convert accent type into accent position.
-    acc_pos = feats[0].acc if feats[0].acc > 0 else len(ap_moras)
-    # Switch tone to high until accent position
+    acc_pos = acc if acc > 0 else len(ap_moras)
     for i, mora in enumerate(ap_moras):
-        if i < acc_pos:
-            mora["tone_high"] = True
-    # Switch tone to low at head if not type1.
-    if acc_pos > 1:
-        ap_moras[0]["tone_high"] = False
+        mora["tone_high"] = is_tone_high(i, acc_pos)
 
     return AccentPhrase(words=words)
 
 
-def _parse_as_aps(feats: list[OjtFeature]) -> list[AccentPhrase]:
-    """Parse Open JTalk features into accent phrases."""
+def _warn_head_chaining(string: str) -> None:
+    """Report that the chain flag of a phrase-head word is ignored, warned at the caller of the caller."""
+    msg = f"ワードの連結はブレス節内でのみ発生します。ワード `{string}` は句頭であるため、連結フラグは無視されます。"
+    report("head_chaining", msg, stacklevel=3)
+
+
+def split_ap_ranges(
+    is_chaining_at: Callable[[int], bool],
+    string_at: Callable[[int], str],
+    start: int,
+    stop: int,
+) -> list[tuple[int, int]]:
+    """Split the features in `[start, stop)` into accent-phrase-wise `[head, tail)` ranges, where features are given by index."""
     # NOTE:
     #   Chain flag divide features into accent phrases.
     #   [division example]
     #     n: chain-False feature, c: chain-True feature
     #                              AP#0     AP#1  AP#2  AP#3
     #   [n,c,c,n,c,c,c,n,n,c] -> [n,c,c,| n,c,c,c,| n,| n,c]
-
-    # Split features into ap-wises.
-    #   [n,c,c,n,c,c,c,n,n,c] -> [n,c,c,| n,c,c,c,| n,| n,c]
-    ap_wises: list[list[OjtFeature]] = []
-    ap_wise: list[OjtFeature] = []
-    for feat in feats:
-        if _is_chaining(feat):
-            if len(ap_wises) == 0 and len(ap_wise) == 0:
-                msg = f"ワードの連結はブレス節内でのみ発生します。ワード `{feat.string}` は句頭であるため、連結フラグは無視されます。"
-                warn(msg, stacklevel=2)
-            ap_wise.append(feat)
-        else:
-            # Next ap
-            if len(ap_wise) > 0:
-                ap_wises.append(ap_wise)
-            ap_wise = [feat]
-    if len(ap_wise) > 0:
-        ap_wises.append(ap_wise)
-
-    if len(ap_wises) == 0:
+    if start >= stop:
         return []
+    if is_chaining_at(start):
+        _warn_head_chaining(string_at(start))
+    ap_heads = [start] + [i for i in range(start + 1, stop) if not is_chaining_at(i)]
+    return list(zip(ap_heads, [*ap_heads[1:], stop], strict=True))
+
+
+def split_into_ap_wises(feats: list[OjtFeature]) -> list[list[OjtFeature]]:
+    """Split Open JTalk features into accent-phrase-wise features."""
+    ranges = split_ap_ranges(
+        lambda i: is_chaining(feats[i]), lambda i: feats[i].string, 0, len(feats)
+    )
+    return [feats[head:tail] for head, tail in ranges]
+
+
+@dataclass
+class _StageClock:
+    """Per-stage accumulators of a parse, recorded into metrics once per parse."""
+
+    n_feat: int = 0
+    n_ap: int = 0
+    ap_chaining: float = 0.0
+    mora_splitting: float = 0.0
+    tone_assignment: float = 0.0
+
+    def add(
+        self,
+        n_feat: int,
+        n_ap: int,
+        ap_chaining: float,
+        mora_splitting: float,
+        tone_assignment: float,
+    ) -> None:
+        """Accumulate a group."""
+        self.n_feat += n_feat
+        self.n_ap += n_ap
+        self.ap_chaining += ap_chaining
+        self.mora_splitting += mora_splitting
+        self.tone_assignment += tone_assignment
+
+    def record(self, metrics: Metrics) -> None:
+        """Record the accumulated stages as a call each."""
+        metrics.record("ap_chaining", self.ap_chaining, self.n_feat)
+        metrics.record("mora_splitting", self.mora_splitting, self.n_feat)
+        metrics.record("tone_assignment", self.tone_assignment, self.n_ap)
+
+
+def _parse_as_aps(
+    feats: list[OjtFeature], clock: _StageClock | None = None
+) -> list[AccentPhrase]:
+    """Parse Open JTalk features into accent phrases, timing each stage into `clock` if given."""
+    if clock is None:
+        return [parse_as_ap(ap_wise) for ap_wise in split_into_ap_wises(feats)]
+
+    # NOTE: Same steps as `parse_as_ap()`, split at stage boundaries.
+    start = perf_counter()
+    ap_wises = split_into_ap_wises(feats)
+    chained = perf_counter()
+    ap_words = [
+        [_parse_as_word(feat.string, feat.pron) for feat in ap_wise]
+        for ap_wise in ap_wises
+    ]
+    split = perf_counter()
+    aps = [
+        _build_ap(words, ap_wise[0].acc)
+        for ap_wise, words in zip(ap_wises, ap_words, strict=True)
+    ]
+    clock.add(
+        len(feats), len(aps), chained - start, split - chained, perf_counter() - split
+    )
+    return aps
+
+
+MARK_PRONS = ("、", "？")  # noqa: RUF001, because of Japanese.
+
+
+def is_mark(word: OjtFeature) -> bool:
+    """Whether the word is mark or not."""
+    return word.pron in MARK_PRONS
 
-    return [_parse_as_ap(ap_wise) for ap_wise in ap_wises]
 
+def _parse_batch_as_aps(
+    batch: OjtFeatureBatch, start: int, stop: int
+) -> list[AccentPhrase]:
+    """Parse the features in `[start, stop)` of the batch into accent phrases."""
+    strings, prons, accs = batch.string, batch.pron, batch.acc
+    chain_flags = batch.chain_flag
+    ranges = split_ap_ranges(
+        lambda i: is_chaining_flag(chain_flags[i]), strings.__getitem__, start, stop
+    )
+    aps: list[AccentPhrase] = []
+    for head, tail in ranges:
+        words = [_parse_as_word(strings[i], prons[i]) for i in range(head, tail)]
+        aps.append(_build_ap(words, accs[head]))
+    return aps
 
-def _is_mark(word: OjtFeature) -> bool:
-    """Whether the word is mark or not."""
-    return word.pron in ["、", "？"]  # noqa: RUF001, because of Japanese.
 
-
-def parse_ojt_as_tree(feats: list[OjtFeature]) -> Tree:
-    """Open JTalk のテキスト処理結果を Tree としてパースする。"""
-    if len(feats) == 0:
-        return []
+def _parse_batch_as_tree(batch: OjtFeatureBatch) -> Tree:
+    """Parse columnar Open JTalk features as a tree."""
+    is_marks = [pron in MARK_PRONS for pron in batch.pron]
 
     tree: Tree = []
     # Divide features into successive voices (BreathGroup) and successive marks (MarkGroup).
-    for is_marks, successive_feats in groupby(feats, _is_mark):
-        aps = _parse_as_aps(list(successive_feats))
+    start = 0
+    for is_marks_group, successive_idxs in groupby(
+        range(len(batch)), is_marks.__getitem__
+    ):
+        stop = start + sum(1 for _ in successive_idxs)
+        aps = _parse_batch_as_aps(batch, start, stop)
         tree += [
             MarkGroup(accent_phrases=aps, type="MarkGroup")
-            if is_marks
+            if is_marks_group
             else BreathGroup(accent_phrases=aps, type="BreathGroup")
         ]
+        start = stop
     return tree
+
+
+def parse_ojt_as_tree(feats: list[OjtFeature] | OjtFeatureBatch) -> Tree:
+    """
+    Open JTalk のテキスト処理結果を Tree としてパースする。
+
+    `speechtree.instrumentation.instrument()` のコンテキスト内では、グループ毎のパースをステージ別に計測する。
+    """
+    if len(feats) == 0:
+        return []
+
+    metrics = current_metrics()
+    if metrics is not None:
+        rows = (
+            feats if isinstance(feats, list) else [feats[i] for i in range(len(feats))]
+        )
+        clock = _StageClock()
+        tree = list(_iter_as_groups(rows, clock))
+        clock.record(metrics)
+        return tree
+
+    if isinstance(feats, OjtFeatureBatch):
+        return _parse_batch_as_tree(feats)
+
+    return list(iter_ojt_as_groups(feats))
+
+
+def iter_ojt_as_groups(feats: Iterable[OjtFeature]) -> Iterator[PhraseGroup]:
+    """
+    Open JTalk のテキスト処理結果をフレーズグループ列として逐次パースする。
+
+    各グループは境界が確定した時点、すなわち次グループの先頭特徴量を受け取った時点または入力の終端で生成される。
+    生成されるグループ列は `parse_ojt_as_tree()` の Tree と一致する。
+    """
+    return _iter_as_groups(feats)
+
+
+def _iter_as_groups(
+    feats: Iterable[OjtFeature], clock: _StageClock | None = None
+) -> Iterator[PhraseGroup]:
+    """Parse Open JTalk features into phrase groups lazily, timing each stage into `clock` if given."""
+    # Divide features into successive voices (BreathGroup) and successive marks (MarkGroup).
+    # NOTE: `groupby()` is lazy, so a group is yielded as soon as the next group's head feature arrives.
+    for is_marks, successive_feats in groupby(feats, is_mark):
+        aps = _parse_as_aps(list(successive_feats), clock)
+        yield (
+            MarkGroup(accent_phrases=aps, type="MarkGroup")
+            if is_marks
+            else BreathGroup(accent_phrases=aps, type="BreathGroup")
+        )
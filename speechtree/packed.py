@@ -0,0 +1,187 @@
+"""Packed tree, array-backed compact representation of Tree."""
+
+from array import array
+from dataclasses import dataclass
+from typing import Final
+
+from speechtree.characters import PHONEME_SYMBOLS, get_phoneme
+from speechtree.tree import (
+    AccentPhrase,
+    BreathGroup,
+    MarkGroup,
+    Mora,
+    PhraseGroup,
+    Tree,
+    Word,
+)
+
+BREATH_GROUP: Final = 0
+MARK_GROUP: Final = 1
+
+
+@dataclass(frozen=True)
+class PackedTree:
+    """
+    パックドツリー。
+
+    Tree を型付きフラット配列で表現した、省メモリな等価表現。
+    各階層の要素は CSR 形式のオフセット配列で下位階層の範囲を指す。
+    例えば i 番目のモーラの音素は `phoneme_*[mora_phoneme_offsets[i]:mora_phoneme_offsets[i+1]]` である。
+    ワードのテキストとモーラの発音は単一の文字列バッファ `text` の区間として保持される。
+    """
+
+    # NOTE: abbreviated as "PT/pt"
+
+    symbols: tuple[str, ...]  # 音素シンボル表。`phoneme_symbol_ids` はこの表の添字。
+    phoneme_symbol_ids: array[int]
+    phoneme_unvoicing: array[int]
+    mora_tone_high: array[int]
+    mora_phoneme_offsets: array[int]
+    mora_pronunciation_offsets: array[int]  # `text` 上の区間
+    word_text_offsets: array[int]  # `text` 上の区間
+    word_mora_offsets: array[int]
+    ap_word_offsets: array[int]
+    group_ap_offsets: array[int]
+    group_types: array[int]  # `BREATH_GROUP` | `MARK_GROUP`
+    text: str
+
+    def __len__(self) -> int:
+        """Count groups."""
+        return len(self.group_types)
+
+    def ap_mora_range(self, ap_index: int) -> tuple[int, int]:
+        """Get the mora index range of the accent phrase."""
+        word_offsets = self.word_mora_offsets
+        return (
+            word_offsets[self.ap_word_offsets[ap_index]],
+            word_offsets[self.ap_word_offsets[ap_index + 1]],
+        )
+
+
+def pack_tree(tree: Tree) -> PackedTree:
+    """Pack the tree into a packed tree."""
+    # NOTE: Standard symbols have stable IDs, others are appended on demand.
+    symbols: list[str] = list(PHONEME_SYMBOLS)
+    symbol_ids = {symbol: i for i, symbol in enumerate(symbols)}
+
+    phoneme_symbol_ids: list[int] = []
+    phoneme_unvoicing: list[bool] = []
+    mora_tone_high: list[bool] = []
+    mora_phoneme_offsets = [0]
+    mora_prons: list[str] = []
+    word_texts: list[str] = []
+    word_mora_offsets = [0]
+    ap_word_offsets = [0]
+    group_ap_offsets = [0]
+    group_types: list[int] = []
+    for gp in tree:
+        for ap in gp["accent_phrases"]:
+            for wd in ap["words"]:
+                for mr in wd["moras"]:
+                    for pn in mr["phonemes"]:
+                        symbol = pn["symbol"]
+                        symbol_id = symbol_ids.get(symbol)
+                        if symbol_id is None:
+                            symbol_id = symbol_ids[symbol] = len(symbols)
+                            symbols.append(symbol)
+                        phoneme_symbol_ids.append(symbol_id)
+                        phoneme_unvoicing.append(pn["unvoicing"])
+                    mora_phoneme_offsets.append(len(phoneme_symbol_ids))
+                    mora_tone_high.append(mr["tone_high"])
+                    mora_prons.append(mr["pronunciation"])
+                word_mora_offsets.append(len(mora_prons))
+                word_texts.append(wd["text"])
+            ap_word_offsets.append(len(word_texts))
+        group_ap_offsets.append(len(ap_word_offsets) - 1)
+        group_types.append(MARK_GROUP if gp["type"] == "MarkGroup" else BREATH_GROUP)
+
+    # Shared text buffer, word texts followed by mora pronunciations.
+    word_text_offsets = _accumulate_lengths(word_texts, 0)
+    mora_pronunciation_offsets = _accumulate_lengths(mora_prons, word_text_offsets[-1])
+
+    return PackedTree(
+        symbols=tuple(symbols),
+        phoneme_symbol_ids=array("H", phoneme_symbol_ids),
+        phoneme_unvoicing=array("B", phoneme_unvoicing),
+        mora_tone_high=array("B", mora_tone_high),
+        mora_phoneme_offsets=array("I", mora_phoneme_offsets),
+        mora_pronunciation_offsets=mora_pronunciation_offsets,
+        word_text_offsets=word_text_offsets,
+        word_mora_offsets=array("I", word_mora_offsets),
+        ap_word_offsets=array("I", ap_word_offsets),
+        group_ap_offsets=array("I", group_ap_offsets),
+        group_types=array("B", group_types),
+        text="".join(word_texts) + "".join(mora_prons),
+    )
+
+
+def _accumulate_lengths(strings: list[str], start: int) -> array[int]:
+    """Accumulate string lengths into offsets."""
+    offsets = array("I", [start])
+    offset = start
+    for string in strings:
+        offset += len(string)
+        offsets.append(offset)
+    return offsets
+
+
+def _unpack_mora(pt: PackedTree, mora_index: int) -> Mora:
+    symbols, symbol_ids, unvoicing = (
+        pt.symbols,
+        pt.phoneme_symbol_ids,
+        pt.phoneme_unvoicing,
+    )
+    pn_start, pn_end = (
+        pt.mora_phoneme_offsets[mora_index],
+        pt.mora_phoneme_offsets[mora_index + 1],
+    )
+    pron_start, pron_end = (
+        pt.mora_pronunciation_offsets[mora_index],
+        pt.mora_pronunciation_offsets[mora_index + 1],
+    )
+    phonemes = tuple(
+        get_phoneme(symbols[symbol_ids[i]], unvoicing=bool(unvoicing[i]))
+        for i in range(pn_start, pn_end)
+    )
+    return Mora(
+        phonemes=phonemes,  # type: ignore[typeddict-item]
+        pronunciation=pt.text[pron_start:pron_end],
+        tone_high=bool(pt.mora_tone_high[mora_index]),
+    )
+
+
+def _unpack_word(pt: PackedTree, word_index: int) -> Word:
+    mr_start, mr_end = (
+        pt.word_mora_offsets[word_index],
+        pt.word_mora_offsets[word_index + 1],
+    )
+    text_start, text_end = (
+        pt.word_text_offsets[word_index],
+        pt.word_text_offsets[word_index + 1],
+    )
+    return Word(
+        moras=[_unpack_mora(pt, i) for i in range(mr_start, mr_end)],
+        text=pt.text[text_start:text_end],
+    )
+
+
+def _unpack_ap(pt: PackedTree, ap_index: int) -> AccentPhrase:
+    wd_start, wd_end = pt.ap_word_offsets[ap_index], pt.ap_word_offsets[ap_index + 1]
+    return AccentPhrase(words=[_unpack_word(pt, i) for i in range(wd_start, wd_end)])
+
+
+def unpack_group(pt: PackedTree, group_index: int) -> PhraseGroup:
+    """Unpack a group of the packed tree."""
+    ap_start, ap_end = (
+        pt.group_ap_offsets[group_index],
+        pt.group_ap_offsets[group_index + 1],
+    )
+    aps = [_unpack_ap(pt, i) for i in range(ap_start, ap_end)]
+    if pt.group_types[group_index] == MARK_GROUP:
+        return MarkGroup(accent_phrases=aps, type="MarkGroup")
+    return BreathGroup(accent_phrases=aps, type="BreathGroup")
+
+
+def unpack_tree(pt: PackedTree) -> Tree:
+    """Unpack the packed tree into a tree."""
+    return [unpack_group(pt, i) for i in range(len(pt))]
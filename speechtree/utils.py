@@ -1,6 +1,6 @@
 """Utilities."""
 
-from typing import Any, TypeAliasType
+from typing import Any, NamedTuple, TypeAliasType
 from typing import get_args as built_in_get_args
 
 
@@ -8,3 +8,12 @@ def get_args(literal_type_obj: TypeAliasType) -> tuple[Any, ...]:
     """Get type arguments."""
     # NOTE: Tests guarantees type-tuple exact matching.
     return built_in_get_args(literal_type_obj.__value__)
+
+
+class CacheInfo(NamedTuple):
+    """Hit/miss statistics and size of a cache, as same as `functools.lru_cache`'s."""
+
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
@@ -0,0 +1,214 @@
+"""Asyncio VOICEVOX ENGINE client."""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncGenerator, Iterable
+from types import TracebackType
+from typing import Self
+
+from speechtree.tree import Tree
+from speechtree.voicevox.serializer import (
+    AudioQuerySettings,
+    dumps_accent_phrases,
+    wrap_as_audio_query,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 50021
+
+
+class VoicevoxEngineError(RuntimeError):
+    """Error response from VOICEVOX ENGINE."""
+
+
+type _Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class VoicevoxClient:
+    """
+    VOICEVOX ENGINE の非同期クライアント。
+
+    HTTP/1.1 keep-alive 接続をプールし、同時リクエスト数を `max_connections` 以下に制限する。
+    `async with` で使用し、終了時に全ての接続を閉じる。
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        *,
+        max_connections: int = 4,
+    ) -> None:
+        """Initialize the client, connections are opened on demand."""
+        self._host = host
+        self._port = port
+        self._max_connections = max_connections
+        # NOTE: Semaphore bounds in-flight requests, so idle connections never exceed `max_connections`.
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: list[_Connection] = []
+        self._closed = False
+
+    async def __aenter__(self) -> Self:
+        """Enter the client context."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close all pooled connections."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close all pooled connections, in-flight connections are closed when their requests finish."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            await writer.wait_closed()
+
+    async def post(self, path: str, body: bytes) -> bytes:
+        """POST the JSON body over a pooled connection and return the response body."""
+        async with self._slots:
+            if self._closed:
+                msg = "クライアントは既に閉じられています。"
+                raise RuntimeError(msg)
+            reused = len(self._idle) > 0
+            conn = self._idle.pop() if reused else await self._connect()
+            try:
+                res_body, keep_alive = await self._request_or_close(conn, path, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+                # NOTE: The engine may close idle keep-alive connections, so retry once with a fresh connection.
+                conn = await self._connect()
+                res_body, keep_alive = await self._request_or_close(conn, path, body)
+            if keep_alive and not self._closed:
+                self._idle.append(conn)
+            else:
+                conn[1].close()
+            return res_body
+
+    async def _connect(self) -> _Connection:
+        return await asyncio.open_connection(self._host, self._port)
+
+    async def _request_or_close(
+        self, conn: _Connection, path: str, body: bytes
+    ) -> tuple[bytes, bool]:
+        """Send a request over the connection, which is closed on any error."""
+        try:
+            return await self._request(conn, path, body)
+        except BaseException:
+            conn[1].close()
+            raise
+
+    async def _request(
+        self, conn: _Connection, path: str, body: bytes
+    ) -> tuple[bytes, bool]:
+        """Send a HTTP/1.1 request and read the response, with keep-alive flag."""
+        reader, writer = conn
+        head = (
+            f"POST {path} HTTP/1.1\r\n"
+            f"Host: {self._host}:{self._port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("ascii") + body)
+        await writer.drain()
+
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split(b" ", 2)[1])
+        headers: dict[str, str] = {}
+        while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            res_body = await _read_chunked(reader)
+        else:
+            res_body = await reader.readexactly(int(headers.get("content-length", "0")))
+        keep_alive = headers.get("connection", "").lower() != "close"
+
+        if status != 200:  # noqa: PLR2004, because HTTP 200 OK is apparent.
+            msg = f"VOICEVOX ENGINE が `{path}` に対してエラー {status} を返しました: {res_body[:200]!r}"
+            raise VoicevoxEngineError(msg)
+        return res_body, keep_alive
+
+    async def synthesize(
+        self,
+        tree: Tree,
+        speaker: int,
+        settings: AudioQuerySettings | None = None,
+        *,
+        fill_mora_data: bool = True,
+    ) -> bytes:
+        """
+        ツリーを VOICEVOX ENGINE で音声合成し、WAV バイト列を返す。
+
+        `fill_mora_data` が真の場合、合成前に `/mora_data` で音素長と音高を付与する。
+        """
+        aps_json = dumps_accent_phrases(tree)
+        if fill_mora_data:
+            aps_json = await self.post(f"/mora_data?speaker={speaker}", aps_json)
+        query = wrap_as_audio_query(aps_json, settings)
+        return await self.post(f"/synthesis?speaker={speaker}", query)
+
+    async def synthesize_many(
+        self,
+        trees: Iterable[Tree],
+        speaker: int,
+        settings: AudioQuerySettings | None = None,
+        *,
+        fill_mora_data: bool = True,
+        max_pending: int | None = None,
+    ) -> AsyncGenerator[bytes]:
+        """
+        複数のツリーを並行に音声合成し、入力順に WAV バイト列を返す。
+
+        未取得の結果は最大 `max_pending` (既定は `max_connections` の 2 倍) 件に制限され、
+        呼び出し側が結果を消費するまで `trees` の読み出しは進まない (バックプレッシャー)。
+        """
+        if max_pending is None:
+            max_pending = 2 * self._max_connections
+        elif max_pending < 1:
+            msg = f"max_pending は 1 以上である必要があります (max_pending={max_pending})。"
+            raise ValueError(msg)
+        pending: deque[asyncio.Task[bytes]] = deque()
+        tree_iter = iter(trees)
+        try:
+            while True:
+                for tree in tree_iter:
+                    pending.append(
+                        asyncio.create_task(
+                            self.synthesize(
+                                tree, speaker, settings, fill_mora_data=fill_mora_data
+                            )
+                        )
+                    )
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    return
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    """Read a chunked transfer-encoded body."""
+    chunks: list[bytes] = []
+    while True:
+        size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+        if size == 0:
+            # NOTE: Skip trailers.
+            while await reader.readuntil(b"\r\n") != b"\r\n":
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
@@ -1,11 +1,21 @@
-"""Tree-To-VOICEVOX converter."""
+"""Tree-To-VOICEVOX converter and its reverse."""
 
+from collections.abc import Iterator
+from functools import lru_cache
 from itertools import batched
 from typing import Final
-from warnings import warn
 
-from speechtree.gardener import extract_accent_position, extract_text
-from speechtree.tree import PhraseGroup, Tree, Word
+from speechtree.characters import (
+    UNVOICED_VOWEL_SYMBOLS,
+    gen_mark_ap,
+    get_phoneme,
+    is_tone_high,
+)
+from speechtree.diagnostics import report
+from speechtree.gardener import extract_text
+from speechtree.tree import AccentPhrase as TreeAccentPhrase
+from speechtree.tree import BreathGroup, MarkGroup, PhraseGroup, Tree, Word
+from speechtree.tree import Mora as TreeMora
 from speechtree.voicevox.domain import AccentPhrase, Mora
 
 _NON_VV_MORA_MAPPING = {
@@ -34,10 +44,9 @@ _NON_VV_MORA_MAPPING = {
     "ィ": "イ",
     "ァ": "ア",
 }
-_NON_VV_MORA_PRONS: Final = list(_NON_VV_MORA_MAPPING.keys())
 
 
-def _gen_pau_mora() -> Mora:
+def gen_pau_mora() -> Mora:
     """Generate VOICEVOX pause mora."""
     # NOTE: ref: https://github.com/VOICEVOX/voicevox_engine/blob/c95bb9e387043e7f7a2eb4fd3e46692fea28716a/voicevox_engine/tts_pipeline/text_analyzer.py#L383-L391
     return Mora(
@@ -73,75 +82,93 @@ def _aiueo_to_mora_pron(phoneme: str) -> str:
 
 
 def _replace_mora_pron(mora_pron: str) -> str:
-    if mora_pron in _NON_VV_MORA_PRONS:
-        mora_pron = _NON_VV_MORA_MAPPING[mora_pron]
-    return mora_pron
+    return _NON_VV_MORA_MAPPING.get(mora_pron, mora_pron)
 
 
-def _convert_words_to_voicevox_moras(words: list[Word]) -> list[Mora]:
-    """Convert words into VOICEVOX moras."""
+# NOTE: VOICEVOX mora fields except `pitch`, in the order of `Mora` fields.
+type VVMoraFields = tuple[str, str | None, float | None, str, float]
+type MoraKey = tuple[str, tuple[tuple[str, bool], ...]]
+# NOTE: Keys include mora pronunciations, which are arbitrary texts in edited trees or trees from VOICEVOX, so the cache is bounded.
+DEFAULT_VV_MORA_CACHE_SIZE: Final = 4096
+
+
+def _build_vv_mora_fields(key: MoraKey) -> VVMoraFields:
+    """Build VOICEVOX mora fields from (pronunciation, ((symbol, unvoicing), ...))."""
+    pron, phonemes = key
+
+    consonant_symbol = None if len(phonemes) == 1 else phonemes[0][0]
+    consonant_length = None if len(phonemes) == 1 else 0.0
+
+    _v_symbol, v_unvoicing = phonemes[-1]
+    v_symbol = _unvoiced_symbol(_v_symbol) if v_unvoicing else _v_symbol
+    vowel_length = 0.0
+
+    if pron[-1] == "’":  # noqa: RUF001, because of Japanese.
+        mora_text = pron[:-1]
+    elif pron == "ー":
+        # NOTE: VOICEVOX losts prolonged sound mark. Only realized phonemes remain.
+        mora_text = _aiueo_to_mora_pron(v_symbol)
+    else:
+        mora_text = pron
+    return (
+        _replace_mora_pron(mora_text),
+        consonant_symbol,
+        consonant_length,
+        v_symbol,
+        vowel_length,
+    )
+
+
+def to_mora_key(mora: TreeMora) -> MoraKey:
+    """Key a tree mora by its pronunciation and phonemes."""
+    return (
+        mora["pronunciation"],
+        tuple((p["symbol"], p["unvoicing"]) for p in mora["phonemes"]),
+    )
+
+
+lookup_vv_mora_fields = lru_cache(maxsize=DEFAULT_VV_MORA_CACHE_SIZE)(
+    _build_vv_mora_fields
+)
+
+
+def _convert_ap_to_voicevox_moras(ap: TreeAccentPhrase) -> tuple[list[Mora], int]:
+    """Convert the accent phrase into VOICEVOX moras and its accent position in a single pass."""
     vv_moras: list[Mora] = []
-    for word in words:
+    accent = 0
+    for word in ap["words"]:
         for mora in word["moras"]:
-            phonemes = mora["phonemes"]
-
-            consonant_symbol = None if len(phonemes) == 1 else phonemes[0]["symbol"]
-            consonant_length = None if len(phonemes) == 1 else 0.0
-
-            vowel = phonemes[-1]
-            _v_symbol = vowel["symbol"]
-            v_symbol = _unvoiced_symbol(_v_symbol) if vowel["unvoicing"] else _v_symbol
-            vowel_length = 0.0
-
-            pron = mora["pronunciation"]
-            if pron[-1] == "’":  # noqa: RUF001, because of Japanese.
-                mora_text = pron[:-1]
-            elif pron == "ー":
-                # NOTE: VOICEVOX losts prolonged sound mark. Only realized phonemes remain.
-                mora_text = _aiueo_to_mora_pron(v_symbol)
-            else:
-                mora_text = pron
-            vv_moras.append(
-                Mora(
-                    text=_replace_mora_pron(mora_text),
-                    consonant=consonant_symbol,
-                    consonant_length=consonant_length,
-                    vowel=v_symbol,
-                    vowel_length=vowel_length,
-                )
-            )
-    return vv_moras
+            vv_moras.append(Mora(*lookup_vv_mora_fields(to_mora_key(mora))))
+            # NOTE: Same as `extract_accent_position()`, index of the last high-tone mora plus one.
+            if mora["tone_high"]:
+                accent = len(vv_moras)
+    return vv_moras, accent
 
 
 def _contain_interrogative(pg: PhraseGroup) -> bool:
     """Whether the group contains interrogative or not."""
-    text = ""
-    for ap in pg["accent_phrases"]:
-        for wd in ap["words"]:
-            text += wd["text"]
-    return "？" in text  # noqa: RUF001, because of Japanese.
-
+    return any(
+        "？" in wd["text"]  # noqa: RUF001, because of Japanese.
+        for ap in pg["accent_phrases"]
+        for wd in ap["words"]
+    )
 
-def convert_tree_to_voicevox_accent_phrases(
-    tree: Tree,
-) -> list[AccentPhrase]:
-    """Convert tree into VOICEVOX accent phrases."""
-    # Validation on VOICEVOX standards
-    # unvoicing check ["a", "i", "u", "e", "o"]
-    # "無声化は /-a/ /-i/ /-u/ /-e/ /-o/ でのみ可能です。{vowel_symbol} には適用できないため無視されます。
 
-    # Remove tree-head MarkGroup.
-    if tree[0]["type"] == "MarkGroup":
+def remove_head_mark_group(tree: Tree) -> Tree:
+    """Remove tree-head MarkGroup, which VOICEVOX cannot express, with warning."""
+    if len(tree) > 0 and tree[0]["type"] == "MarkGroup":
         texts = extract_text(tree[0:1])
         msg = f"「{texts}」には音がありません。文頭に来れないため無視されます。"
-        warn(msg, stacklevel=2)
-        tree = tree[1:]
+        report("head_mark_group", msg, stacklevel=3)
+        return tree[1:]
+    return tree
+
 
+def iter_vv_aps(tree: Tree) -> Iterator[tuple[TreeAccentPhrase, bool, bool]]:
+    """Iterate BreathGroup accent phrases with VOICEVOX `pause_mora` existence and `is_interrogative`."""
     # Divide groups into BG-MG pairs
     bg_mg_pairs = list(batched(tree, 2))
 
-    # Generate accent phrases
-    vv_aps: list[AccentPhrase] = []
     for i, bg_mg in enumerate(bg_mg_pairs):
         # Last pair can be not pair, just BG 1-tuple.
         bg = bg_mg[0]
@@ -150,18 +177,99 @@ def convert_tree_to_voicevox_accent_phrases(
         is_tail_bg = i == len(bg_mg_pairs) - 1
         is_interrogative_bg = _contain_interrogative(mg) if mg else False
 
-        for ap in bg["accent_phrases"]:
-            is_tail_ap = ap == bg["accent_phrases"][-1]
+        tail_ap_index = len(bg["accent_phrases"]) - 1
+        for ap_index, ap in enumerate(bg["accent_phrases"]):
+            is_tail_ap = ap_index == tail_ap_index
             # NOTE: VOICEVOX delete utterance tail pause.
             with_pau = is_tail_ap and not is_tail_bg
             interrogative = is_tail_ap and is_interrogative_bg
-            vv_aps.append(
-                AccentPhrase(
-                    _convert_words_to_voicevox_moras(ap["words"]),
-                    accent=extract_accent_position(ap),
-                    pause_mora=_gen_pau_mora() if with_pau else None,
-                    is_interrogative=interrogative,
-                )
+            yield ap, with_pau, interrogative
+
+
+def convert_tree_to_voicevox_accent_phrases(
+    tree: Tree,
+) -> list[AccentPhrase]:
+    """Convert tree into VOICEVOX accent phrases."""
+    # Validation on VOICEVOX standards
+    # unvoicing check ["a", "i", "u", "e", "o"]
+    # "無声化は /-a/ /-i/ /-u/ /-e/ /-o/ でのみ可能です。{vowel_symbol} には適用できないため無視されます。
+
+    tree = remove_head_mark_group(tree)
+
+    # Generate accent phrases
+    vv_aps: list[AccentPhrase] = []
+    for ap, with_pau, interrogative in iter_vv_aps(tree):
+        vv_moras, accent = _convert_ap_to_voicevox_moras(ap)
+        vv_aps.append(
+            AccentPhrase(
+                vv_moras,
+                accent=accent,
+                pause_mora=gen_pau_mora() if with_pau else None,
+                is_interrogative=interrogative,
             )
+        )
 
     return vv_aps
+
+
+# NOTE:
+#   `_NON_VV_MORA_MAPPING` is many-to-one, and each substituted pronunciation has the same phonemes as its standard kana (e.g. ヲ/ォ/オ = /o/).
+#   So substitutions cannot be reversed, and the standard kana (VOICEVOX mora text) is used as the tree pronunciation.
+#   Similarly, prolonged sound mark "ー" and the kind of marks other than question mark are not recoverable.
+_VV_UNVOICED_VOWELS: Final[dict[str, str]] = {
+    unvoiced: voiced for voiced, unvoiced in UNVOICED_VOWEL_SYMBOLS.items()
+}  # NOTE: unvoiced -> voiced
+
+
+def _convert_voicevox_mora_to_tree_mora(vv_mora: Mora, *, tone_high: bool) -> TreeMora:
+    """Convert a VOICEVOX mora into a tree mora."""
+    vowel = vv_mora.vowel
+    unvoicing = vowel in _VV_UNVOICED_VOWELS
+    vowel_phoneme = get_phoneme(
+        _VV_UNVOICED_VOWELS[vowel] if unvoicing else vowel, unvoicing=unvoicing
+    )
+    if vv_mora.consonant is None:
+        return TreeMora(
+            phonemes=(vowel_phoneme,),
+            pronunciation=vv_mora.text,
+            tone_high=tone_high,
+        )
+    return TreeMora(
+        phonemes=(get_phoneme(vv_mora.consonant, unvoicing=False), vowel_phoneme),
+        pronunciation=vv_mora.text,
+        tone_high=tone_high,
+    )
+
+
+def _convert_voicevox_ap_to_tree_ap(vv_ap: AccentPhrase) -> TreeAccentPhrase:
+    """Convert a VOICEVOX accent phrase into a single-word tree accent phrase."""
+    moras = [
+        _convert_voicevox_mora_to_tree_mora(
+            vv_mora, tone_high=is_tone_high(i, vv_ap.accent)
+        )
+        for i, vv_mora in enumerate(vv_ap.moras)
+    ]
+    text = "".join(vv_mora.text for vv_mora in vv_ap.moras)
+    return TreeAccentPhrase(words=[Word(moras=moras, text=text)])
+
+
+def convert_voicevox_accent_phrases_to_tree(vv_aps: list[AccentPhrase]) -> Tree:
+    """
+    VOICEVOX アクセント句列をツリーへ変換する。
+
+    トーンは `accent` から東京式アクセント規則で復元され、各アクセント句は単一のワードとなる。
+    `is_interrogative` なアクセント句の後ろには疑問符、`pause_mora` を持つアクセント句の後ろには「、」のマークグループが置かれる。
+    長音・VOICEVOX 非対応モーラの置換・マークの種類・音素長・音高は復元されない。
+    """
+    tree: Tree = []
+    bg_aps: list[TreeAccentPhrase] = []
+    for vv_ap in vv_aps:
+        bg_aps.append(_convert_voicevox_ap_to_tree_ap(vv_ap))
+        if vv_ap.is_interrogative or vv_ap.pause_mora is not None:
+            tree.append(BreathGroup(accent_phrases=bg_aps, type="BreathGroup"))
+            mark = "？" if vv_ap.is_interrogative else "、"  # noqa: RUF001, because of Japanese.
+            tree.append(MarkGroup(accent_phrases=[gen_mark_ap(mark)], type="MarkGroup"))
+            bg_aps = []
+    if bg_aps:
+        tree.append(BreathGroup(accent_phrases=bg_aps, type="BreathGroup"))
+    return tree
@@ -0,0 +1,124 @@
+"""Fused OJT-to-VOICEVOX converter, which skips the intermediate Tree."""
+
+from collections.abc import Callable, Sequence
+from itertools import groupby
+
+from speechtree.diagnostics import report
+from speechtree.ojt.domain import OjtFeature
+from speechtree.ojt.parser import (
+    build_mora_templates,
+    is_mark,
+    split_into_ap_wises,
+    warn_head_prolonged_sound,
+)
+from speechtree.voicevox.converter import (
+    VVMoraFields,
+    gen_pau_mora,
+    lookup_vv_mora_fields,
+    to_mora_key,
+)
+from speechtree.voicevox.domain import AccentPhrase, Mora
+
+# NOTE:
+#   Same outputs and warnings as `parse_ojt_as_tree()` followed by `convert_tree_to_voicevox_accent_phrases()`.
+#   Moras are looked up as VOICEVOX mora fields per word pronunciation, and tone is reduced to the accent position directly.
+
+type MoraLookup = Callable[[str], tuple[VVMoraFields, ...]]
+
+
+def build_vv_mora_fields_of_pron(pron: str) -> tuple[VVMoraFields, ...]:
+    """Build VOICEVOX mora fields of an Open JTalk feature pronunciation, the unit of mora lookup."""
+    if pron == "":
+        return ()
+    return tuple(
+        lookup_vv_mora_fields(to_mora_key(template))
+        for template in build_mora_templates(pron)
+    )
+
+
+def _accent_position(acc: int, n_mora: int) -> int:
+    """Convert the accent type into VOICEVOX accent position, through the tone of 東京式アクセント rule."""
+    # NOTE:
+    #   Tone is high in `i < acc_pos`, except the head if `acc_pos > 1` (see `is_tone_high()` of characters).
+    #   VOICEVOX accent is the index of the last high-tone mora plus one, 0 without high-tone moras (e.g. no moras).
+    acc_pos = acc if acc > 0 else n_mora
+    n_high_range = min(acc_pos, n_mora)
+    if acc_pos > 1 and n_high_range == 1:
+        return 0
+    return n_high_range
+
+
+def _convert_feats_to_vv_ap(
+    ap_feats: list[OjtFeature],
+    lookup_moras: MoraLookup,
+    *,
+    with_pau: bool,
+    interrogative: bool,
+) -> AccentPhrase:
+    """Convert accent-phrase-wise features into a VOICEVOX accent phrase."""
+    vv_moras: list[Mora] = []
+    for feat in ap_feats:
+        pron = feat.pron
+        if pron[:1] == "ー":
+            warn_head_prolonged_sound()
+        vv_moras += [Mora(*fields) for fields in lookup_moras(pron)]
+    return AccentPhrase(
+        vv_moras,
+        accent=_accent_position(ap_feats[0].acc, len(vv_moras)),
+        pause_mora=gen_pau_mora() if with_pau else None,
+        is_interrogative=interrogative,
+    )
+
+
+def convert_ojt_to_voicevox_accent_phrases(
+    feats: Sequence[OjtFeature],
+    lookup_moras: MoraLookup = build_vv_mora_fields_of_pron,
+) -> list[AccentPhrase]:
+    """
+    Open JTalk のテキスト処理結果を、Tree を経由せずに VOICEVOX アクセント句列へ変換する。
+
+    モーラは `lookup_moras` によりワード発音単位で引かれるため、キャッシュ付きの関数を渡すと高速化できる。
+    """
+    # Divide features into BreathGroup-wise and MarkGroup-wise features, which alternate.
+    groups = [
+        (is_marks, list(gp_feats)) for is_marks, gp_feats in groupby(feats, is_mark)
+    ]
+
+    # NOTE: Tree-head MarkGroup is warned after all parse warnings, same as the Tree route.
+    head_mark_msg = None
+    if len(groups) > 0 and groups[0][0]:
+        split_into_ap_wises(groups[0][1])
+        texts = "".join(feat.string for feat in groups[0][1])
+        head_mark_msg = (
+            f"「{texts}」には音がありません。文頭に来れないため無視されます。"
+        )
+        groups = groups[1:]
+
+    vv_aps: list[AccentPhrase] = []
+    for i in range(0, len(groups), 2):
+        bg_aps = split_into_ap_wises(groups[i][1])
+        mg_feats = groups[i + 1][1] if i + 1 < len(groups) else None
+        is_tail_bg = i + 2 >= len(groups)
+        is_interrogative_bg = mg_feats is not None and any(
+            "？" in feat.string  # noqa: RUF001, because of Japanese.
+            for feat in mg_feats
+        )
+        tail_ap_index = len(bg_aps) - 1
+        for ap_index, ap_feats in enumerate(bg_aps):
+            is_tail_ap = ap_index == tail_ap_index
+            vv_aps.append(
+                _convert_feats_to_vv_ap(
+                    ap_feats,
+                    lookup_moras,
+                    # NOTE: VOICEVOX delete utterance tail pause.
+                    with_pau=is_tail_ap and not is_tail_bg,
+                    interrogative=is_tail_ap and is_interrogative_bg,
+                )
+            )
+        if mg_feats is not None:
+            # NOTE: MarkGroup is parsed only for warnings.
+            split_into_ap_wises(mg_feats)
+
+    if head_mark_msg is not None:
+        report("head_mark_group", head_mark_msg, stacklevel=2)
+    return vv_aps
@@ -0,0 +1,229 @@
+"""VOICEVOX JSON serializer."""
+
+import json
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Final, TypeGuard, cast
+
+from speechtree.tree import Tree
+from speechtree.voicevox.converter import (
+    MoraKey,
+    iter_vv_aps,
+    lookup_vv_mora_fields,
+    remove_head_mark_group,
+    to_mora_key,
+)
+from speechtree.voicevox.domain import AccentPhrase, Mora
+
+# NOTE:
+#   VOICEVOX ENGINE uses snake_case for `AccentPhrase`/`Mora` fields and camelCase for `AudioQuery` synthesis parameters.
+#   Outputs are byte-identical to `json.dumps(..., ensure_ascii=False, separators=(",", ":"))` of `dataclasses.asdict()` route.
+#   ref: https://github.com/VOICEVOX/voicevox_engine/blob/master/voicevox_engine/model.py
+
+# NOTE: All fields of `Mora`, in the order of `Mora` fields.
+type _MoraFields = tuple[str, str | None, float | None, str, float, float]
+# NOTE: Lengths and pitches of engine-filled or edited moras are arbitrary floats, so the cache is bounded.
+DEFAULT_VV_MORA_JSON_CACHE_SIZE: Final = 4096
+
+
+@dataclass(frozen=True)
+class AudioQuerySettings:
+    """Synthesis parameters of VOICEVOX `AudioQuery`, defaults are same as VOICEVOX ENGINE's."""
+
+    speed_scale: float = 1.0
+    pitch_scale: float = 0.0
+    intonation_scale: float = 1.0
+    volume_scale: float = 1.0
+    pre_phoneme_length: float = 0.1
+    post_phoneme_length: float = 0.1
+    pause_length: float | None = None
+    pause_length_scale: float = 1.0
+    output_sampling_rate: int = 24000
+    output_stereo: bool = False
+    kana: str | None = None
+
+
+def _dumps_value(value: object) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode()
+
+
+def _dumps_number(value: float | None) -> bytes:
+    """Serialize a number as same as `json.dumps()`, which uses `repr()` for finite numbers."""
+    if value is None:
+        return b"null"
+    if math.isfinite(value):
+        return repr(value).encode()
+    return _dumps_value(value)
+
+
+def _dumps_mora(fields: _MoraFields) -> bytes:
+    """Serialize mora fields into a JSON object."""
+    text, consonant, consonant_length, vowel, vowel_length, pitch = fields
+    return b"".join(
+        (
+            b'{"text":',
+            _dumps_value(text),
+            b',"consonant":',
+            _dumps_value(consonant),
+            b',"consonant_length":',
+            _dumps_number(consonant_length),
+            b',"vowel":',
+            _dumps_value(vowel),
+            b',"vowel_length":',
+            _dumps_number(vowel_length),
+            b',"pitch":',
+            _dumps_number(pitch),
+            b"}",
+        )
+    )
+
+
+# NOTE: Same as `gen_pau_mora()` of the converter.
+_PAU_MORA_JSON = _dumps_mora(("、", None, None, "pau", 0.0, 0.0))
+
+
+_lookup_vv_mora_json = lru_cache(maxsize=DEFAULT_VV_MORA_JSON_CACHE_SIZE)(_dumps_mora)
+
+
+def _dumps_tree_mora(key: MoraKey) -> bytes:
+    """Serialize a tree mora keyed like the converter's mora cache, whose pitch is 0."""
+    return _dumps_mora((*lookup_vv_mora_fields(key), 0.0))
+
+
+# NOTE: Keys include mora pronunciations, which are arbitrary texts in edited trees, so the cache is bounded.
+_lookup_tree_mora_json = lru_cache(maxsize=DEFAULT_VV_MORA_JSON_CACHE_SIZE)(
+    _dumps_tree_mora
+)
+
+
+def _dumps_vv_mora(mora: Mora) -> bytes:
+    """Serialize a VOICEVOX mora with fragment cache."""
+    return _lookup_vv_mora_json(
+        (
+            mora.text,
+            mora.consonant,
+            mora.consonant_length,
+            mora.vowel,
+            mora.vowel_length,
+            mora.pitch,
+        )
+    )
+
+
+def _dumps_ap(
+    moras: list[bytes], accent: int, pause_mora: bytes | None, *, interrogative: bool
+) -> bytes:
+    """Serialize an accent phrase from serialized moras."""
+    return b"".join(
+        (
+            b'{"moras":[',
+            b",".join(moras),
+            b'],"accent":',
+            str(accent).encode(),
+            b',"pause_mora":',
+            b"null" if pause_mora is None else pause_mora,
+            b',"is_interrogative":',
+            b"true" if interrogative else b"false",
+            b"}",
+        )
+    )
+
+
+def _dumps_tree_aps(tree: Tree) -> bytes:
+    """Serialize the tree as VOICEVOX accent phrases, without intermediate dataclasses."""
+    ap_jsons: list[bytes] = []
+    for ap, with_pau, interrogative in iter_vv_aps(tree):
+        mora_jsons: list[bytes] = []
+        accent = 0
+        for word in ap["words"]:
+            for mora in word["moras"]:
+                mora_jsons.append(_lookup_tree_mora_json(to_mora_key(mora)))
+                # NOTE: Same as `extract_accent_position()`, index of the last high-tone mora plus one.
+                if mora["tone_high"]:
+                    accent = len(mora_jsons)
+        ap_jsons.append(
+            _dumps_ap(
+                mora_jsons,
+                accent,
+                _PAU_MORA_JSON if with_pau else None,
+                interrogative=interrogative,
+            )
+        )
+    return b"[" + b",".join(ap_jsons) + b"]"
+
+
+def _dumps_vv_aps(vv_aps: list[AccentPhrase]) -> bytes:
+    """Serialize VOICEVOX accent phrases."""
+    ap_jsons = [
+        _dumps_ap(
+            [_dumps_vv_mora(mora) for mora in ap.moras],
+            ap.accent,
+            None if ap.pause_mora is None else _dumps_vv_mora(ap.pause_mora),
+            interrogative=ap.is_interrogative,
+        )
+        for ap in vv_aps
+    ]
+    return b"[" + b",".join(ap_jsons) + b"]"
+
+
+def _is_vv_aps(src: Tree | list[AccentPhrase]) -> TypeGuard[list[AccentPhrase]]:
+    """Whether the non-empty source is VOICEVOX accent phrases or not."""
+    return isinstance(src[0], AccentPhrase)
+
+
+def dumps_accent_phrases(src: Tree | list[AccentPhrase]) -> bytes:
+    """
+    ツリーまたは VOICEVOX アクセント句列を、VOICEVOX ENGINE の `accent_phrases` JSON バイト列へ直接シリアライズする。
+
+    ツリーからは中間のデータクラスを経由せず、モーラ単位でキャッシュされた JSON 断片を連結する。
+    """
+    if len(src) == 0:
+        return b"[]"
+    if _is_vv_aps(src):
+        return _dumps_vv_aps(src)
+    # NOTE: `TypeGuard` narrows only the positive branch, and `TypeIs` needs Python 3.13.
+    return _dumps_tree_aps(remove_head_mark_group(cast("Tree", src)))
+
+
+def dumps_audio_query(
+    src: Tree | list[AccentPhrase], settings: AudioQuerySettings | None = None
+) -> bytes:
+    """ツリーまたは VOICEVOX アクセント句列を、VOICEVOX ENGINE の `AudioQuery` JSON バイト列へ直接シリアライズする。"""
+    return wrap_as_audio_query(dumps_accent_phrases(src), settings)
+
+
+def wrap_as_audio_query(
+    accent_phrases_json: bytes, settings: AudioQuerySettings | None
+) -> bytes:
+    """Wrap serialized accent phrases into an `AudioQuery` JSON."""
+    s = settings or AudioQuerySettings()
+    return b"".join(
+        (
+            b'{"accent_phrases":',
+            accent_phrases_json,
+            b',"speedScale":',
+            _dumps_value(s.speed_scale),
+            b',"pitchScale":',
+            _dumps_value(s.pitch_scale),
+            b',"intonationScale":',
+            _dumps_value(s.intonation_scale),
+            b',"volumeScale":',
+            _dumps_value(s.volume_scale),
+            b',"prePhonemeLength":',
+            _dumps_value(s.pre_phoneme_length),
+            b',"postPhonemeLength":',
+            _dumps_value(s.post_phoneme_length),
+            b',"pauseLength":',
+            _dumps_value(s.pause_length),
+            b',"pauseLengthScale":',
+            _dumps_value(s.pause_length_scale),
+            b',"outputSamplingRate":',
+            _dumps_value(s.output_sampling_rate),
+            b',"outputStereo":',
+            _dumps_value(s.output_stereo),
+            b',"kana":',
+            _dumps_value(s.kana),
+            b"}",
+        )
+    )
@@ -0,0 +1,79 @@
+"""Test SpeechTree binary format."""
+
+import io
+
+import pytest
+
+from speechtree.binary import (
+    PLACEHOLDER_RECORD,
+    dump,
+    dumps,
+    dumps_record,
+    iter_load,
+    load,
+    loads,
+)
+from speechtree.ojt.parser import parse_ojt_as_tree
+from tests.utils import gen_ft
+
+# fmt: off
+_TREE = parse_ojt_as_tree([
+    #      string       pron:        acc chain_flag
+    gen_ft("、",        "、",          0, chain_flag=0),
+    gen_ft("こんにちは", "コンニチワ",  0, chain_flag=0),
+    gen_ft("、",        "、",          0, chain_flag=0),
+    gen_ft("今日は",    "キョーワ",     1, chain_flag=0),
+    gen_ft("暖かい",    "アタタカイ",   4, chain_flag=0),
+    gen_ft("です",      "デス’",       0, chain_flag=1),
+    gen_ft("？",        "？",          0, chain_flag=0),
+])
+# fmt: on
+
+
+def test_dumps_loads() -> None:
+    """`loads()` restores the tree serialized by `dumps()`, group by group."""
+    # Outputs
+    lazy_tree = loads(dumps(_TREE))
+    # Tests
+    assert len(lazy_tree) == len(_TREE)
+    assert lazy_tree[3] == _TREE[3]
+    assert lazy_tree[-1] == _TREE[-1]
+    assert lazy_tree.to_tree() == _TREE
+
+
+def test_dump_load() -> None:
+    """`load()` restores the tree serialized by `dump()`."""
+    # Inputs
+    fp = io.BytesIO()
+    # Outputs
+    dump(_TREE, fp)
+    fp.seek(0)
+    tree = load(fp).to_tree()
+    # Tests
+    assert tree == _TREE
+
+
+def test_loads_invalid() -> None:
+    """`loads()` rejects non-SpeechTree binary and truncated binary."""
+    # Inputs
+    data = dumps(_TREE)
+    # Tests
+    with pytest.raises(ValueError, match="バイナリ形式ではありません"):
+        loads(b"JSON" + data[4:])
+    with pytest.raises(ValueError, match="途切れています"):
+        loads(data[:-1])
+
+
+def test_record_stream() -> None:
+    """`iter_load()` restores trees of concatenated records and None of placeholders, and rejects a truncated record."""
+    # Inputs
+    stream = dumps_record(_TREE) + PLACEHOLDER_RECORD + dumps_record(_TREE[1:2])
+    # Outputs
+    trees = [
+        None if lazy_tree is None else lazy_tree.to_tree()
+        for lazy_tree in iter_load(io.BytesIO(stream))
+    ]
+    # Tests
+    assert trees == [_TREE, None, _TREE[1:2]]
+    with pytest.raises(ValueError, match="途切れています"):
+        list(iter_load(io.BytesIO(stream[:-1])))
@@ -0,0 +1,119 @@
+"""Test persistent tree cache."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from speechtree.binary import LazyTree
+from speechtree.cache import TreeCache, cache_key
+from speechtree.diagnostics import Diagnostic, collect_diagnostics
+from speechtree.e2e import (
+    ojt_raw_features_to_tree,
+    ojt_raw_features_to_vv_accent_phrases,
+)
+from tests.utils import gen_raw_feature
+
+_RAW_A = [gen_raw_feature("今日", "キョー", 1), gen_raw_feature("、", "、", 0)]
+_RAW_B = [gen_raw_feature("明日", "アシタ", 3)]
+_RAW_C = [gen_raw_feature("雨", "アメ", 1)]
+_RAW_WARNED = [gen_raw_feature("ーあ", "ーア", 1)]
+
+
+def test_cache_key() -> None:
+    """Keys are stable against dict key order and distinguish contents."""
+    reordered = [dict(reversed(feat.items())) for feat in _RAW_A]
+    assert cache_key(reordered) == cache_key(_RAW_A)
+    assert cache_key([{**feat, "extra": 0} for feat in _RAW_A]) == cache_key(_RAW_A)
+    assert cache_key(_RAW_B) != cache_key(_RAW_A)
+
+
+def test_cache_hit_miss(tmp_path: Path) -> None:
+    """Cached trees are lazily decoded into parsed trees and persist across instances."""
+    with TreeCache(tmp_path / "cache.sqlite") as cache:
+        tree = ojt_raw_features_to_tree(_RAW_A, cache=cache)
+        cached_tree = ojt_raw_features_to_tree(_RAW_A, cache=cache)
+        assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+        assert isinstance(cached_tree, LazyTree)
+        assert tree == cached_tree.to_tree() == list(cached_tree)
+        assert tree == ojt_raw_features_to_tree(_RAW_A)
+    with TreeCache(tmp_path / "cache.sqlite") as cache:
+        vv_aps = ojt_raw_features_to_vv_accent_phrases(_RAW_A, cache=cache)
+        assert cache.stats.hits == 1
+        assert vv_aps == ojt_raw_features_to_vv_accent_phrases(_RAW_A)
+
+
+def test_cache_lru_eviction(tmp_path: Path) -> None:
+    """Least recently used entries are evicted over the size limit."""
+    with TreeCache(tmp_path / "cache.sqlite") as cache:
+        for raw in (_RAW_A, _RAW_B, _RAW_C):
+            cache.put(raw, ojt_raw_features_to_tree(raw))
+        # Touch A so that B is the least recently used, then limit the size to drop one entry.
+        cache.get(_RAW_A)
+        cache.max_bytes = cache.total_size - 1
+        cache.put(_RAW_C, ojt_raw_features_to_tree(_RAW_C))
+        # Tests
+        assert cache.stats.evictions == 1
+        assert cache.get(_RAW_B) is None
+        assert cache.get(_RAW_A) is not None
+        assert cache.total_size <= cache.max_bytes
+
+
+def test_cache_too_large_entry(tmp_path: Path) -> None:
+    """Trees larger than the size limit are not stored."""
+    with TreeCache(tmp_path / "cache.sqlite", max_bytes=1) as cache:
+        cache.put(_RAW_A, ojt_raw_features_to_tree(_RAW_A))
+        assert len(cache) == 0
+
+
+def test_cache_malformed_features(tmp_path: Path) -> None:
+    """Malformed features bypass the cache and are rejected by the parser."""
+    with (
+        TreeCache(tmp_path / "cache.sqlite") as cache,
+        pytest.raises(ValidationError),
+    ):
+        ojt_raw_features_to_tree([{"string": "あ"}], cache=cache)
+
+
+def test_cache_iterator_features(tmp_path: Path) -> None:
+    """Iterators of features are read once, and cached as same as lists."""
+    with TreeCache(tmp_path / "cache.sqlite") as cache:
+        tree = ojt_raw_features_to_tree(iter(_RAW_A), cache=cache)
+        assert tree == ojt_raw_features_to_tree(_RAW_A)
+        assert list(ojt_raw_features_to_tree(_RAW_A, cache=cache)) == tree
+        assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+
+
+def test_cache_hit_read_only(tmp_path: Path) -> None:
+    """Hits do not write, access times are written on close."""
+    path = tmp_path / "cache.sqlite"
+
+    def read_last_access() -> list[int]:
+        with sqlite3.connect(path) as db:
+            return [
+                row[0]
+                for row in db.execute("SELECT last_access FROM entries ORDER BY key")
+            ]
+
+    with TreeCache(path) as cache:
+        cache.put(_RAW_A, ojt_raw_features_to_tree(_RAW_A))
+        last_access = read_last_access()
+        assert cache.get(_RAW_A) is not None
+        assert read_last_access() == last_access
+    assert read_last_access() != last_access
+
+
+def test_cache_hit_diagnostics(tmp_path: Path) -> None:
+    """Diagnostics of the original parse are reported again on hits."""
+    with TreeCache(tmp_path / "cache.sqlite") as cache:
+        with collect_diagnostics() as parsed:
+            ojt_raw_features_to_tree(_RAW_WARNED, cache=cache)
+        with collect_diagnostics() as hit:
+            ojt_raw_features_to_tree(_RAW_WARNED, cache=cache)
+        with collect_diagnostics() as got:
+            cache.get(_RAW_WARNED)
+        # Tests
+        assert [diag.code for diag in parsed] == ["head_prolonged_sound"]
+        assert hit == got == parsed
+        assert all(isinstance(diag, Diagnostic) for diag in hit)
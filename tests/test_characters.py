@@ -0,0 +1,126 @@
+"""Test characters."""
+
+import copy
+import pickle
+
+import pytest
+
+from speechtree.characters import (
+    get_phoneme,
+    is_tone_high,
+    parse_kana_as_tree,
+    parse_kana_as_word,
+)
+from speechtree.ojt.parser import parse_ojt_as_tree
+from speechtree.tree import Mora, Phoneme, Tree
+from tests.utils import gen_ft
+
+
+def test_get_phoneme_interned() -> None:
+    """`get_phoneme()` returns a shared immutable phoneme, whose copies are mutable."""
+    # Inputs
+    symbol, unvoicing = "a", True
+    # Expects
+    true_phoneme = Phoneme(symbol="a", unvoicing=True)
+    # Outputs
+    phoneme = get_phoneme(symbol, unvoicing=unvoicing)
+    copied_phoneme = copy.deepcopy(phoneme)
+    copied_phoneme["unvoicing"] = False
+    # Tests
+    assert phoneme == true_phoneme
+    assert phoneme is get_phoneme(symbol, unvoicing=unvoicing)
+    assert pickle.loads(pickle.dumps(phoneme)) is phoneme  # noqa: S301, because the data is made in the test.
+    with pytest.raises(TypeError):
+        phoneme["unvoicing"] = False
+    assert phoneme == true_phoneme
+
+
+def _to_ap_moras(utterance: Tree) -> list[tuple[str, list[list[Mora]]]]:
+    """Flatten words, which differ between the kana and Open JTalk trees."""
+    return [
+        (
+            gp["type"],
+            [
+                [mr for wd in ap["words"] for mr in wd["moras"]]
+                for ap in gp["accent_phrases"]
+            ],
+        )
+        for gp in utterance
+    ]
+
+
+@pytest.mark.parametrize(
+    ("acc_pos", "tones"),
+    [(1, "HLLL"), (2, "LHLL"), (3, "LHHL"), (4, "LHHH")],
+)
+def test_is_tone_high(acc_pos: int, tones: str) -> None:
+    """Tones of a 4-mora accent phrase follow 東京式アクセント rule, where flat is the mora count."""
+    assert "".join("H" if is_tone_high(i, acc_pos) else "L" for i in range(4)) == tones
+
+
+def test_parse_kana_as_tree() -> None:
+    """Kana notation gives the same moras and phrasing as the equivalent Open JTalk features."""
+    # Inputs
+    kana = "コンニチワ'、キョ'ーワ/アタタカ'イデ_スネ？"
+    feats = [
+        gen_ft("こんにちは", "コンニチワ", 0, chain_flag=0),
+        gen_ft("、", "、", 0, chain_flag=0),
+        gen_ft("今日", "キョー", 1, chain_flag=0),
+        gen_ft("は", "ワ", 0, chain_flag=1),
+        gen_ft("暖かい", "アタタカイ", 4, chain_flag=0),
+        gen_ft("です", "デス’", 1, chain_flag=1),
+        gen_ft("ね", "ネ", 0, chain_flag=1),
+        gen_ft("？", "？", 0, chain_flag=0),
+    ]
+    # Expects
+    true_tree = parse_ojt_as_tree(feats)
+    # Outputs
+    tree = parse_kana_as_tree(kana)
+    # Tests
+    assert _to_ap_moras(tree) == _to_ap_moras(true_tree)
+    assert [wd["text"] for gp in tree for ap in gp["accent_phrases"] for wd in ap["words"]] == [
+        "コンニチワ", "、", "キョーワ", "アタタカイデスネ", "？",
+    ]  # fmt: skip
+
+
+def test_parse_kana_as_tree_marks() -> None:
+    """Interrogative and pause marks are merged into a mark group, and `/` after a mark starts a new breath group."""
+    tree = parse_kana_as_tree("ア'？、イ'？/ウ'")
+    assert [(gp["type"], len(gp["accent_phrases"])) for gp in tree] == [
+        ("BreathGroup", 1), ("MarkGroup", 2), ("BreathGroup", 1), ("MarkGroup", 1), ("BreathGroup", 1),
+    ]  # fmt: skip
+    assert parse_kana_as_tree("") == []
+
+
+def test_parse_kana_as_word() -> None:
+    """Tones follow the accent position, and unvoiced moras have unvoiced vowels."""
+    word = parse_kana_as_word("_シャ'ーン")
+    assert [mr["tone_high"] for mr in word["moras"]] == [True, False, False]
+    assert [[pn["symbol"] for pn in mr["phonemes"]] for mr in word["moras"]] == [
+        ["sh", "a"],
+        ["a"],
+        ["N"],
+    ]
+    assert word["moras"][0]["phonemes"][-1]["unvoicing"]
+    # NOTE: Cached templates are not shared as mutable moras.
+    word["moras"][0]["tone_high"] = False
+    assert parse_kana_as_word("_シャ'ーン")["moras"][0]["tone_high"]
+
+
+@pytest.mark.parametrize(
+    ("phrase", "reason"),
+    [
+        ("コンニチワ", "アクセント記号がありません"),
+        ("'ア", "アクセント記号"),
+        ("ア''", "アクセント記号"),
+        ("ー'ア", "長音"),
+        ("ア'__イ", "無声化記号が連続"),
+        ("ア'_", "無声化記号の後"),
+        ("アX'", "モーラへ分割できません"),
+        ("ア'？", "モーラへ分割できません"),
+    ],
+)
+def test_parse_kana_as_word_invalid(phrase: str, reason: str) -> None:
+    """Invalid notation is rejected with the reason."""
+    with pytest.raises(ValueError, match=reason):
+        parse_kana_as_word(phrase)
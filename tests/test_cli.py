@@ -0,0 +1,94 @@
+"""Test the batch converter command."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from speechtree.binary import iter_load
+from speechtree.cli import main
+from speechtree.e2e import ojt_raw_features_to_tree
+from tests.utils import gen_raw_feature
+
+_WORDS = [("今日", "キョー", 1), ("明日", "アシタ", 3), ("雨", "アメ", 1)]
+_RAWS = [
+    [gen_raw_feature(*_WORDS[i % 3]), gen_raw_feature("、", "、", 0)] for i in range(10)
+]
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    path = tmp_path / "corpus.jsonl"
+    path.write_text(
+        "".join(json.dumps(raw, ensure_ascii=False) + "\n" for raw in _RAWS),
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_tree(corpus: Path, tmp_path: Path, jobs: str) -> None:
+    """Trees are written in input order, with or without worker processes."""
+    output = tmp_path / "out.jsonl"
+    assert main([str(corpus), str(output), "-j", jobs, "--chunk-size", "3"]) == 0
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        json.loads(json.dumps(ojt_raw_features_to_tree(raw))) for raw in _RAWS
+    ]
+    assert not (tmp_path / "out.jsonl.ckpt").exists()
+
+
+def test_cli_binary(tmp_path: Path) -> None:
+    """Binary output is a record stream of trees, with placeholder records of blank lines."""
+    corpus = tmp_path / "corpus.jsonl"
+    raw = json.dumps(_RAWS[0], ensure_ascii=False)
+    corpus.write_text(f"{raw}\n\n{raw}\n", encoding="utf-8")
+    output = tmp_path / "out.bin"
+    assert main([str(corpus), str(output), "--format", "binary", "-j", "1"]) == 0
+    with output.open("rb") as f:
+        trees = [
+            None if lazy_tree is None else lazy_tree.to_tree()
+            for lazy_tree in iter_load(f)
+        ]
+    tree = ojt_raw_features_to_tree(_RAWS[0])
+    assert trees == [tree, None, tree]
+
+
+def test_cli_resume(corpus: Path, tmp_path: Path) -> None:
+    """A resumed job discards the output after the checkpoint and completes the same output."""
+    options = ["--format", "voicevox", "-j", "1", "--chunk-size", "4"]
+    full = tmp_path / "full.jsonl"
+    assert main([str(corpus), str(full), *options]) == 0
+    full_lines = full.read_bytes().splitlines(keepends=True)
+
+    # Simulate a job killed after the first chunk, during writing of the second chunk.
+    killed = tmp_path / "killed.jsonl"
+    killed.write_bytes(b"".join(full_lines[:4]) + b'[{"moras":')
+    checkpoint = {
+        "output_format": "voicevox",
+        "n_line": 4,
+        "output_size": len(b"".join(full_lines[:4])),
+    }
+    (tmp_path / "killed.jsonl.ckpt").write_text(
+        json.dumps(checkpoint), encoding="utf-8"
+    )
+
+    assert main([str(corpus), str(killed), *options, "--resume"]) == 0
+    assert killed.read_bytes() == full.read_bytes()
+
+
+def test_cli_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Malformed lines stop the job by default, and are replaced with `null` lines with `--skip-errors`."""
+    corpus = tmp_path / "corpus.jsonl"
+    raw = json.dumps(_RAWS[0], ensure_ascii=False)
+    corpus.write_text(f"{raw}\n[{{}}]\n{raw}\n", encoding="utf-8")
+    output = tmp_path / "out.jsonl"
+
+    assert main([str(corpus), str(output), "-j", "1", "--chunk-size", "1"]) == 1
+    assert "2 行目" in capsys.readouterr().err
+    assert output.read_text(encoding="utf-8").count("\n") == 1
+
+    assert main([str(corpus), str(output), "-j", "1", "--skip-errors"]) == 0
+    assert "2 行目" in capsys.readouterr().err
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) is None for line in lines] == [False, True, False]
@@ -0,0 +1,104 @@
+"""Test phoneme-ID encoding."""
+
+from array import array
+from collections.abc import Buffer
+
+import pytest
+
+from speechtree.encoding import (
+    PAD_ID,
+    PHONEME_IDS,
+    encode_batch,
+    encode_tree,
+    encode_tree_into,
+)
+from speechtree.gardener import extract_phonemes
+from speechtree.ojt.parser import parse_ojt_as_tree
+from tests.utils import gen_ft
+
+# fmt: off
+_TREE = parse_ojt_as_tree([
+    #      string       pron:        acc chain_flag
+    gen_ft("今日は",    "キョーワ",     1, chain_flag=0),
+    gen_ft("、",        "、",          0, chain_flag=0),
+    gen_ft("です",      "デス’",       0, chain_flag=0),
+])
+# fmt: on
+
+
+def test_encode_tree() -> None:
+    """`encode_tree()` encodes phonemes, unvoicing, tone and boundaries."""
+    # Expects
+    symbols = ["ky", "o", "o", "w", "a", "pau", "d", "e", "s", "u"]
+    unvoicing_gt = [0, 0, 0, 0, 0, 0, 0, 0, 0, 1]
+    tone_gt = [1, 1, 0, 0, 0, 1, 0, 0, 1, 1]
+    mora_offsets_gt = [0, 2, 3, 5, 6, 8, 10]
+    ap_offsets_gt = [0, 3, 4, 6]
+    # Outputs
+    encoded = encode_tree(_TREE)
+    # Tests
+    assert encoded.phoneme_ids.tolist() == [PHONEME_IDS[s] for s in symbols]
+    assert encoded.unvoicing.tolist() == unvoicing_gt
+    assert encoded.tone_high.tolist() == tone_gt
+    assert encoded.mora_offsets.tolist() == mora_offsets_gt
+    assert encoded.ap_offsets.tolist() == ap_offsets_gt
+
+
+def test_encode_tree_distinguish_unvoicing() -> None:
+    """`encode_tree()` is consistent with `extract_phonemes()` about unvoicing."""
+    # Expects
+    symbols = extract_phonemes(_TREE, reduce_dup_pau=False, distinguish_unvoicing=True)
+    # Outputs
+    encoded = encode_tree(_TREE, distinguish_unvoicing=True)
+    # Tests
+    assert encoded.phoneme_ids.tolist() == [PHONEME_IDS[s] for s in symbols]
+    assert symbols[-1] == "U"
+
+
+def test_encode_tree_into_small_buffer() -> None:
+    """`encode_tree_into()` rejects too small buffers."""
+    buffers = (array("H", [0]) * 3, array("B", [0]) * 3, array("B", [0]) * 3)
+    with pytest.raises(ValueError, match="足りません"):
+        encode_tree_into(_TREE, *buffers)
+    buffers = (array("H", [0]) * 16, array("B", [0]) * 16, array("B", [0]) * 16)
+    with pytest.raises(ValueError, match="バッファ長 3 は必要な長さ 4 に足りません"):
+        encode_tree_into(_TREE, *buffers, ap_offsets=array("I", [0]) * 3)
+
+
+@pytest.mark.parametrize(
+    "buffer",
+    [memoryview(bytearray(16)).cast("?"), array("d", [0.0]) * 16],
+    ids=["bool", "float"],
+)
+def test_encode_tree_into_non_integer_buffer(buffer: Buffer) -> None:
+    """`encode_tree_into()` rejects non-integer buffers."""
+    buffers = (array("H", [0]) * 16, buffer, array("B", [0]) * 16)
+    with pytest.raises(ValueError, match="整数型ではありません"):
+        encode_tree_into(_TREE, *buffers)
+
+
+def test_encode_tree_into_numpy() -> None:
+    """`encode_tree_into()` writes into numpy arrays."""
+    np = pytest.importorskip("numpy")
+    # Inputs
+    ids, unvoicing, tone = (np.full(16, -1, dtype=np.int64) for _ in range(3))
+    # Outputs
+    sizes = encode_tree_into(_TREE, ids, unvoicing, tone)
+    # Tests
+    assert sizes.n_phoneme == 10  # noqa: PLR2004, because it is a ground truth.
+    assert ids[: sizes.n_phoneme].tolist() == encode_tree(_TREE).phoneme_ids.tolist()
+    assert ids[sizes.n_phoneme :].tolist() == [-1] * 6
+
+
+def test_encode_batch() -> None:
+    """`encode_batch()` pads encoded trees into a matrix."""
+    # Inputs
+    short_tree = _TREE[:1]
+    # Outputs
+    batch = encode_batch([_TREE, short_tree])
+    # Tests
+    assert batch.shape == (2, 10)
+    assert batch.lengths.tolist() == [10, 5]
+    assert batch.phoneme_ids[:10] == encode_tree(_TREE).phoneme_ids
+    assert batch.phoneme_ids[10:15] == encode_tree(short_tree).phoneme_ids
+    assert batch.phoneme_ids[15:].tolist() == [PAD_ID] * 5
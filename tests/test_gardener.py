@@ -1,7 +1,27 @@
 """Test garderner tools."""
 
-from speechtree.gardener import extract_accent_position
+import pytest
+
+from speechtree.gardener import (
+    extract_accent_position,
+    extract_accent_positions,
+    extract_all,
+    extract_phonemes,
+    extract_pronunciation,
+    extract_text,
+    insert_group,
+    merge_aps,
+    remove_group,
+    replace_word_moras,
+    retone_ap,
+    split_ap,
+    trim_head_tail_marks,
+    validate_tree,
+)
+from speechtree.ojt.parser import parse_ojt_as_tree
+from speechtree.packed import pack_tree
 from speechtree.tree import AccentPhrase, Mora, Phoneme, Word
+from tests.utils import gen_ft
 
 
 def test_extract_accent_position() -> None:
@@ -48,3 +68,123 @@ def test_extract_accent_position() -> None:
 
     # Tests
     assert accent == true_accent
+
+
+def test_extract_all() -> None:
+    """`extract_all()` extracts the same outputs as individual extractors."""
+    # Inputs
+    # fmt: off
+    tree = parse_ojt_as_tree([
+        #      string       pron:        acc chain_flag
+        gen_ft("こんにちは", "コンニチワ",  0, chain_flag=0),
+        gen_ft("、",        "、",          0, chain_flag=0),
+        gen_ft("今日は",    "キョーワ",     1, chain_flag=0),
+        gen_ft("です",      "デス’",       0, chain_flag=1),
+        gen_ft("？",        "？",          0, chain_flag=0),
+    ])
+    # fmt: on
+    # Outputs
+    extraction = extract_all(tree)
+    # Tests
+    assert extraction.text == extract_text(tree)
+    assert extraction.pronunciation == extract_pronunciation(tree)
+    assert extraction.phonemes == extract_phonemes(tree)
+    assert extraction.accent_positions == extract_accent_positions(tree)
+    assert extract_all(pack_tree(tree)) == extraction
+
+
+# fmt: off
+_FEATS = [
+    #      string       pron:        acc chain_flag
+    gen_ft("こんにちは", "コンニチワ",  0, chain_flag=0),
+    gen_ft("、",        "、",          0, chain_flag=0),
+    gen_ft("今日は",    "キョーワ",     1, chain_flag=0),
+    gen_ft("暖かい",    "アタタカイ",   4, chain_flag=0),
+    gen_ft("です",      "デス’",       0, chain_flag=1),
+    gen_ft("？",        "？",          0, chain_flag=0),
+]
+# fmt: on
+
+
+def test_extract_phonemes_unvoicing() -> None:
+    """Unvoiced vowels are distinguished only on request, lower case by default."""
+    tree = parse_ojt_as_tree([gen_ft("です", "デス’")])
+    assert extract_phonemes(tree) == ["d", "e", "s", "u"]
+    assert extract_phonemes(tree, distinguish_unvoicing=True) == ["d", "e", "s", "U"]
+
+
+def test_group_edits() -> None:
+    """Group removal and insertion keep BG/MG alternation, without mutating the input."""
+    # Inputs
+    tree = parse_ojt_as_tree(_FEATS)
+    snapshot = parse_ojt_as_tree(_FEATS)
+    # Outputs
+    removed = remove_group(tree, 1)
+    inserted_head = insert_group(removed, 0, tree[1])
+    inserted_merged = insert_group(removed, 1, tree[1])
+    # Tests
+    assert [gp["type"] for gp in removed] == ["BreathGroup", "MarkGroup"]
+    assert extract_text(removed) == "こんにちは今日は暖かいです？"
+    assert removed[-1] is tree[-1]
+    assert inserted_head[0] is tree[1]
+    assert inserted_head[1:] == removed
+    assert extract_text(inserted_merged) == "こんにちは今日は暖かいです、？"
+    assert len(inserted_merged) == len(removed)
+    assert remove_group(tree, -1) == tree[:-1]
+    assert tree == snapshot
+    for edited in (removed, inserted_head, inserted_merged):
+        validate_tree(edited)
+
+
+def test_ap_edits() -> None:
+    """Accent phrase merge/split and re-tone equal parsing of the edited features, with structural sharing."""
+    # Inputs
+    tree = parse_ojt_as_tree(_FEATS)
+    chained = parse_ojt_as_tree(
+        [*_FEATS[:3], gen_ft("暖かい", "アタタカイ", 4, chain_flag=1), *_FEATS[4:]]
+    )
+    # Outputs
+    merged = merge_aps(tree, 2, 0)
+    retoned = retone_ap(merged, 2, 0, 1)
+    split = split_ap(merged, 2, 0, 1)
+    # Tests
+    assert retoned == chained
+    assert split == tree
+    assert merged[0] is tree[0]
+    assert (
+        retoned[2]["accent_phrases"][0]["words"][0]
+        is tree[2]["accent_phrases"][0]["words"][0]
+    )
+    with pytest.raises(IndexError):
+        split_ap(tree, 2, 0, 0)
+
+
+def test_replace_word_moras() -> None:
+    """Word moras are replaced, keeping the text and sharing the other words."""
+    # Inputs
+    tree = parse_ojt_as_tree(_FEATS)
+    new_moras = parse_ojt_as_tree([gen_ft("x", "アツイ", 2, chain_flag=0)])[0][
+        "accent_phrases"
+    ][0]["words"][0]["moras"]
+    # Outputs
+    replaced = replace_word_moras(tree, 2, 1, 0, new_moras)
+    # Tests
+    assert replaced[2]["accent_phrases"][1]["words"][0] == {
+        "moras": new_moras,
+        "text": "暖かい",
+    }
+    assert (
+        replaced[2]["accent_phrases"][1]["words"][1]
+        is tree[2]["accent_phrases"][1]["words"][1]
+    )
+    assert replaced[2]["accent_phrases"][0] is tree[2]["accent_phrases"][0]
+
+
+def test_trim_and_validate() -> None:
+    """Trim accepts empty trees, and validation rejects broken alternation."""
+    tree = parse_ojt_as_tree(_FEATS)
+    assert trim_head_tail_marks([]) == []
+    assert trim_head_tail_marks(tree[1:2]) == []
+    assert trim_head_tail_marks(tree[1:]) == tree[2:-1]
+    with pytest.raises(ValueError, match="連続しています"):
+        validate_tree([tree[0], tree[2]])
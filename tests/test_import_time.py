@@ -0,0 +1,18 @@
+"""Test lazy imports for cold starts."""
+
+import subprocess
+import sys
+
+# NOTE: The import time budget is enforced by `benchmarks.bench_import` in the pre-push hook, because wall-clock budgets are flaky in tests.
+_LAZY_MODULES = ("pydantic", "sqlite3")
+
+
+def test_import_defers_heavy_dependencies() -> None:
+    """`import speechtree.e2e` defers heavy dependencies."""
+    # Outputs
+    code = f"import sys, speechtree.e2e; print(*(m for m in {_LAZY_MODULES} if m in sys.modules))"
+    result = subprocess.run(  # noqa: S603, because the command is fixed.
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    # Tests
+    assert result.stdout.strip() == ""
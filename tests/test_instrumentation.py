@@ -0,0 +1,95 @@
+"""Test stage-level instrumentation."""
+
+from speechtree.diagnostics import collect_diagnostics, suppress_diagnostics
+from speechtree.e2e import Pipeline, ojt_raw_features_to_vv_accent_phrases
+from speechtree.instrumentation import STAGES, current_metrics, instrument
+from speechtree.ojt.domain import OjtFeatureBatch
+from speechtree.ojt.loader import as_ojt_features
+from speechtree.ojt.parser import parse_ojt_as_tree
+from tests.utils import gen_raw_feature
+
+_RAW_FEATURES = [
+    gen_raw_feature("は", "ワ", 0, chain_flag=1),  # head chaining
+    gen_raw_feature("こんにちは", "コンニチワ", 0, chain_flag=0),
+    gen_raw_feature("、", "、", 0, chain_flag=0),
+    gen_raw_feature("今日", "キョー", 1, chain_flag=0),
+    gen_raw_feature("は", "ワ", 0, chain_flag=1),
+    gen_raw_feature("暖かい", "アタタカイ", 4, chain_flag=0),
+]
+
+
+def test_instrument() -> None:
+    """Each stage is recorded with item counts, diagnostics are counted regardless of the sink, and outputs are unchanged."""
+    # Expects
+    with suppress_diagnostics():
+        true_vv_aps = ojt_raw_features_to_vv_accent_phrases(_RAW_FEATURES)
+    # Outputs
+    with instrument() as metrics, suppress_diagnostics():
+        vv_aps = ojt_raw_features_to_vv_accent_phrases(_RAW_FEATURES)
+    # Tests
+    assert vv_aps == true_vv_aps
+    assert current_metrics() is None
+    assert metrics.items == {
+        "validation": 6,
+        "ap_chaining": 6,
+        "mora_splitting": 6,
+        "tone_assignment": 5,
+        "voicevox_conversion": len(vv_aps),
+    }
+    assert all(metrics.calls[stage] == 1 for stage in STAGES)
+    assert all(metrics.seconds[stage] >= 0 for stage in STAGES)
+    assert metrics.as_dict()["warnings"]["head_chaining"] == 1
+
+
+def test_instrumented_parse_equals_parse() -> None:
+    """Instrumented parse gives the same tree and diagnostics in the same order as the normal parse, for both rows and batches."""
+    # Inputs
+    # NOTE: A head prolonged sound in the first group, and a head chaining in the third group.
+    feats = as_ojt_features(
+        [
+            gen_raw_feature("ーあ", "ーア", 1, chain_flag=0),
+            *_RAW_FEATURES[1:3],
+            *_RAW_FEATURES,
+        ]
+    )
+    batch = OjtFeatureBatch.from_features(feats)
+    # Expects
+    with collect_diagnostics() as true_diagnostics:
+        true_tree = parse_ojt_as_tree(feats)
+    # Outputs
+    with instrument(), collect_diagnostics() as diagnostics:
+        tree = parse_ojt_as_tree(feats)
+    with instrument(), suppress_diagnostics():
+        batch_tree = parse_ojt_as_tree(batch)
+    # Tests
+    assert [diag.code for diag in true_diagnostics] == [
+        "head_prolonged_sound",
+        "head_chaining",
+    ]
+    assert diagnostics == true_diagnostics
+    assert tree == true_tree
+    assert batch_tree == true_tree
+
+
+def test_instrument_pipeline_and_accumulation() -> None:
+    """Pipeline records validation and VOICEVOX conversion, and a given metrics accumulates over contexts."""
+    pipeline = Pipeline()
+    with instrument() as metrics, suppress_diagnostics():
+        pipeline(_RAW_FEATURES)
+    with instrument(metrics), suppress_diagnostics():
+        pipeline(_RAW_FEATURES)
+    assert metrics.calls["validation"] == metrics.calls["voicevox_conversion"] == 2  # noqa: PLR2004, because of two calls.
+    assert metrics.calls["mora_splitting"] == 0
+
+
+def test_to_prometheus() -> None:
+    """Prometheus text has typed counters for every stage and diagnostic code."""
+    with instrument() as metrics, suppress_diagnostics():
+        ojt_raw_features_to_vv_accent_phrases(_RAW_FEATURES)
+    text = metrics.to_prometheus(prefix="tts")
+    lines = text.splitlines()
+    assert "# TYPE tts_stage_seconds_total counter" in lines
+    assert 'tts_stage_items_total{stage="validation"} 6' in lines
+    assert 'tts_warnings_total{code="head_chaining"} 1' in lines
+    assert 'tts_warnings_total{code="head_prolonged_sound"} 0' in lines
+    assert text.endswith("\n")
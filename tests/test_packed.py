@@ -0,0 +1,45 @@
+"""Test packed tree."""
+
+from speechtree.gardener import (
+    extract_accent_positions,
+    extract_phonemes,
+    extract_pronunciation,
+    extract_text,
+)
+from speechtree.ojt.parser import parse_ojt_as_tree
+from speechtree.packed import pack_tree, unpack_tree
+from tests.utils import gen_ft
+
+# fmt: off
+_TREE = parse_ojt_as_tree([
+    #      string       pron:        acc chain_flag
+    gen_ft("こんにちは", "コンニチワ",  0, chain_flag=0),
+    gen_ft("、",        "、",          0, chain_flag=0),
+    gen_ft("今日は",    "キョーワ",     1, chain_flag=0),
+    gen_ft("暖かい",    "アタタカイ",   4, chain_flag=0),
+    gen_ft("です",      "デス’",       0, chain_flag=1),
+    gen_ft("？",        "？",          0, chain_flag=0),
+])
+# fmt: on
+
+
+def test_pack_unpack_tree() -> None:
+    """`unpack_tree()` restores the tree packed by `pack_tree()`."""
+    # Outputs
+    tree = unpack_tree(pack_tree(_TREE))
+    # Tests
+    assert tree == _TREE
+
+
+def test_extract_from_packed_tree() -> None:
+    """Gardener extractors extract the same outputs from a packed tree."""
+    # Inputs
+    packed_tree = pack_tree(_TREE)
+    # Tests
+    assert extract_text(packed_tree) == extract_text(_TREE)
+    assert extract_pronunciation(packed_tree) == extract_pronunciation(_TREE)
+    assert extract_phonemes(packed_tree) == extract_phonemes(_TREE)
+    assert extract_phonemes(packed_tree, reduce_dup_pau=False) == extract_phonemes(
+        _TREE, reduce_dup_pau=False
+    )
+    assert extract_accent_positions(packed_tree) == extract_accent_positions(_TREE)
@@ -1,47 +1,178 @@
 """Test Open JTalk feature parser."""
 
-from speechtree.ojt.domain import OjtFeature
-from speechtree.ojt.parser import parse_ojt_as_tree
-
-
-def _gen_ft(
-    string: str = "text",
-    pron: str = "ハツオン",
-    acc: int = 0,
-    *,
-    chain_flag: bool = True,
-) -> OjtFeature:
-    return OjtFeature(
-        string=string,
-        pos="*",
-        pos_group1="*",
-        pos_group2="*",
-        pos_group3="*",
-        ctype="*",
-        cform="*",
-        orig="*",
-        read="*",
-        pron=pron,
-        acc=acc,
-        mora_size=3,
-        chain_rule="*",
-        chain_flag=chain_flag,
-    )
+from collections.abc import Iterator
+
+import pytest
+
+from speechtree.characters import MORA_MATCH_PATTERN
+from speechtree.ojt.domain import OjtFeature, OjtFeatureBatch
+from speechtree.ojt.parser import (
+    _split_pron_into_mora_prons,
+    clear_mora_cache,
+    configure_mora_cache,
+    get_mora_cache_info,
+    iter_ojt_as_groups,
+    parse_ojt_as_tree,
+    split_ap_ranges,
+)
+from speechtree.utils import CacheInfo
+from tests.utils import gen_ft
 
 
 def test_parse_ojt_features() -> None:
     # Inputs
     # fmt: off
     ojt_feats = [
-        #       string       pron:        acc chain_flag
-        _gen_ft("こんにちは", "コンニチワ",  2, chain_flag=False),
-        _gen_ft("、",        "、",          0, chain_flag=False),
-        _gen_ft("今日は",    "キョウワ",     1, chain_flag=False),
-        _gen_ft("暖かーい",  "アタタカーイ", 2,  chain_flag=True),
-        _gen_ft("です",      "デス’",       0,  chain_flag=True),
-        _gen_ft("？",        "？",          0, chain_flag=False),
+        #      string       pron:        acc chain_flag
+        gen_ft("こんにちは", "コンニチワ",  2, chain_flag=False),
+        gen_ft("、",        "、",          0, chain_flag=False),
+        gen_ft("今日は",    "キョウワ",     1, chain_flag=False),
+        gen_ft("暖かーい",  "アタタカーイ", 2, chain_flag=True),
+        gen_ft("です",      "デス’",       0, chain_flag=True),
+        gen_ft("？",        "？",          0, chain_flag=False),
     ]
     # fmt: on
 
     _ = parse_ojt_as_tree(ojt_feats)
     assert True
+
+
+def test_parse_ojt_features_batch() -> None:
+    """`parse_ojt_as_tree()` parses a columnar batch as same as row-wise features."""
+    # Inputs
+    # fmt: off
+    ojt_feats = [
+        #      string       pron:        acc chain_flag
+        gen_ft("、",        "、",          0, chain_flag=False),
+        gen_ft("こんにちは", "コンニチワ",  2, chain_flag=False),
+        gen_ft("、",        "、",          0, chain_flag=False),
+        gen_ft("今日は",    "キョウワ",     1, chain_flag=False),
+        gen_ft("暖かーい",  "アタタカーイ", 2, chain_flag=True),
+        gen_ft("です",      "デス’",       0, chain_flag=True),
+        gen_ft("？",        "？",          0, chain_flag=False),
+    ]
+    # fmt: on
+    # Expects
+    true_tree = parse_ojt_as_tree(ojt_feats)
+    # Outputs
+    tree = parse_ojt_as_tree(OjtFeatureBatch.from_features(ojt_feats))
+    # Tests
+    assert tree == true_tree
+
+
+def test_split_ap_ranges() -> None:
+    """Features are split at non-chaining features, and a chaining head is warned and ignored."""
+    # Inputs
+    #          n     c     c     n     c     n     n     c
+    chains = [False, True, True, False, True, False, False, True]
+    # Expects
+    true_ranges = [(1, 3), (3, 5), (5, 6), (6, 8)]
+    # Outputs
+    with pytest.warns(UserWarning, match="w1"):
+        ranges = split_ap_ranges(chains.__getitem__, lambda i: f"w{i}", 1, 8)
+    # Tests
+    assert ranges == true_ranges
+    assert split_ap_ranges(chains.__getitem__, lambda i: f"w{i}", 3, 3) == []
+
+
+def test_iter_ojt_as_groups() -> None:
+    """`iter_ojt_as_groups()` yields a group as soon as its boundary is known."""
+    # Inputs
+    # fmt: off
+    ojt_feats = [
+        #      string       pron:        acc chain_flag
+        gen_ft("こんにちは", "コンニチワ",  2, chain_flag=False),
+        gen_ft("、",        "、",          0, chain_flag=False),
+        gen_ft("今日は",    "キョウワ",     1, chain_flag=False),
+        gen_ft("です",      "デス’",       0, chain_flag=True),
+        gen_ft("？",        "？",          0, chain_flag=False),
+    ]
+    # fmt: on
+    n_consumed = 0
+
+    def stream() -> Iterator[OjtFeature]:
+        nonlocal n_consumed
+        for feat in ojt_feats:
+            n_consumed += 1
+            yield feat
+
+    # Expects
+    true_tree = parse_ojt_as_tree(ojt_feats)
+    # Outputs
+    groups = iter_ojt_as_groups(stream())
+    head_group = next(groups)
+    n_consumed_at_head = n_consumed
+    tree = [head_group, *groups]
+    # Tests
+    assert n_consumed_at_head == 2  # noqa: PLR2004, because the head BG ends at the 2nd feature.
+    assert tree == true_tree
+
+
+def _split_by_pattern(pron: str) -> list[tuple[str, bool]]:
+    """Split pronunciation by the regex pattern, as a reference."""
+    mora_prons: list[tuple[str, bool]] = []
+    while len(pron):
+        match = MORA_MATCH_PATTERN.match(pron)
+        if match is None:
+            msg = "not match"
+            raise RuntimeError(msg)
+        mora_pron = match[0]
+        if mora_pron[-1] == "’":
+            mora_prons.append((mora_pron[:-1], True))
+        else:
+            mora_prons.append((mora_pron, False))
+        pron = pron[match.end() :]
+    return mora_prons
+
+
+@pytest.mark.parametrize(
+    "pron",
+    [
+        "ギョウザ",
+        "デス’",
+        "キャ’キ’ャ",
+        "ウィウ’ィウィ’",
+        "アタタカーイ",
+        "ー’",
+        "コンニチワ、ゲンキ？",
+        "ヴァヴ’ァヴヴャ",
+        "クヮクァ",
+        "",
+    ],
+)
+def test_split_pron_into_mora_prons(pron: str) -> None:
+    """`_split_pron_into_mora_prons()` splits pronunciation as same as regex matching."""
+    # Expects & Outputs & Tests
+    try:
+        true_mora_prons = _split_by_pattern(pron)
+    except RuntimeError:
+        with pytest.raises(RuntimeError):
+            _split_pron_into_mora_prons(pron)
+    else:
+        assert _split_pron_into_mora_prons(pron) == true_mora_prons
+
+
+def test_mora_cache() -> None:
+    """Pronunciation-to-moras cache keeps per-occurrence tone and counts hits."""
+    # Inputs
+    # fmt: off
+    ojt_feats = [
+        #      string pron:  acc chain_flag
+        gen_ft("雨",  "アメ",  1, chain_flag=False),
+        gen_ft("飴",  "アメ",  0, chain_flag=False),
+    ]
+    # fmt: on
+    # Expects
+    configure_mora_cache(0)
+    true_tree = parse_ojt_as_tree(ojt_feats)
+    configure_mora_cache()
+    # Outputs
+    tree = parse_ojt_as_tree(ojt_feats)
+    cache_info = get_mora_cache_info()
+    clear_mora_cache()
+    cleared_cache_info = get_mora_cache_info()
+    # Tests
+    assert tree == true_tree
+    assert (cache_info.hits, cache_info.misses) == (1, 1)
+    assert isinstance(cache_info, CacheInfo)
+    assert cleared_cache_info.currsize == 0
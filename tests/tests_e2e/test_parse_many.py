@@ -0,0 +1,74 @@
+"""Test error-isolating batch parse."""
+
+import warnings
+
+import pytest
+
+from speechtree.characters import MORA_PRONUNCIATION
+from speechtree.diagnostics import collect_diagnostics
+from speechtree.e2e import ojt_raw_features_to_tree, parse_many
+from speechtree.ojt import parser
+from speechtree.ojt.parser import configure_mora_cache
+from tests.utils import gen_raw_feature
+
+_GOOD = [gen_raw_feature("今日", "キョー", 1)]
+_HEAD_CHAINING = [gen_raw_feature("は", "ワ", 1, chain_flag=1)]
+_BAD_PRON = [gen_raw_feature("今日", "キョー", 1), gen_raw_feature("X", "キX", 1)]
+_INVALID = [gen_raw_feature("今日", "キョー", 1), {"string": "X"}]
+
+
+def test_parse_many() -> None:
+    """Errors are isolated per item with positions, and diagnostics are collected without warnings."""
+    # Outputs
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        results = parse_many([_GOOD, _BAD_PRON, _HEAD_CHAINING, _INVALID])
+    # Tests
+    good, bad_pron, head_chaining, invalid = results
+    assert good.tree == ojt_raw_features_to_tree(_GOOD)
+    assert (good.error, good.diagnostics) == (None, ())
+
+    assert bad_pron.tree is None
+    assert bad_pron.error is not None
+    assert bad_pron.error.item_index == 1
+    assert (bad_pron.error.feature_index, bad_pron.error.position) == (1, 1)
+    assert bad_pron.error.error_type == "PronunciationError"
+
+    assert head_chaining.error is None
+    assert [diag.code for diag in head_chaining.diagnostics] == ["head_chaining"]
+
+    assert invalid.error is not None
+    assert invalid.error.feature_index == 1
+    assert invalid.error.error_type == "ValidationError"
+
+
+def test_parse_many_without_diagnostics() -> None:
+    """`diagnostics=False` discards diagnostics of the batch, without affecting an outer collector."""
+    with collect_diagnostics() as outer:
+        (result,) = parse_many([_HEAD_CHAINING], diagnostics=False)
+        expected = ojt_raw_features_to_tree(_HEAD_CHAINING)
+    assert result.tree == expected
+    assert result.diagnostics == ()
+    assert [diag.code for diag in outer] == ["head_chaining"]
+
+
+def test_parse_many_unknown_mora(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Errors of tokenized but unknown moras are located in the feature pronunciation."""
+    # Inputs
+    raw_features = [
+        gen_raw_feature("今日", "キョー", 1),
+        gen_raw_feature("秋田", "アキ’タ", 1),
+    ]
+    monkeypatch.setattr(
+        parser, "MORA_PRONUNCIATION", tuple(set(MORA_PRONUNCIATION) - {"タ"})
+    )
+    configure_mora_cache(0)
+    # Outputs
+    try:
+        (result,) = parse_many([raw_features])
+    finally:
+        configure_mora_cache()
+    # Tests
+    assert result.error is not None
+    assert (result.error.feature_index, result.error.position) == (1, 3)
+    assert result.error.error_type == "PronunciationError"
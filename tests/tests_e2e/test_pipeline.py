@@ -0,0 +1,50 @@
+"""Test fused raw-features-to-VOICEVOX pipeline."""
+
+import warnings
+
+import pyopenjtalk  # type: ignore # noqa: PGH003, because of external library's type missing
+import pytest
+
+from speechtree.e2e import Pipeline, ojt_raw_features_to_vv_accent_phrases
+from speechtree.utils import CacheInfo
+
+_TEXTS = [
+    "あぁ、どうもこんにちはです。おや？今日は綺麗な鞄をお持ちですね、SpeechTreeの ブランド品 ですかー。",
+    "、、はい？ そうですか！？ヴァイオリンをヲタクがヂヂイと弾く。",
+    "ーあ",
+]
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+@pytest.mark.parametrize("text", _TEXTS)
+def test_pipeline_equals_function(text: str, *, trusted: bool) -> None:
+    """`Pipeline` outputs the same accent phrases and warnings as `ojt_raw_features_to_vv_accent_phrases()`."""
+    # Inputs
+    raw_features = pyopenjtalk.run_frontend(text)
+    pipeline = Pipeline(trusted=trusted)
+    # Expects
+    with warnings.catch_warnings(record=True) as gt_warns:
+        warnings.simplefilter("always")
+        gt = ojt_raw_features_to_vv_accent_phrases(raw_features)
+    # Outputs
+    with warnings.catch_warnings(record=True) as pred_warns:
+        warnings.simplefilter("always")
+        pred = pipeline(raw_features)
+    # Tests
+    assert pred == gt
+    assert [str(w.message) for w in pred_warns] == [str(w.message) for w in gt_warns]
+
+
+def test_pipeline_cache() -> None:
+    """`Pipeline` reuses its mora cache across calls."""
+    # Inputs
+    raw_features = pyopenjtalk.run_frontend("今日は今日です。")
+    pipeline = Pipeline(trusted=True)
+    # Outputs
+    pipeline(raw_features)
+    n_miss = pipeline.cache_info().misses
+    pipeline(raw_features)
+    # Tests
+    assert pipeline.cache_info().misses == n_miss
+    assert pipeline.cache_info().hits > 0
+    assert isinstance(pipeline.cache_info(), CacheInfo)
@@ -0,0 +1 @@
+"""Graph handling tests."""
@@ -0,0 +1,71 @@
+"""Test Tree-to-graph converter."""
+
+import io
+
+import pytest
+
+from speechtree.graph.converter import (
+    GraphFormat,
+    convert_tree_to_graph,
+    write_graph,
+)
+from speechtree.ojt.parser import parse_ojt_as_tree
+from tests.utils import gen_ft
+
+# fmt: off
+_TREE = parse_ojt_as_tree([
+    #      string       pron:        acc chain_flag
+    gen_ft('"引用"',    "インヨー",     0, chain_flag=0),
+    gen_ft("、",        "、",          0, chain_flag=0),
+    gen_ft("です",      "デス’",       1, chain_flag=0),
+])
+# fmt: on
+
+
+def test_dot() -> None:
+    """DOT output has all levels, escaped labels and unvoiced vowels in upper case."""
+    graph = convert_tree_to_graph(_TREE)
+    assert graph.startswith("digraph Tree {\n")
+    assert graph.endswith("}\n")
+    assert 'g0a0w0 [label="\\"引用\\""];' in graph
+    assert 'g2a0w0m1p1 [label="U"];' in graph
+    assert "g2a0w0m1 -> g2a0w0m1p1;" in graph
+    assert "tree -> g2;" in graph
+
+
+def test_mermaid_collapsed() -> None:
+    """Mermaid output collapses levels below `max_level` into labels."""
+    graph = convert_tree_to_graph(_TREE, fmt="mermaid", max_level="accent_phrase")
+    assert graph.startswith("graph TD;\n")
+    assert 'g2a0["です<br>デス<br>HL"];' in graph
+    assert "g2a0w0" not in graph
+
+
+@pytest.mark.parametrize("fmt", ["dot", "mermaid"])
+def test_window(fmt: GraphFormat) -> None:
+    """Windowed render contains only the groups in the range, with global node IDs."""
+    fp = io.StringIO()
+    write_graph(_TREE, fp, fmt=fmt, start=1, stop=2)
+    graph = fp.getvalue()
+    assert "g1a0" in graph
+    assert "g0" not in graph
+    assert "g2" not in graph
+
+
+def test_window_level() -> None:
+    """Windows count nodes of `window_level`, and render them with their ancestors only."""
+    fp = io.StringIO()
+    write_graph(_TREE, fp, start=1, stop=3, window_level="mora")
+    graph = fp.getvalue()
+    assert "g0a0w0m1p0" in graph
+    assert "g0a0w0m2p0" in graph
+    assert "g0a0w0m0" not in graph
+    assert "g0a0w0m3" not in graph
+    assert "g1" not in graph
+    assert "tree -> g0;" in graph
+
+    fp = io.StringIO()
+    write_graph(_TREE, fp, start=-1, window_level="accent_phrase")
+    graph = fp.getvalue()
+    assert "g2a0w0m1p1" in graph
+    assert "g0" not in graph
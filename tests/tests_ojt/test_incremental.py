@@ -0,0 +1,68 @@
+"""Test incremental re-parse."""
+
+import random
+import warnings
+
+import pytest
+
+from speechtree.ojt.incremental import FeatureEdit, reparse_ojt_as_tree
+from speechtree.ojt.parser import parse_ojt_as_tree
+from tests.utils import gen_ft
+
+# fmt: off
+_VOCAB = [
+    #      string       pron:        acc chain_flag
+    gen_ft("、",        "、",          0, chain_flag=0),
+    gen_ft("？",        "？",          0, chain_flag=0),
+    gen_ft("こんにちは", "コンニチワ",  0, chain_flag=0),
+    gen_ft("今日",      "キョー",       1, chain_flag=0),
+    gen_ft("は",        "ワ",          0, chain_flag=1),
+    gen_ft("暖かい",    "アタタカイ",   4, chain_flag=0),
+    gen_ft("です",      "デス’",       0, chain_flag=1),
+]
+# fmt: on
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_reparse_equals_full_parse(seed: int) -> None:
+    """Incremental re-parse equals full parse of the edited features over random edits."""
+    rng = random.Random(seed)  # noqa: S311, because of test data, not cryptography.
+    feats = rng.choices(_VOCAB, k=rng.randint(0, 30))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        tree = parse_ojt_as_tree(feats)
+        for _ in range(20):
+            start = rng.randint(0, len(feats))
+            stop = rng.randint(start, min(start + 3, len(feats)))
+            edit = FeatureEdit(start, stop, rng.choices(_VOCAB, k=rng.randint(0, 3)))
+            tree, feats = reparse_ojt_as_tree(tree, feats, edit)
+            assert tree == parse_ojt_as_tree(feats)
+
+
+def test_reparse_shares_untouched_subtrees() -> None:
+    """Groups and accent phrases apart from the edit are reused."""
+    # Inputs
+    feats = [
+        _VOCAB[2],
+        _VOCAB[0],
+        _VOCAB[3],
+        _VOCAB[4],
+        _VOCAB[5],
+        _VOCAB[0],
+        _VOCAB[2],
+    ]
+    tree = parse_ojt_as_tree(feats)
+    # Outputs
+    new_tree, _ = reparse_ojt_as_tree(tree, feats, FeatureEdit(4, 5, [_VOCAB[2]]))
+    # Tests
+    assert new_tree[0] is tree[0]
+    assert new_tree[2]["accent_phrases"][0] is tree[2]["accent_phrases"][0]
+    assert new_tree[2]["accent_phrases"][1] is not tree[2]["accent_phrases"][1]
+    assert new_tree[4] is tree[4]
+
+
+def test_reparse_invalid_range() -> None:
+    """Out-of-range edit is rejected."""
+    feats = [_VOCAB[2]]
+    with pytest.raises(ValueError, match="範囲外"):
+        reparse_ojt_as_tree(parse_ojt_as_tree(feats), feats, FeatureEdit(1, 2, []))
@@ -1,6 +1,8 @@
 """Test Open JTalk feature loader."""
 
 import pyopenjtalk  # type: ignore # noqa: PGH003, because of external library's type missing
+import pytest
+from pydantic import ValidationError
 
 from speechtree.ojt.loader import as_ojt_features
 
@@ -16,3 +18,28 @@ def test_as_ojt_features() -> None:
     ojt_feats = as_ojt_features(raw_features)
     n_feat = len(ojt_feats)
     assert n_feat == true_n_feat
+
+
+def test_as_ojt_features_trusted() -> None:
+    """`as_ojt_features(trusted=True)` yields the same features as validating mode."""
+    # Inputs
+    text = "こんにちは、OpenJTalk のパーサーです。"
+    raw_features = pyopenjtalk.run_frontend(text)
+    # Expects
+    true_ojt_feats = as_ojt_features(raw_features)
+    # Outputs
+    ojt_feats = as_ojt_features(raw_features, trusted=True)
+    # Tests
+    assert ojt_feats == true_ojt_feats
+
+
+def test_as_ojt_features_malformed() -> None:
+    """`as_ojt_features()` rejects malformed features."""
+    # Inputs
+    text = "こんにちは、OpenJTalk のパーサーです。"
+    raw_features = pyopenjtalk.run_frontend(text)
+    raw_features[1]["acc"] = "accent"
+    del raw_features[2]["pron"]
+    # Tests
+    with pytest.raises(ValidationError):
+        as_ojt_features(raw_features)
@@ -0,0 +1 @@
+"""VOICEVOX handling tests."""
@@ -0,0 +1,140 @@
+"""Test asyncio VOICEVOX ENGINE client."""
+
+import asyncio
+import json
+from collections.abc import Iterator
+
+import pytest
+
+from benchmarks.fake_engine import FakeEngine
+from speechtree.ojt.parser import parse_ojt_as_tree
+from speechtree.tree import Tree
+from speechtree.voicevox.client import VoicevoxClient, VoicevoxEngineError
+from speechtree.voicevox.serializer import dumps_accent_phrases
+from tests.utils import gen_ft
+
+
+def _gen_tree(pron: str) -> Tree:
+    return parse_ojt_as_tree([gen_ft(pron, pron)])
+
+
+_TREES = [_gen_tree(pron) for pron in ("ア", "イ", "ウ", "エ", "オ") * 4]
+
+
+def test_synthesize_many() -> None:
+    """`synthesize_many()` returns WAVs in input order over pooled connections with bounded concurrency."""
+
+    async def run() -> tuple[list[bytes], FakeEngine]:
+        async with (
+            FakeEngine(latency=0.01) as engine,
+            VoicevoxClient(port=engine.port, max_connections=3) as client,
+        ):
+            wavs = [wav async for wav in client.synthesize_many(_TREES, speaker=1)]
+        return wavs, engine
+
+    # Outputs
+    wavs, engine = asyncio.run(run())
+    # Tests
+    assert len(wavs) == len(_TREES)
+    for wav, tree in zip(wavs, _TREES, strict=True):
+        query = json.loads(wav.removeprefix(b"RIFF"))
+        assert (
+            query["accent_phrases"][0]["moras"][0]["text"]
+            == tree[0]["accent_phrases"][0]["words"][0]["text"]
+        )
+        assert query["accent_phrases"][0]["moras"][0]["pitch"] == 5.0  # noqa: PLR2004, because it is filled by the fake engine.
+    assert engine.stats.n_request == 2 * len(_TREES)
+    assert engine.stats.n_connection <= 3  # noqa: PLR2004, because it is `max_connections`.
+    assert engine.stats.max_in_flight <= 3  # noqa: PLR2004, because it is `max_connections`.
+
+
+def test_synthesize_many_backpressure() -> None:
+    """`synthesize_many()` does not read inputs beyond `max_pending` ahead of consumption."""
+    n_read = 0
+
+    def gen_trees() -> Iterator[Tree]:
+        nonlocal n_read
+        for tree in _TREES:
+            n_read += 1
+            yield tree
+
+    async def run() -> int:
+        async with (
+            FakeEngine() as engine,
+            VoicevoxClient(port=engine.port, max_connections=2) as client,
+        ):
+            wavs = client.synthesize_many(gen_trees(), speaker=1, max_pending=4)
+            await anext(wavs)
+            n_read_at_first = n_read
+            await wavs.aclose()
+        return n_read_at_first
+
+    # Tests
+    assert asyncio.run(run()) == 4  # noqa: PLR2004, because it is `max_pending`.
+
+
+def test_synthesize_error() -> None:
+    """Error responses raise `VoicevoxEngineError`."""
+
+    async def run() -> None:
+        async with (
+            FakeEngine() as engine,
+            VoicevoxClient(port=engine.port) as client,
+        ):
+            await client.post("/unknown", dumps_accent_phrases(_TREES[0]))
+
+    with pytest.raises(VoicevoxEngineError, match="404"):
+        asyncio.run(run())
+
+
+def test_close_with_in_flight_request() -> None:
+    """Connections in flight at `close()` are closed instead of pooled, and later requests are rejected."""
+
+    async def run() -> tuple[int, bytes]:
+        async with FakeEngine(latency=0.05) as engine:
+            client = VoicevoxClient(port=engine.port)
+            query = dumps_accent_phrases(_TREES[0])
+            request = asyncio.create_task(client.post("/synthesis", query))
+            await asyncio.sleep(0.01)
+            await client.close()
+            wav = await request
+            n_idle = len(client._idle)  # noqa: SLF001, because of the pool state.
+            with pytest.raises(RuntimeError, match="閉じられて"):
+                await client.post("/synthesis", b"{}")
+        return n_idle, wav
+
+    n_idle, wav = asyncio.run(run())
+    assert n_idle == 0
+    assert wav.startswith(b"RIFF")
+
+
+def test_synthesize_many_cancels_pending() -> None:
+    """Closing `synthesize_many()` early waits for the cancellation of pending requests."""
+
+    async def run() -> list[asyncio.Task[object]]:
+        async with (
+            FakeEngine(latency=0.05) as engine,
+            VoicevoxClient(port=engine.port, max_connections=2) as client,
+        ):
+            wavs = client.synthesize_many(_TREES, speaker=1, max_pending=4)
+            await anext(wavs)
+            await wavs.aclose()
+            return [
+                task
+                for task in asyncio.all_tasks()
+                if task.get_coro().__name__ == "synthesize"  # type: ignore[union-attr]
+            ]
+
+    assert asyncio.run(run()) == []
+
+
+@pytest.mark.parametrize("max_pending", [0, -1])
+def test_synthesize_many_invalid_max_pending(max_pending: int) -> None:
+    """`synthesize_many()` rejects `max_pending` below 1, instead of falling back to the default."""
+
+    async def run() -> None:
+        async with VoicevoxClient() as client:
+            await anext(client.synthesize_many(_TREES, 1, max_pending=max_pending))
+
+    with pytest.raises(ValueError, match="1 以上"):
+        asyncio.run(run())
@@ -0,0 +1,90 @@
+"""Test Tree-to-VOICEVOX converter."""
+
+from speechtree.gardener import (
+    extract_accent_positions,
+    extract_phonemes,
+    extract_pronunciation,
+)
+from speechtree.ojt.parser import parse_ojt_as_tree
+from speechtree.voicevox.converter import (
+    DEFAULT_VV_MORA_CACHE_SIZE,
+    convert_tree_to_voicevox_accent_phrases,
+    convert_voicevox_accent_phrases_to_tree,
+    lookup_vv_mora_fields,
+)
+from tests.utils import gen_ft
+
+
+def test_convert_duplicated_accent_phrases() -> None:
+    """Only the tail accent phrase gets pause and interrogative even if other accent phrases are identical to it."""
+    # fmt: off
+    tree = parse_ojt_as_tree([
+        #      string  pron  acc chain_flag
+        gen_ft("本当", "ホント", 0, chain_flag=0),
+        gen_ft("本当", "ホント", 0, chain_flag=0),
+        gen_ft("？",   "？",     0, chain_flag=0),
+        gen_ft("本当", "ホント", 0, chain_flag=0),
+    ])
+    # fmt: on
+    # Outputs
+    vv_aps = convert_tree_to_voicevox_accent_phrases(tree)
+    # Tests
+    assert [ap.pause_mora is not None for ap in vv_aps] == [False, True, False]
+    assert [ap.is_interrogative for ap in vv_aps] == [False, True, False]
+    assert vv_aps[0].moras == vv_aps[1].moras
+    assert vv_aps[0].moras is not vv_aps[1].moras
+
+
+# fmt: off
+_TREE = parse_ojt_as_tree([
+    #      string       pron:        acc chain_flag
+    gen_ft("こんにちは", "コンニチワ",  0, chain_flag=0),
+    gen_ft("、",        "、",          0, chain_flag=0),
+    gen_ft("暖かい",    "アタタカイ",   4, chain_flag=0),
+    gen_ft("です",      "デス’",       0, chain_flag=1),
+    gen_ft("か",        "カ",          0, chain_flag=1),
+    gen_ft("？",        "？",          0, chain_flag=0),
+    gen_ft("雨",        "アメ",        1, chain_flag=0),
+    gen_ft("だ",        "ダ",          0, chain_flag=1),
+])
+# fmt: on
+
+
+def test_round_trip_tree() -> None:
+    """Tree -> VOICEVOX -> Tree restores tone, phonemes, pronunciation and marks."""
+    # Outputs
+    tree = convert_voicevox_accent_phrases_to_tree(
+        convert_tree_to_voicevox_accent_phrases(_TREE)
+    )
+    # Tests
+    assert [gp["type"] for gp in tree] == [gp["type"] for gp in _TREE]
+    assert extract_pronunciation(tree) == extract_pronunciation(_TREE)
+    assert extract_phonemes(tree) == extract_phonemes(_TREE)
+    assert extract_accent_positions(tree) == extract_accent_positions(_TREE)
+    assert tree[3] == _TREE[3]
+
+
+def test_round_trip_voicevox() -> None:
+    """VOICEVOX -> Tree -> VOICEVOX is identity, also for thousands of phrases."""
+    # Inputs
+    vv_aps = convert_tree_to_voicevox_accent_phrases(_TREE) * 1000
+    # Outputs
+    restored = convert_tree_to_voicevox_accent_phrases(
+        convert_voicevox_accent_phrases_to_tree(vv_aps)
+    )
+    # Tests
+    assert restored == vv_aps
+
+
+def test_convert_edited_texts_bounded() -> None:
+    """Arbitrary mora texts of edited VOICEVOX accent phrases are converted through the bounded mora cache."""
+    # Inputs
+    vv_aps = convert_tree_to_voicevox_accent_phrases(_TREE[:1])
+    # Outputs & Tests
+    for i in range(DEFAULT_VV_MORA_CACHE_SIZE + 1):
+        vv_aps[0].moras[0].text = f"コ{i}"
+        restored = convert_tree_to_voicevox_accent_phrases(
+            convert_voicevox_accent_phrases_to_tree(vv_aps)
+        )
+        assert restored[0].moras[0].text == f"コ{i}"
+    assert lookup_vv_mora_fields.cache_info().currsize <= DEFAULT_VV_MORA_CACHE_SIZE
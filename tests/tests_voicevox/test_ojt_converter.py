@@ -0,0 +1,48 @@
+"""Test fused OJT-to-VOICEVOX converter."""
+
+import warnings
+
+import pytest
+
+from speechtree.ojt.domain import OjtFeature
+from speechtree.ojt.parser import parse_ojt_as_tree
+from speechtree.voicevox.converter import convert_tree_to_voicevox_accent_phrases
+from speechtree.voicevox.ojt_converter import convert_ojt_to_voicevox_accent_phrases
+from tests.utils import gen_ft
+
+
+@pytest.mark.parametrize(
+    "ojt_feats",
+    [
+        pytest.param(
+            [
+                gen_ft("今日", "キョー", 1, chain_flag=0),
+                gen_ft("は", "ワ", 0, chain_flag=1),
+                gen_ft("、", "、", 0, chain_flag=0),
+            ],
+            id="type1",
+        ),
+        pytest.param(
+            [
+                gen_ft("明日", "アシタ", 3, chain_flag=0),
+                gen_ft("？", "？", 0, chain_flag=0),
+            ],
+            id="type3",
+        ),
+        pytest.param([gen_ft("雨", "アメ", 0, chain_flag=0)], id="type0"),
+        pytest.param([gen_ft("ー", "ー", 2, chain_flag=0)], id="no_mora_type2"),
+        pytest.param([gen_ft("ー", "ー", 0, chain_flag=0)], id="no_mora_type0"),
+    ],
+)
+def test_fused_equals_tree_route(ojt_feats: list[OjtFeature]) -> None:
+    """The fused route outputs the same accent phrases as the route through the tree."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        # Expects
+        true_vv_aps = convert_tree_to_voicevox_accent_phrases(
+            parse_ojt_as_tree(ojt_feats)
+        )
+        # Outputs
+        vv_aps = convert_ojt_to_voicevox_accent_phrases(ojt_feats)
+    # Tests
+    assert vv_aps == true_vv_aps
@@ -0,0 +1,110 @@
+"""Test VOICEVOX JSON serializer."""
+
+import copy
+import json
+from dataclasses import asdict
+
+import pytest
+
+from speechtree.ojt.parser import parse_ojt_as_tree
+from speechtree.voicevox.converter import convert_tree_to_voicevox_accent_phrases
+from speechtree.voicevox.serializer import (
+    DEFAULT_VV_MORA_JSON_CACHE_SIZE,
+    AudioQuerySettings,
+    _lookup_tree_mora_json,
+    _lookup_vv_mora_json,
+    dumps_accent_phrases,
+    dumps_audio_query,
+)
+from tests.utils import gen_ft
+
+# fmt: off
+_TREE = parse_ojt_as_tree([
+    #      string       pron:        acc chain_flag
+    gen_ft("、",        "、",          0, chain_flag=0),
+    gen_ft("こんにちは", "コンニチワ",  0, chain_flag=0),
+    gen_ft("、",        "、",          0, chain_flag=0),
+    gen_ft("今日は",    "キョーワ",     1, chain_flag=0),
+    gen_ft("です",      "デス’",       0, chain_flag=1),
+    gen_ft("か",        "カ",          0, chain_flag=1),
+    gen_ft("？",        "？",          0, chain_flag=0),
+    gen_ft("ヲ",        "ヲ",          1, chain_flag=0),
+])
+# fmt: on
+
+
+def _dumps_via_asdict(obj: object) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def test_dumps_accent_phrases() -> None:
+    """`dumps_accent_phrases()` outputs the same bytes as `asdict()` route, from both tree and accent phrases."""
+    # Inputs
+    with pytest.warns(UserWarning, match="文頭に来れない"):
+        vv_aps = convert_tree_to_voicevox_accent_phrases(_TREE)
+    # Expects
+    gt = _dumps_via_asdict([asdict(ap) for ap in vv_aps])
+    # Outputs
+    with pytest.warns(UserWarning, match="文頭に来れない"):
+        from_tree = dumps_accent_phrases(_TREE)
+    from_vv_aps = dumps_accent_phrases(vv_aps)
+    # Tests
+    assert from_tree == gt
+    assert from_vv_aps == gt
+    assert dumps_accent_phrases([]) == b"[]"
+
+
+def test_dumps_audio_query() -> None:
+    """`dumps_audio_query()` outputs camelCase parameters and snake_case accent phrases."""
+    # Inputs
+    tree = _TREE[1:]
+    settings = AudioQuerySettings(speed_scale=1.5, kana="テスト")
+    # Outputs
+    query = json.loads(dumps_audio_query(tree, settings))
+    # Tests
+    assert query["accent_phrases"] == json.loads(dumps_accent_phrases(tree))
+    assert query["speedScale"] == 1.5  # noqa: PLR2004, because it is an input.
+    assert query["outputSamplingRate"] == 24000  # noqa: PLR2004, because it is a default.
+    assert query["pauseLength"] is None
+    assert query["kana"] == "テスト"
+
+
+def test_dumps_accent_phrases_edited_floats() -> None:
+    """Engine-filled floats are serialized as same as `json.dumps()`, through the bounded fragment cache."""
+    # Inputs
+    vv_aps = convert_tree_to_voicevox_accent_phrases(_TREE[1:])
+    for i, mora in enumerate(mora for ap in vv_aps for mora in ap.moras):
+        mora.pitch = 5.0 + i / 7
+        mora.vowel_length = float("nan") if i == 0 else 0.1 * i
+    # Expects
+    gt = json.dumps(
+        [asdict(ap) for ap in vv_aps], ensure_ascii=False, separators=(",", ":")
+    ).encode()
+    # Outputs
+    dumped = dumps_accent_phrases(vv_aps)
+    # Tests
+    assert dumped == gt
+    for i in range(DEFAULT_VV_MORA_JSON_CACHE_SIZE):
+        vv_aps[0].moras[0].pitch = float(i)
+        dumps_accent_phrases(vv_aps[:1])
+    assert _lookup_vv_mora_json.cache_info().currsize <= DEFAULT_VV_MORA_JSON_CACHE_SIZE
+
+
+def test_dumps_tree_edited_pronunciations() -> None:
+    """Trees with arbitrary mora pronunciations are serialized as same as the converter route, through the bounded fragment cache."""
+    # Inputs
+    tree = copy.deepcopy(_TREE[1:2])
+    mora = tree[0]["accent_phrases"][0]["words"][0]["moras"][0]
+    for i in range(DEFAULT_VV_MORA_JSON_CACHE_SIZE + 1):
+        mora["pronunciation"] = f"コ{i}"
+        # Expects
+        gt = json.dumps(
+            [asdict(ap) for ap in convert_tree_to_voicevox_accent_phrases(tree)],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+        # Outputs & Tests
+        assert dumps_accent_phrases(tree) == gt
+    assert (
+        _lookup_tree_mora_json.cache_info().currsize <= DEFAULT_VV_MORA_JSON_CACHE_SIZE
+    )
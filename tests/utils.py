@@ -0,0 +1,47 @@
+"""Utilities shared by tests."""
+
+from dataclasses import asdict
+from typing import Any
+
+from speechtree.ojt.domain import OjtFeature
+
+
+def gen_ft(
+    string: str = "text",
+    pron: str = "ハツオン",
+    acc: int = 0,
+    *,
+    chain_flag: int = 0,
+) -> OjtFeature:
+    """
+    Generate an Open JTalk feature, whose unused fields are placeholders.
+
+    `orig`/`read`/`mora_size` follow `string`/`pron` like real features, and `chain_flag` defaults to a new accent phrase.
+    """
+    return OjtFeature(
+        string=string,
+        pos="*",
+        pos_group1="*",
+        pos_group2="*",
+        pos_group3="*",
+        ctype="*",
+        cform="*",
+        orig=string,
+        read=pron,
+        pron=pron,
+        acc=acc,
+        mora_size=len(pron),
+        chain_rule="*",
+        chain_flag=chain_flag,
+    )
+
+
+def gen_raw_feature(
+    string: str = "text",
+    pron: str = "ハツオン",
+    acc: int = 0,
+    *,
+    chain_flag: int = 0,
+) -> dict[str, Any]:
+    """Generate a raw feature like `pyopenjtalk.run_frontend()` outputs, as same as `gen_ft()`."""
+    return asdict(gen_ft(string, pron, acc, chain_flag=chain_flag))